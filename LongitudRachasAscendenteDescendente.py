@@ -1,5 +1,4 @@
 import tkinter as tk
-from collections import defaultdict
 from math import factorial
 from tkinter import messagebox, ttk
 
@@ -9,10 +8,15 @@ import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from scipy import stats
 
+from memoria import memorizar
+from utilidades_rachas import (agrupar_frecuencias, frecuencias_longitudes,
+                               longitudes_rachas, secuencia_diferencias,
+                               texto_signos)
+
 
 class LongitudRachasAscendenteDescendente:
-    def __init__(self, datos, alpha=0.05):
-        self.datos = np.array(datos)
+    def __init__(self, datos, alpha=0.05, secuencia_signos=None):
+        self.datos = np.asarray(datos)
         self.alpha = alpha
         self.n_total = len(self.datos)
 
@@ -20,7 +24,11 @@ class LongitudRachasAscendenteDescendente:
             raise ValueError(
                 "El conjunto de datos debe contener al menos 2 elementos.")
 
-        self.secuencia_signos = self._generar_secuencia_signos()
+        # Los signos de las diferencias pueden venir ya calculados (por ejemplo, compartidos entre procesos)
+        if secuencia_signos is not None:
+            self.secuencia_signos = np.asarray(secuencia_signos)
+        else:
+            self.secuencia_signos = self._generar_secuencia_signos()
         self.N_comparaciones = len(self.secuencia_signos)
 
         # Debug: Imprimir información
@@ -28,50 +36,27 @@ class LongitudRachasAscendenteDescendente:
         print(
             f"Debug: Secuencia de signos: {self.N_comparaciones} elementos")
         print(
-            f"Debug: Primeros 20 signos: {''.join(self.secuencia_signos[:20])}")
+            f"Debug: Primeros 20 signos: {texto_signos(self.secuencia_signos, 20)}")
 
     def _generar_secuencia_signos(self):
-        signos = []
-        for i in range(1, self.n_total):
-            if self.datos[i] > self.datos[i-1]:
-                signos.append('+')
-            elif self.datos[i] < self.datos[i-1]:
-                signos.append('-')
-            # Si son iguales, no agregamos nada (se omite)
-        return signos
+        # True = '+', False = '-'. Si son iguales, no se agrega nada (se omite)
+        return secuencia_diferencias(self.datos)
 
     def _calcular_frecuencias(self):
         print(f"Debug: Calculando frecuencias...")
-        observed_counts = defaultdict(int)
-
-        if not self.secuencia_signos:
+        if self.secuencia_signos.size == 0:
             print("Debug: No hay secuencia de signos")
             return {}, {}
 
-        # Calcular rachas correctamente
-        rachas = []
-        if len(self.secuencia_signos) > 0:
-            current_char = self.secuencia_signos[0]
-            current_length = 1
-
-            for i in range(1, len(self.secuencia_signos)):
-                if self.secuencia_signos[i] == current_char:
-                    current_length += 1
-                else:
-                    rachas.append(current_length)
-                    current_char = self.secuencia_signos[i]
-                    current_length = 1
-
-            # Agregar la última racha
-            rachas.append(current_length)
+        # Calcular rachas (longitudes por RLE vectorizado)
+        rachas = longitudes_rachas(self.secuencia_signos)
 
         print(f"Debug: Rachas encontradas: {rachas}")
 
         # Contar frecuencias observadas
-        for longitud in rachas:
-            observed_counts[longitud] += 1
+        observed_counts = frecuencias_longitudes(rachas)
 
-        print(f"Debug: Frecuencias observadas: {dict(observed_counts)}")
+        print(f"Debug: Frecuencias observadas: {observed_counts}")
 
         # Calcular frecuencias esperadas
         expected_counts = {}
@@ -103,6 +88,7 @@ class LongitudRachasAscendenteDescendente:
         print(f"Debug: Frecuencias esperadas: {expected_counts}")
         return observed_counts, expected_counts
 
+    @memorizar('alpha')
     def ejecutar(self):
         print("Debug: Iniciando ejecución...")
 
@@ -125,42 +111,8 @@ class LongitudRachasAscendenteDescendente:
 
             print(f"Debug: DataFrame creado:\n{df}")
 
-            # Agrupar para que Ei >= 5
-            grouped_Oi = []
-            grouped_Ei = []
-            temp_Oi = 0
-            temp_Ei = 0
-
-            # Recorrer desde el final para agrupar
-            indices_ordenados = sorted(df.index, reverse=True)
-            for i in indices_ordenados:
-                temp_Oi += df.loc[i, 'Oi']
-                temp_Ei += df.loc[i, 'Ei']
-
-                print(
-                    f"Debug: Procesando i={i}, temp_Oi={temp_Oi}, temp_Ei={temp_Ei}")
-
-                if temp_Ei >= 5.0:
-                    grouped_Oi.insert(0, temp_Oi)
-                    grouped_Ei.insert(0, temp_Ei)
-                    print(f"Debug: Grupo creado - Oi={temp_Oi}, Ei={temp_Ei}")
-                    temp_Oi = 0
-                    temp_Ei = 0
-
-            # Si queda algo sin agrupar
-            if temp_Oi > 0 or temp_Ei > 0:
-                if len(grouped_Ei) > 0:
-                    # Si hay grupos, se suma al último grupo creado (que es el primero en la lista)
-                    grouped_Oi[0] += temp_Oi
-                    grouped_Ei[0] += temp_Ei
-                    print(
-                        f"Debug: Agregado al primer grupo - Total Oi={grouped_Oi[0]}, Ei={grouped_Ei[0]}")
-                else:
-                    # Si no se creó ningún grupo (todos son < 5), se crea uno solo
-                    grouped_Oi.append(temp_Oi)
-                    grouped_Ei.append(temp_Ei)
-                    print(
-                        f"Debug: Nuevo grupo creado - Oi={temp_Oi}, Ei={temp_Ei}")
+            # Agrupar para que Ei >= 5, recorriendo desde el final
+            grouped_Oi, grouped_Ei = agrupar_frecuencias(df['Oi'], df['Ei'])
 
             print(
                 f"Debug: Grupos finales - Oi: {grouped_Oi}, Ei: {grouped_Ei}")
@@ -218,6 +170,21 @@ class LongitudRachasAscendenteDescendente:
             traceback.print_exc()
             return {'error': error_msg}
 
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico Chi-cuadrado ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
     def mostrar_tabla_detallada(self, parent=None):
         print("Debug: Iniciando mostrar_tabla_detallada")
         resultado = self.ejecutar()
@@ -247,9 +214,7 @@ class LongitudRachasAscendenteDescendente:
             frame_info = ttk.LabelFrame(
                 main_frame, text="Información de la Secuencia", padding="10")
             frame_info.pack(fill=tk.X, pady=5)
-            secuencia_text = ''.join(self.secuencia_signos[:50])
-            if len(self.secuencia_signos) > 50:
-                secuencia_text += "..."
+            secuencia_text = texto_signos(self.secuencia_signos, 50)
             ttk.Label(frame_info, text=f"Secuencia de signos: {secuencia_text}").pack(
                 anchor=tk.W)
             ttk.Label(frame_info, text=f"Longitud de la secuencia: {len(self.secuencia_signos)}").pack(
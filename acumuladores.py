@@ -0,0 +1,402 @@
+import numpy as np
+from scipy import stats
+from scipy.special import factorial
+
+from histogramas import conteos_finos
+from utilidades_rachas import agrupar_frecuencias
+
+
+class _Acumulador:
+    """
+    Base de los acumuladores: CAMPOS son los atributos que forman su estado,
+    de modo que se pueden guardar (estado) y retomar (restaurar) para seguir
+    con los datos agregados después. combinar(otro) agrega el estado de un
+    acumulador que empezó desde cero sobre los datos que siguen a los de
+    este, así que un archivo se puede procesar por tramos en paralelo.
+
+    Igual que las pruebas por bloques (PruebaHuecos, las de bits) se
+    alimentan con actualizar(bloque) y ejecutar() da el resultado con la
+    decisión; calcular() da solo el estadístico y el p-valor.
+    """
+
+    CAMPOS = ()
+    TIPO_PRUEBA = None
+
+    def estado(self):
+        """Diccionario {campo: valor} (los campos en None se omiten)"""
+        return {campo: getattr(self, campo) for campo in self.CAMPOS if getattr(self, campo) is not None}
+
+    def restaurar(self, estado):
+        """Retoma un estado guardado con estado()"""
+        for campo in self.CAMPOS:
+            if campo in estado:
+                valor = np.asarray(estado[campo])
+                setattr(self, campo, valor.copy() if valor.ndim else valor.item())
+        return self
+
+    def ejecutar(self):
+        """Resultado con los datos vistos hasta ahora (rechaza_h0 es False si el p-valor es NaN)"""
+        resultado = self.calcular()
+        resultado['rechaza_h0'] = bool(resultado['p_valor'] < self.alpha)
+        resultado['tipo_prueba'] = self.TIPO_PRUEBA
+        resultado['alpha'] = self.alpha
+        return resultado
+
+
+class AcumuladorChi(_Acumulador):
+    """
+    Frecuencias de PruebaChi (k intervalos iguales de [0, 1)) acumuladas
+    bloque a bloque. Los valores fuera de [0, 1) cuentan en n pero no en
+    ningún intervalo, igual que en la prueba con todos los datos.
+    """
+
+    CAMPOS = ('conteos', 'n')
+    TIPO_PRUEBA = "Chi-cuadrado"
+
+    def __init__(self, num_intervalos=10, alpha=0.05):
+        self.num_intervalos = num_intervalos
+        self.alpha = alpha
+        self.conteos = np.zeros(num_intervalos, dtype=np.int64)
+        self.n = 0
+
+    def actualizar(self, bloque):
+        bloque = np.asarray(bloque, dtype=float)
+        self.conteos += conteos_finos(bloque, self.num_intervalos)
+        self.n += bloque.size
+
+    def combinar(self, otro):
+        self.conteos = self.conteos + otro.conteos
+        self.n += otro.n
+        return self
+
+    def calcular(self):
+        """Estadístico Chi² y p-valor con los datos vistos hasta ahora (NaN sin datos)"""
+        if self.n == 0:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': 0}
+        esperada = self.n / self.num_intervalos
+        chi2 = float(np.sum((self.conteos - esperada) ** 2 / esperada))
+        return {'estadistico': chi2, 'p_valor': float(stats.chi2.sf(chi2, self.num_intervalos - 1)), 'n': self.n}
+
+
+class AcumuladorRachasEncimaDebajo(_Acumulador):
+    """
+    Número de rachas respecto al umbral de RachasEncimaDebajo acumulado
+    bloque a bloque; se conserva el signo del último dato para contar el
+    cambio que cruza el borde entre bloques.
+    """
+
+    CAMPOS = ('n', 'n1', 'rachas', 'ultimo_signo', 'primer_signo')
+    TIPO_PRUEBA = "Rachas Enc/Deb"
+
+    def __init__(self, umbral=0.5, alpha=0.05):
+        self.umbral = umbral
+        self.alpha = alpha
+        self.n = 0
+        self.n1 = 0
+        self.rachas = 0
+        self.ultimo_signo = None
+        self.primer_signo = None
+
+    def actualizar(self, bloque):
+        signos = np.asarray(bloque, dtype=float) >= self.umbral
+        if signos.size == 0:
+            return
+        cambios = int(np.count_nonzero(signos[1:] != signos[:-1]))
+        if self.ultimo_signo is None:
+            cambios += 1
+            self.primer_signo = bool(signos[0])
+        elif signos[0] != self.ultimo_signo:
+            cambios += 1
+        self.rachas += cambios
+        self.n1 += int(np.count_nonzero(signos))
+        self.n += signos.size
+        self.ultimo_signo = bool(signos[-1])
+
+    def combinar(self, otro):
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            return self.restaurar(otro.estado())
+        # La primera racha del otro continúa la última de este si tienen el mismo signo
+        self.rachas += otro.rachas - (otro.primer_signo == self.ultimo_signo)
+        self.n1 += otro.n1
+        self.n += otro.n
+        self.ultimo_signo = otro.ultimo_signo
+        return self
+
+    def calcular(self):
+        """Estadístico Z y p-valor bilateral (NaN si falta un lado del umbral)"""
+        n1, n2, n = self.n1, self.n - self.n1, self.n
+        if n1 == 0 or n2 == 0:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': n}
+        media = 2 * n1 * n2 / n + 1
+        varianza = 2 * n1 * n2 * (2 * n1 * n2 - n) / (n ** 2 * (n - 1))
+        z = (self.rachas - media) / np.sqrt(varianza) if varianza > 0 else 0.0
+        return {'estadistico': float(z), 'p_valor': float(2 * stats.norm.sf(abs(z))), 'n': n}
+
+
+class AcumuladorRachasAscDesc(_Acumulador):
+    """
+    Número de rachas de subidas y bajadas de RachasAscendentesDescendentes
+    acumulado bloque a bloque. Se conservan el último dato (para la
+    diferencia que cruza el borde) y la última dirección (un empate la
+    mantiene; los empates iniciales cuentan como subida).
+    """
+
+    CAMPOS = ('n', 'rachas', 'ultimo_valor', 'ultima_direccion',
+              'primer_valor', 'primera_direccion', 'empates_iniciales')
+    TIPO_PRUEBA = "Rachas Asc/Desc"
+
+    def __init__(self, alpha=0.05):
+        self.alpha = alpha
+        self.n = 0
+        self.rachas = 0
+        self.ultimo_valor = None
+        self.ultima_direccion = None
+        # Para combinar: primer dato, primera diferencia no nula y si hubo empates antes de ella
+        self.primer_valor = None
+        self.primera_direccion = None
+        self.empates_iniciales = False
+
+    def actualizar(self, bloque):
+        bloque = np.asarray(bloque, dtype=float)
+        if bloque.size == 0:
+            return
+        if self.primer_valor is None:
+            self.primer_valor = float(bloque[0])
+        previos = bloque if self.ultimo_valor is None else np.concatenate(([self.ultimo_valor], bloque))
+        self.n += bloque.size
+        self.ultimo_valor = float(bloque[-1])
+        signos = np.sign(np.diff(previos))
+        if signos.size == 0:
+            return
+        if self.primera_direccion is None:
+            no_nulos = np.flatnonzero(signos)
+            if no_nulos.size:
+                self.primera_direccion = bool(signos[no_nulos[0]] > 0)
+            self.empates_iniciales = self.empates_iniciales or (no_nulos[0] > 0 if no_nulos.size else True)
+
+        # Dirección de cada diferencia: la del último signo no nulo, o la que venía del bloque anterior
+        ultimo = np.maximum.accumulate(np.where(signos != 0, np.arange(signos.size), -1))
+        anterior = True if self.ultima_direccion is None else self.ultima_direccion
+        direcciones = np.where(ultimo >= 0, signos[np.maximum(ultimo, 0)] > 0, anterior)
+
+        cambios = int(np.count_nonzero(direcciones[1:] != direcciones[:-1]))
+        if self.ultima_direccion is None:
+            cambios += 1
+        elif direcciones[0] != self.ultima_direccion:
+            cambios += 1
+        self.rachas += cambios
+        self.ultima_direccion = bool(direcciones[-1])
+
+    def combinar(self, otro):
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            return self.restaurar(otro.estado())
+        # La diferencia que cruza el borde se agrega con el primer dato del otro
+        self.actualizar([otro.primer_valor])
+        if otro.n == 1:
+            return self
+        # Cambios de dirección dentro del otro sin contar el arranque: al
+        # empezar desde cero contó una racha más, y otra si sus empates
+        # iniciales (tomados como subida) precedían a una bajada
+        internos = otro.rachas - 1 - (otro.empates_iniciales and otro.primera_direccion is False)
+        if otro.primera_direccion is not None:
+            self.rachas += internos + (otro.primera_direccion != self.ultima_direccion)
+            self.ultima_direccion = otro.ultima_direccion
+        if self.primera_direccion is None:
+            # Hasta aquí solo hubo empates: la primera dirección es la del otro
+            self.primera_direccion = otro.primera_direccion
+            self.empates_iniciales = self.empates_iniciales or otro.empates_iniciales
+        self.n += otro.n - 1
+        self.ultimo_valor = otro.ultimo_valor
+        return self
+
+    def calcular(self):
+        """Estadístico Z (en valor absoluto) y p-valor bilateral"""
+        n = self.n
+        if n < 2:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': n}
+        z = abs((self.rachas - (2 * n - 1) / 3) / np.sqrt((16 * n - 29) / 90))
+        return {'estadistico': float(z), 'p_valor': float(2 * stats.norm.sf(z)), 'n': n}
+
+
+class _AcumuladorLongitudes(_Acumulador):
+    """
+    Frecuencias de longitudes de racha (RLE) acumuladas bloque a bloque.
+    Las rachas cerradas se cuentan en `conteos`; la última queda abierta
+    (signo y longitud) porque puede continuar en el bloque siguiente.
+    """
+
+    CAMPOS = ('conteos', 'n', 'signo_abierto', 'longitud_abierta', 'primer_signo', 'longitud_primera')
+
+    def __init__(self, alpha=0.05):
+        self.alpha = alpha
+        self.conteos = np.zeros(0, dtype=np.int64)
+        self.n = 0
+        self.signo_abierto = None
+        self.longitud_abierta = 0
+        # Para combinar: signo de la primera racha y su longitud (0 mientras siga abierta)
+        self.primer_signo = None
+        self.longitud_primera = 0
+
+    def _agregar_signos(self, signos):
+        """Agrega una secuencia de signos que continúa la anterior"""
+        if signos.size == 0:
+            return
+        cortes = np.flatnonzero(signos[1:] != signos[:-1]) + 1
+        limites = np.concatenate(([0], cortes, [signos.size]))
+        longitudes = np.diff(limites)
+        if self.signo_abierto is None:
+            self.primer_signo = bool(signos[0])
+        elif signos[0] == self.signo_abierto:
+            longitudes[0] += self.longitud_abierta
+        else:
+            longitudes = np.concatenate(([self.longitud_abierta], longitudes))
+        self._contar_cerradas(longitudes[:-1])
+        self.signo_abierto = bool(signos[-1])
+        self.longitud_abierta = int(longitudes[-1])
+
+    def _contar_cerradas(self, longitudes):
+        """Suma rachas cerradas a los conteos (la primera que se cierra queda como longitud_primera)"""
+        if longitudes.size == 0:
+            return
+        if self.longitud_primera == 0:
+            self.longitud_primera = int(longitudes[0])
+        cerradas = np.bincount(longitudes)
+        if cerradas.size > self.conteos.size:
+            cerradas[:self.conteos.size] += self.conteos
+            self.conteos = cerradas
+        else:
+            self.conteos[:cerradas.size] += cerradas
+
+    def _combinar_rachas(self, otro):
+        """Agrega las rachas del otro: su primera se une a la abierta de este si tienen el mismo signo"""
+        if otro.signo_abierto is None:
+            return
+        if self.signo_abierto is None:
+            self.conteos = otro.conteos.copy()
+            self.signo_abierto, self.longitud_abierta = otro.signo_abierto, otro.longitud_abierta
+            self.primer_signo, self.longitud_primera = otro.primer_signo, otro.longitud_primera
+            return
+        conteos = otro.conteos.copy()
+        if otro.longitud_primera == 0:
+            # El otro es una sola racha, todavía abierta
+            if otro.signo_abierto == self.signo_abierto:
+                self.longitud_abierta += otro.longitud_abierta
+            else:
+                self._contar_cerradas(np.array([self.longitud_abierta]))
+                self.signo_abierto, self.longitud_abierta = otro.signo_abierto, otro.longitud_abierta
+            return
+        if otro.primer_signo == self.signo_abierto:
+            conteos[otro.longitud_primera] -= 1
+            self._contar_cerradas(np.array([self.longitud_abierta + otro.longitud_primera]))
+        else:
+            self._contar_cerradas(np.array([self.longitud_abierta]))
+        if conteos.size > self.conteos.size:
+            conteos[:self.conteos.size] += self.conteos
+            self.conteos = conteos
+        else:
+            self.conteos[:conteos.size] += conteos
+        self.signo_abierto, self.longitud_abierta = otro.signo_abierto, otro.longitud_abierta
+
+    def frecuencias(self):
+        """Frecuencia observada de cada longitud 1..máxima, contando la racha abierta"""
+        conteos = self.conteos.copy()
+        if self.signo_abierto is not None:
+            if self.longitud_abierta >= conteos.size:
+                conteos = np.concatenate((conteos, np.zeros(self.longitud_abierta + 1 - conteos.size, dtype=np.int64)))
+            conteos[self.longitud_abierta] += 1
+        return conteos[1:]
+
+    def _chi_cuadrado(self, observadas, esperadas):
+        """Chi² con las categorías agrupadas para que Ei >= 5, como en las pruebas de longitud"""
+        grouped_Oi, grouped_Ei = agrupar_frecuencias(observadas, esperadas)
+        if len(grouped_Oi) < 2:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': self.n}
+        chi2 = float(sum((oi - ei) ** 2 / ei for oi, ei in zip(grouped_Oi, grouped_Ei) if ei > 0))
+        return {'estadistico': chi2, 'p_valor': float(stats.chi2.sf(chi2, len(grouped_Oi) - 1)), 'n': self.n}
+
+
+class AcumuladorLongitudRachasEncimaDebajo(_AcumuladorLongitudes):
+    """Longitudes de racha respecto al umbral (estrictamente encima) de LongitudRachasEncimaDebajo"""
+
+    CAMPOS = _AcumuladorLongitudes.CAMPOS + ('n1',)
+    TIPO_PRUEBA = "L. Enc/Deb"
+
+    def __init__(self, umbral=0.5, alpha=0.05):
+        super().__init__(alpha)
+        self.umbral = umbral
+        self.n1 = 0
+
+    def actualizar(self, bloque):
+        signos = np.asarray(bloque, dtype=float) > self.umbral
+        self._agregar_signos(signos)
+        self.n1 += int(np.count_nonzero(signos))
+        self.n += signos.size
+
+    def combinar(self, otro):
+        self._combinar_rachas(otro)
+        self.n1 += otro.n1
+        self.n += otro.n
+        return self
+
+    def calcular(self):
+        """Chi² de las longitudes con E(L_i) = 2N (n1/N)^i (n2/N)^2"""
+        observadas = self.frecuencias()
+        n2 = self.n - self.n1
+        if observadas.size == 0 or n2 == 0:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': self.n}
+        i = np.arange(1, observadas.size + 1)
+        esperadas = 2 * self.n * (self.n1 / self.n) ** i * (n2 / self.n) ** 2
+        return self._chi_cuadrado(observadas, esperadas)
+
+
+class AcumuladorLongitudRachasAscDesc(_AcumuladorLongitudes):
+    """
+    Longitudes de racha de los signos de las diferencias de
+    LongitudRachasAscendenteDescendente (los empates se omiten); se conserva
+    el último dato para la diferencia que cruza el borde.
+    """
+
+    CAMPOS = _AcumuladorLongitudes.CAMPOS + ('ultimo_valor', 'primer_valor')
+    TIPO_PRUEBA = "L. Asc/Desc"
+
+    def __init__(self, alpha=0.05):
+        super().__init__(alpha)
+        self.ultimo_valor = None
+        self.primer_valor = None
+
+    def actualizar(self, bloque):
+        bloque = np.asarray(bloque, dtype=float)
+        if bloque.size == 0:
+            return
+        if self.primer_valor is None:
+            self.primer_valor = float(bloque[0])
+        previos = bloque if self.ultimo_valor is None else np.concatenate(([self.ultimo_valor], bloque))
+        diferencias = np.diff(previos)
+        self._agregar_signos(diferencias[diferencias != 0] > 0)
+        self.n += bloque.size
+        self.ultimo_valor = float(bloque[-1])
+
+    def combinar(self, otro):
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            return self.restaurar(otro.estado())
+        # La diferencia que cruza el borde se agrega con el primer dato del otro
+        self.actualizar([otro.primer_valor])
+        self._combinar_rachas(otro)
+        self.n += otro.n - 1
+        self.ultimo_valor = otro.ultimo_valor
+        return self
+
+    def calcular(self):
+        """Chi² de las longitudes con E(L_i) = 2/(i+3)! [N(i² + 3i + 1) - (i³ + 3i² - i - 4)]"""
+        observadas = self.frecuencias()
+        if observadas.size == 0:
+            return {'estadistico': np.nan, 'p_valor': np.nan, 'n': self.n}
+        i = np.arange(1, observadas.size + 1, dtype=float)
+        esperadas = 2 / factorial(i + 3) * (self.n * (i ** 2 + 3 * i + 1) - (i ** 3 + 3 * i ** 2 - i - 4))
+        return self._chi_cuadrado(observadas, esperadas)
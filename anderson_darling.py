@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from chi_cuadrado import validar_datos
+from distribuciones import nombre_distribucion
+from kolmogorov_smornov import VistaOrdenada
+from memoria import memorizar
+from tablas_asintoticas import (p_valor_anderson_darling,
+                                valor_critico_anderson_darling)
+
+# Observaciones más alejadas de F(x) que se listan en la tabla detallada
+NUM_MAYORES = 10
+
+
+class PruebaAndersonDarling:
+    """
+    Prueba de Anderson-Darling con la hipótesis completamente especificada.
+    Pondera la discrepancia entre la función empírica y F(x) con
+    1 / (F(1 - F)), por lo que es mucho más sensible que K-S en las colas:
+    A² = -n - (1/n) sum [(2i-1) ln u_i + (2(n-i)+1) ln(1-u_i)].
+    Los p-valores y valores críticos salen de la tabla de tablas_asintoticas.
+    """
+
+    def __init__(self, datos, alpha=0.05, distribucion=None, vista=None):
+        """
+        :param datos: Una lista o array de números.
+        :param alpha: Nivel de significancia para la prueba.
+        :param distribucion: Distribución bajo H0 (None = U(0, 1)).
+        :param vista: VistaOrdenada ya construida para estos datos (opcional).
+        """
+        if vista is None:
+            vista = VistaOrdenada(validar_datos(datos), distribucion)
+        self.vista = vista
+        self.distribucion = vista.distribucion
+        self.alpha = alpha
+        self.n = vista.n
+
+    def calcular_contribuciones(self):
+        """Aporte de cada observación ordenada a A² (suman A²)"""
+        n = self.n
+        u = self.vista.uniformes_abiertos()
+        i = np.arange(1, n + 1)
+        return -((2 * i - 1) * np.log(u) + (2 * (n - i) + 1) * np.log1p(-u)) / n - 1
+
+    def calcular_desviaciones(self):
+        """Desviación de cada observación ordenada con el peso de A²: ((2i-1)/(2n) - u_i) / sqrt(u_i (1-u_i))"""
+        u = self.vista.uniformes_abiertos()
+        i = np.arange(1, self.n + 1)
+        return ((2 * i - 1) / (2 * self.n) - u) / np.sqrt(u * (1 - u))
+
+    @memorizar('alpha', 'distribucion', datos='vista.ordenados')
+    def ejecutar(self):
+        """Ejecutar la prueba de Anderson-Darling"""
+        try:
+            contribuciones = self.calcular_contribuciones()
+            a2 = float(np.sum(contribuciones))
+            valor_critico = valor_critico_anderson_darling(self.alpha, self.n)
+            p_valor = p_valor_anderson_darling(a2, self.n)
+
+            desviaciones = self.calcular_desviaciones()
+            mayores = np.argsort(np.abs(desviaciones))[::-1][:NUM_MAYORES]
+            resultado = {
+                'estadistico': a2,
+                'valor_critico': valor_critico,
+                'p_valor': p_valor,
+                'rechaza_h0': a2 > valor_critico,
+                'mayores_desviaciones': pd.DataFrame({
+                    'i': mayores + 1,
+                    'u(i)': self.vista.uniformes()[mayores],
+                    'i/n': (mayores + 1) / self.n,
+                    'Desviación': desviaciones[mayores]
+                }),
+                'tipo_prueba': 'Anderson-Darling',
+                'distribucion': nombre_distribucion(self.distribucion),
+                'transformacion': self.vista.descripcion(),
+                'alpha': self.alpha,
+                'n': self.n
+            }
+
+            return resultado
+
+        except Exception as e:
+            raise Exception(f"Error en prueba Anderson-Darling: {str(e)}")
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = valor_critico_anderson_darling(alpha, self.n)
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba de Anderson-Darling"""
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Anderson-Darling")
+        ventana.geometry("900x700")
+
+        resultado = self.ejecutar()
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        titulo = ttk.Label(main_frame, text="Prueba Anderson-Darling - Observaciones más Alejadas",
+                           font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        # Tabla de las observaciones más alejadas de F(x)
+        mayores = resultado['mayores_desviaciones']
+        columns = tuple(mayores.columns)
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=NUM_MAYORES)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=160, anchor='center')
+        for _, fila in mayores.iterrows():
+            tree.insert('', 'end', values=(
+                f"{fila.iloc[0]:.0f}", f"{fila.iloc[1]:.6f}", f"{fila.iloc[2]:.6f}", f"{fila.iloc[3]:.4f}"))
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"A²: {resultado['estadistico']:.6f}").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Nivel de significancia: {self.alpha}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Distribución bajo H0: {resultado['distribucion']}").grid(row=4, column=0, sticky=tk.W)
+
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                   foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=5, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_anderson_darling(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_anderson_darling(self, parent, resultado):
+        """Crear gráfico de la función empírica y de la discrepancia ponderada"""
+        frame_grafico = ttk.LabelFrame(parent, text="Función de Distribución Empírica", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
+
+        u, empirica = self.vista.puntos_grafico()
+        u = np.clip(u, 0.0, 1.0)
+        ax1.step(u, empirica, where='post', color='blue', label='Empírica Sn(u)')
+        ax1.plot([0, 1], [0, 1], 'r--', label='Teórica F(u) = u')
+        ax1.set_xlabel('u = F(x)')
+        ax1.set_ylabel('Probabilidad Acumulada')
+        ax1.set_title('Función de Distribución Empírica')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+
+        # Discrepancia con el peso de Anderson-Darling (crece en las colas)
+        interiores = (u > 0) & (u < 1)
+        ponderada = (empirica[interiores] - u[interiores]) / np.sqrt(u[interiores] * (1 - u[interiores]))
+        ax2.plot(u[interiores], ponderada, color='orange', linewidth=0.8)
+        ax2.axhline(0, color='black', linewidth=0.8)
+        ax2.set_xlabel('u = F(x)')
+        ax2.set_ylabel('(Sn(u) - u) / sqrt(u(1-u))')
+        ax2.set_title('Discrepancia Ponderada')
+        ax2.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+
+def main():
+    """Función para probar el módulo independientemente"""
+    np.random.seed(42)
+    datos_test = np.random.uniform(0, 1, 1000)
+
+    prueba = PruebaAndersonDarling(datos_test, alpha=0.05)
+    resultado = prueba.ejecutar()
+
+    print("Prueba Anderson-Darling")
+    print("=" * 30)
+    print(f"Estadístico A²: {resultado['estadistico']:.6f}")
+    print(f"Valor crítico: {resultado['valor_critico']:.6f}")
+    print(f"P-valor: {resultado['p_valor']:.6f}")
+    print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.stats import norm
+
+from anderson_darling import PruebaAndersonDarling
+from chi_cuadrado import PruebaChi
+from cramer_von_mises import PruebaCramerVonMises
+from fuentes import FUENTES, crear_fuente
+from historial import HistorialResultados, huella_generada, version_codigo
+from intermedios import (AlmacenIntermedios, histograma, limpiar_abandonados,
+                         longitudes_direcciones, longitudes_umbral,
+                         signos_diferencias, signos_umbral)
+from memoria import memoria_desactivada
+from kolmogorov_smornov import PruebaKS
+from longitud_rachas_encima_debajo import LongitudRachasEncimaDebajo
+from LongitudRachasAscendenteDescendente import \
+    LongitudRachasAscendenteDescendente
+from prueba_autocorrelacion import PruebaAutocorrelacion
+from prueba_espectral import PruebaEspectral
+from prueba_huecos import PruebaHuecos
+from prueba_poker import PruebaPoker
+from prueba_racha_maxima import PruebaRachaMaxima
+from prueba_rachas_asc_desc import RachasAscendentesDescendentes
+from prueba_rachas_enc_deb import RachasEncimaDebajo
+from pruebas_bits import PruebaMonobit, PruebaRachasBits
+
+# Directorio donde se guarda el resultado de cada (fuente, semilla, n, prueba, parámetros)
+DIRECTORIO_CACHE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'bateria')
+
+# Pruebas disponibles en la batería: clave -> (clase, parámetros por defecto)
+PRUEBAS = {
+    'chi_cuadrado': (PruebaChi, {'num_intervalos': 10}),
+    'kolmogorov_smornov': (PruebaKS, {}),
+    'rachas_ascendentes_descendentes': (RachasAscendentesDescendentes, {}),
+    'rachas_encima_debajo': (RachasEncimaDebajo, {}),
+    'longitud_rachas_ascendentes_descendentes': (LongitudRachasAscendenteDescendente, {}),
+    'longitud_rachas_enc': (LongitudRachasEncimaDebajo, {}),
+    'poker': (PruebaPoker, {'num_digitos': 5}),
+    'racha_maxima_asc': (PruebaRachaMaxima, {'tipo': 'ascendente_descendente'}),
+    'racha_maxima_enc': (PruebaRachaMaxima, {'tipo': 'encima_debajo'}),
+    'anderson_darling': (PruebaAndersonDarling, {}),
+    'cramer_von_mises': (PruebaCramerVonMises, {}),
+    'huecos': (PruebaHuecos, {}),
+    'autocorrelacion': (PruebaAutocorrelacion, {}),
+    'espectral': (PruebaEspectral, {}),
+    'monobit': (PruebaMonobit, {}),
+    'rachas_bits': (PruebaRachasBits, {}),
+}
+
+# Las seis pruebas originales, que se usan si no se indica otra cosa
+PRUEBAS_BASICAS = (
+    'chi_cuadrado', 'kolmogorov_smornov', 'rachas_ascendentes_descendentes',
+    'rachas_encima_debajo', 'longitud_rachas_ascendentes_descendentes', 'longitud_rachas_enc',
+)
+
+
+def _argumentos_racha_maxima(almacen, datos, parametros):
+    if parametros['tipo'] == 'encima_debajo':
+        longitudes = longitudes_umbral(almacen, datos, incluir_igual=False)
+    else:
+        longitudes = longitudes_direcciones(almacen, datos)
+    return {'longitud_maxima': int(longitudes.max())}
+
+
+# Argumentos de cada prueba que se toman de los intermedios compartidos
+# entre procesos: clave -> función (almacen, datos, parámetros) -> {argumento: valor}
+ARGUMENTOS_INTERMEDIOS = {
+    'chi_cuadrado': lambda almacen, datos, parametros: {
+        'frecuencias_observadas': histograma(almacen, datos, parametros['num_intervalos'])},
+    'kolmogorov_smornov': lambda almacen, datos, parametros: {
+        'frecuencias_observadas': histograma(almacen, datos, parametros.get('num_intervalos', 10))},
+    'rachas_ascendentes_descendentes': lambda almacen, datos, parametros: {
+        'longitudes': longitudes_direcciones(almacen, datos)},
+    'rachas_encima_debajo': lambda almacen, datos, parametros: {
+        'secuencia': signos_umbral(almacen, datos)},
+    'longitud_rachas_ascendentes_descendentes': lambda almacen, datos, parametros: {
+        'secuencia_signos': signos_diferencias(almacen, datos)},
+    'longitud_rachas_enc': lambda almacen, datos, parametros: {
+        'secuencia': signos_umbral(almacen, datos, incluir_igual=False)},
+    'racha_maxima_asc': _argumentos_racha_maxima,
+    'racha_maxima_enc': _argumentos_racha_maxima,
+}
+
+
+def normalizar_prueba(prueba):
+    """(clave, parámetros) de una prueba dada como clave o como par (clave, dict)"""
+    clave, parametros = (prueba, {}) if isinstance(prueba, str) else prueba
+    if clave not in PRUEBAS:
+        raise ValueError(f"Prueba desconocida: {clave}")
+    return clave, {**PRUEBAS[clave][1], **parametros}
+
+
+def clave_cache(fuente, semilla, n, prueba, parametros, alpha):
+    """
+    Hash estable de una ejecución (los parámetros de la fuente son los de
+    FUENTES). Incluye la versión del código, así que al corregir una prueba
+    los resultados guardados con la versión anterior dejan de usarse.
+    """
+    descripcion = json.dumps({
+        'fuente': fuente, 'parametros_fuente': FUENTES[fuente][1], 'semilla': semilla,
+        'n': int(n), 'prueba': prueba, 'parametros': parametros, 'alpha': alpha,
+        'version': version_codigo(),
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(descripcion.encode()).hexdigest()
+
+
+def leer_cache(clave):
+    ruta = os.path.join(DIRECTORIO_CACHE, clave + '.json')
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def guardar_cache(clave, resumen):
+    """Escribe a un temporal y lo renombra para que nadie lea un archivo a medio escribir"""
+    try:
+        os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO_CACHE, suffix='.json')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(resumen, archivo)
+        os.replace(temporal, os.path.join(DIRECTORIO_CACHE, clave + '.json'))
+    except OSError:
+        # Sin caché en disco la batería sigue funcionando
+        pass
+
+
+def resumir_resultado(clave, resultado):
+    """Estadístico, p-valor y decisión de un resultado, con el formato de cada prueba"""
+    if 'error' in resultado:
+        return {'estadistico': None, 'p_valor': None, 'rechaza_h0': None, 'error': resultado['error']}
+    if clave == 'rachas_ascendentes_descendentes':
+        # Igual que en la interfaz: p-valor bilateral de Z
+        z = float(resultado['Z_prueba'])
+        return {'estadistico': z, 'p_valor': float(2 * norm.sf(abs(z))),
+                'rechaza_h0': bool(resultado['rechaza_H0']), 'error': None}
+    estadistico = resultado.get('estadistico', resultado.get('estadistico_z'))
+    return {'estadistico': None if estadistico is None else float(estadistico),
+            'p_valor': float(resultado['p_valor']),
+            'rechaza_h0': bool(resultado['rechaza_h0']), 'error': None}
+
+
+def _clave_intermedios(fuente, semilla, n):
+    """Directorio de intermedios de una secuencia; con otra versión del código no se reutilizan"""
+    return f'{huella_generada(fuente, FUENTES[fuente][1], semilla, n)}_{version_codigo()}'
+
+
+def _ejecutar_trabajo(fuente, semilla, n, pruebas, alpha, referencia=None):
+    """
+    Aplica las pruebas pendientes a la secuencia (fuente, semilla, n). Sin
+    referencia la secuencia se genera en memoria; con una referencia del
+    AlmacenIntermedios de la secuencia, ella y los signos, longitudes de
+    racha e histogramas se calculan una sola vez entre todos los procesos y
+    se abren sin copiarlos. Se ejecuta en un proceso del pool; retorna
+    [(clave_cache, resumen)].
+    """
+    generador = crear_fuente(fuente, semilla)
+    almacen = None if referencia is None else AlmacenIntermedios(_clave_intermedios(fuente, semilla, n))
+    try:
+        if almacen is None:
+            crudos = generador.siguiente_bloque(n, enteros=True)
+            uniformes = generador.a_uniforme(crudos)
+        else:
+            crudos = almacen.obtener('crudos', lambda: generador.siguiente_bloque(n, enteros=True))
+            uniformes = almacen.obtener('uniformes', lambda: generador.a_uniforme(crudos))
+        salida = []
+        # Los resultados ya quedan en la caché en disco de la batería
+        with memoria_desactivada():
+            for clave, clave_prueba, parametros in pruebas:
+                clase = PRUEBAS[clave_prueba][0]
+                usa_enteros = getattr(clase, 'usa_enteros', False)
+                datos = crudos if usa_enteros else uniformes
+                try:
+                    argumentos = {}
+                    if almacen is not None and not usa_enteros and clave_prueba in ARGUMENTOS_INTERMEDIOS:
+                        argumentos = ARGUMENTOS_INTERMEDIOS[clave_prueba](almacen, datos, parametros)
+                    resultado = clase(datos, alpha=alpha, **parametros, **argumentos).ejecutar()
+                except Exception as e:
+                    resultado = {'error': str(e)}
+                salida.append((clave, resumir_resultado(clave_prueba, resultado)))
+        return salida
+    finally:
+        if almacen is not None:
+            almacen.soltar(referencia)
+
+
+class Bateria:
+    """
+    Ejecuta una grilla fuentes x semillas x tamaños x pruebas y resume las
+    tasas de aprobación por fuente. Cada secuencia (fuente, semilla, n) se
+    genera una sola vez por trabajo; los trabajos se reparten dinámicamente
+    entre los procesos (cada uno toma el siguiente cuando termina), empezando
+    por los más grandes. Los resultados se guardan por (fuente, semilla, n,
+    prueba, parámetros), así que una grilla repetida o ampliada solo calcula
+    lo que falta.
+
+    Con varios procesos y compartir_intermedios, cada prueba es un trabajo
+    aparte y la secuencia, sus signos, longitudes de racha e histogramas se
+    comparten entre los procesos con un AlmacenIntermedios por secuencia.
+    """
+
+    def __init__(self, fuentes, semillas, tamanos, pruebas=PRUEBAS_BASICAS, alpha=0.05,
+                 procesos=None, usar_cache=True, compartir_intermedios=True):
+        """
+        :param fuentes: Nombres de FUENTES.
+        :param semillas: Semillas a usar con cada fuente.
+        :param tamanos: Cantidades de números n.
+        :param pruebas: Claves de PRUEBAS o pares (clave, parámetros).
+        :param alpha: Nivel de significancia de cada prueba.
+        :param procesos: Procesos del pool (None = núcleos disponibles, 1 = sin pool).
+        :param usar_cache: Leer y guardar resultados en DIRECTORIO_CACHE.
+        :param compartir_intermedios: Repartir las pruebas de una secuencia entre los procesos
+            compartiendo los intermedios (solo con pool).
+        """
+        for fuente in fuentes:
+            if fuente not in FUENTES:
+                raise ValueError(f"Fuente desconocida: {fuente}")
+        self.fuentes = list(fuentes)
+        self.semillas = [int(semilla) for semilla in semillas]
+        self.tamanos = [int(n) for n in tamanos]
+        self.pruebas = [normalizar_prueba(prueba) for prueba in pruebas]
+        if not (self.fuentes and self.semillas and self.tamanos and self.pruebas):
+            raise ValueError("La grilla necesita al menos una fuente, semilla, tamaño y prueba.")
+        self.alpha = alpha
+        self.procesos = procesos
+        self.usar_cache = usar_cache
+        self.compartir_intermedios = compartir_intermedios
+        self.ejecutadas = 0
+        self.desde_cache = 0
+
+    def _planificar(self):
+        """Filas de la grilla y trabajos pendientes (los que no están en caché)"""
+        filas, trabajos = [], []
+        for fuente, semilla, n in product(self.fuentes, self.semillas, self.tamanos):
+            pendientes = []
+            for clave_prueba, parametros in self.pruebas:
+                clave = clave_cache(fuente, semilla, n, clave_prueba, parametros, self.alpha)
+                filas.append((clave, fuente, semilla, n, clave_prueba, parametros))
+                if not (self.usar_cache and leer_cache(clave) is not None):
+                    pendientes.append((clave, clave_prueba, parametros))
+            if pendientes:
+                trabajos.append((fuente, semilla, n, pendientes))
+        # Los trabajos grandes primero, para que no quede uno largo al final
+        trabajos.sort(key=lambda trabajo: -trabajo[2] * len(trabajo[3]))
+        return filas, trabajos
+
+    @staticmethod
+    def _repartir(trabajos):
+        """
+        Un trabajo por prueba, cada uno con una referencia del
+        AlmacenIntermedios de su secuencia. Retorna los trabajos y los pares
+        (almacén, referencia) para soltar los que queden si algo falla.
+        """
+        repartidos, referencias = [], []
+        for fuente, semilla, n, pendientes in trabajos:
+            almacen = AlmacenIntermedios(_clave_intermedios(fuente, semilla, n))
+            for pendiente, referencia in zip(pendientes, almacen.reservar(len(pendientes))):
+                repartidos.append((fuente, semilla, n, [pendiente], referencia))
+                referencias.append((almacen, referencia))
+        return repartidos, referencias
+
+    def _recibir(self, resumenes, nuevos):
+        """
+        Agrega los resúmenes de un trabajo y los guarda en caché en el momento:
+        si la batería se interrumpe, lo ya calculado no se repite.
+        """
+        for clave, resumen in nuevos:
+            resumenes[clave] = resumen
+            if self.usar_cache:
+                guardar_cache(clave, resumen)
+
+    def ejecutar(self):
+        """DataFrame con una fila por (fuente, semilla, n, prueba)"""
+        filas, trabajos = self._planificar()
+        referencias = []
+        if self.procesos != 1 and self.compartir_intermedios:
+            limpiar_abandonados()
+            trabajos, referencias = self._repartir(trabajos)
+        else:
+            trabajos = [(*trabajo, None) for trabajo in trabajos]
+
+        resumenes = {}
+        try:
+            if self.procesos == 1 or len(trabajos) <= 1:
+                for fuente, semilla, n, pendientes, referencia in trabajos:
+                    self._recibir(resumenes, _ejecutar_trabajo(fuente, semilla, n, pendientes, self.alpha, referencia))
+            elif trabajos:
+                with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                    futuros = [pool.submit(_ejecutar_trabajo, fuente, semilla, n, pendientes, self.alpha, referencia)
+                               for fuente, semilla, n, pendientes, referencia in trabajos]
+                    for futuro in as_completed(futuros):
+                        self._recibir(resumenes, futuro.result())
+        finally:
+            # Las referencias de trabajos que fallaron o no llegaron a correr
+            for almacen, referencia in referencias:
+                almacen.soltar(referencia)
+        self.ejecutadas = len(resumenes)
+        self.desde_cache = len(filas) - len(resumenes)
+
+        registros = []
+        for clave, fuente, semilla, n, clave_prueba, parametros in filas:
+            resumen = resumenes[clave] if clave in resumenes else leer_cache(clave)
+            registros.append({
+                'fuente': fuente, 'semilla': semilla, 'n': n, 'prueba': clave_prueba,
+                'parametros': json.dumps(parametros, sort_keys=True, default=str), **resumen})
+        return pd.DataFrame(registros)
+
+    @staticmethod
+    def agregar(detalle):
+        """
+        Por (fuente, n, prueba): tasa de aprobación sobre las semillas,
+        cuartiles de los p-valores y p-valor de la uniformidad de los p-valores
+        (K-S de segundo nivel: con H0 cierta deben ser U(0, 1)). Las semillas
+        en que la prueba no se pudo calcular se cuentan en 'errores'.
+        """
+        filas = []
+        for (fuente, n, prueba), grupo in detalle.groupby(['fuente', 'n', 'prueba'], sort=False):
+            validos = grupo.dropna(subset=['p_valor'])
+            p = validos['p_valor'].to_numpy(dtype=float)
+            q1, mediana, q3 = np.quantile(p, [0.25, 0.5, 0.75]) if len(p) else (np.nan,) * 3
+            filas.append({
+                'fuente': fuente, 'n': n, 'prueba': prueba, 'semillas': len(p),
+                'errores': len(grupo) - len(p),
+                'tasa_aprobacion': 1 - validos['rechaza_h0'].astype(bool).mean() if len(p) else np.nan,
+                'p_min': p.min() if len(p) else np.nan, 'p_q1': q1, 'p_mediana': mediana, 'p_q3': q3,
+                'p_uniformidad': stats.kstest(p, 'uniform').pvalue if len(p) > 1 else np.nan,
+            })
+        return pd.DataFrame(filas)
+
+    @staticmethod
+    def ranking(agregado):
+        """Fuentes ordenadas por tasa media de aprobación (y luego por la uniformidad de los p-valores)"""
+        return (agregado.groupby('fuente')
+                .agg(tasa_aprobacion=('tasa_aprobacion', 'mean'),
+                     peor_tasa=('tasa_aprobacion', 'min'),
+                     p_uniformidad_min=('p_uniformidad', 'min'))
+                .sort_values(['tasa_aprobacion', 'p_uniformidad_min'], ascending=False))
+
+
+def _leer_semillas(texto):
+    """'1-20' o '1,5,9' -> lista de semillas"""
+    if '-' in texto:
+        inicio, fin = texto.split('-', 1)
+        return list(range(int(inicio), int(fin) + 1))
+    return [int(valor) for valor in texto.split(',')]
+
+
+def main():
+    """Ejecutar la batería desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Batería de pruebas sobre varias fuentes y semillas")
+    parser.add_argument('--fuentes', nargs='+', default=list(FUENTES), metavar='FUENTE',
+                        help=f"Fuentes a comparar: {', '.join(FUENTES)}")
+    parser.add_argument('--semillas', default='1-10', help="Rango '1-10' o lista '1,5,9'")
+    parser.add_argument('--n', nargs='+', type=int, default=[10000], help="Tamaños de muestra")
+    parser.add_argument('--pruebas', nargs='+', default=list(PRUEBAS_BASICAS), choices=list(PRUEBAS))
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--sin-cache', action='store_true', help="No leer ni guardar resultados en caché")
+    parser.add_argument('--sin-intermedios', action='store_true',
+                        help="No compartir la secuencia ni los intermedios entre procesos")
+    parser.add_argument('--salida', help="CSV donde guardar el detalle por semilla")
+    parser.add_argument('--historial', action='store_true', help="Guardar el detalle en el historial de resultados")
+    args = parser.parse_args()
+
+    bateria = Bateria(args.fuentes, _leer_semillas(args.semillas), args.n, args.pruebas,
+                      args.alpha, args.procesos, not args.sin_cache, not args.sin_intermedios)
+    detalle = bateria.ejecutar()
+    agregado = Bateria.agregar(detalle)
+    if args.salida:
+        detalle.to_csv(args.salida, index=False)
+    if args.historial:
+        with HistorialResultados() as historial:
+            nuevos = historial.guardar_bateria(detalle, args.alpha, {fuente: FUENTES[fuente][1] for fuente in args.fuentes})
+        print(f"Historial: {nuevos} resultados nuevos")
+
+    print(f"Ejecuciones: {bateria.ejecutadas} nuevas, {bateria.desde_cache} desde caché")
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(agregado.to_string(index=False, float_format='{:.4f}'.format))
+        print("\nRanking de fuentes")
+        print("=" * 30)
+        print(Bateria.ranking(agregado).to_string(float_format='{:.4f}'.format))
+
+
+if __name__ == "__main__":
+    main()
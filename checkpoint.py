@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+import numpy as np
+
+
+def guardar_checkpoint(ruta, contenido):
+    """
+    Guarda un diccionario {nombre: array o escalar} en un .npz pequeño. Se
+    escribe a un temporal del mismo directorio, se fuerza a disco y se
+    renombra, así que un corte en cualquier momento deja el checkpoint
+    anterior o el nuevo completo, nunca uno a medias.
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.npz')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            np.savez(archivo, **{nombre: np.asarray(valor) for nombre, valor in contenido.items()})
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def cargar_checkpoint(ruta):
+    """Diccionario guardado con guardar_checkpoint, o None si no existe o está dañado"""
+    try:
+        with np.load(ruta) as guardado:
+            return dict(guardado)
+    except (OSError, ValueError):
+        return None
+
+
+def estados_con_prefijo(contenido, prefijo):
+    """Entradas 'prefijo.campo' de un checkpoint como {campo: valor}"""
+    prefijo += '.'
+    return {nombre[len(prefijo):]: valor for nombre, valor in contenido.items() if nombre.startswith(prefijo)}
@@ -6,12 +6,35 @@ from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from distribuciones import intervalos_equiprobables, nombre_distribucion
+from histogramas import conteos_multiresolucion
+from memoria import memoria_desactivada, memorizar
+
+def validar_datos(datos, minimo=1):
+    """
+    Convertir los datos en un array 1-D de flotantes y verificar que se puedan
+    usar en una prueba: numéricos, finitos y al menos `minimo` valores
+    """
+    try:
+        datos = np.asarray(datos, dtype=float).ravel()
+    except (TypeError, ValueError):
+        raise ValueError("Los datos deben ser numéricos.")
+    if datos.size < minimo:
+        raise ValueError(f"Se necesitan al menos {minimo} datos (se recibieron {datos.size}).")
+    if not np.all(np.isfinite(datos)):
+        raise ValueError("Los datos contienen valores no finitos (NaN o infinito).")
+    return datos
+
 class PruebaChi:
-    def __init__(self, datos, num_intervalos=10, alpha=0.05):
-        self.datos = np.array(datos)
+    def __init__(self, datos, num_intervalos=10, alpha=0.05, distribucion=None, frecuencias_observadas=None):
+        self.datos = validar_datos(datos)
         self.num_intervalos = num_intervalos
         self.alpha = alpha
-        self.n = len(datos)
+        self.n = len(self.datos)
+        # Distribución bajo H0: None = U(0,1), distribución congelada de SciPy o CDF vectorizada
+        self.distribucion = distribucion
+        # Frecuencias ya contadas (por ejemplo, en un barrido de intervalos)
+        self.frecuencias_observadas = frecuencias_observadas
         
         # Tabla Chi-cuadrado (valores críticos)
         self.tabla_chi = {
@@ -30,16 +53,24 @@ class PruebaChi:
     def calcular_intervalos(self):
         """Dividir el intervalo [0, 1) en num_intervalos iguales sin incluir el extremo derecho"""
 
-        # Dividir [0, 1) en num_intervalos con np.linspace excluyendo el 1.0
-        step = 1 / self.num_intervalos
-        limites = np.arange(0, 1 + 1e-10, step)  # Agrega un epsilon para asegurar inclusión final en np.histogram
+        if self.distribucion is None:
+            # Dividir [0, 1) en num_intervalos con np.linspace excluyendo el 1.0
+            step = 1 / self.num_intervalos
+            limites = np.arange(0, 1 + 1e-10, step)  # Agrega un epsilon para asegurar inclusión final en np.histogram
 
-        # Frecuencias observadas (solo cuenta valores >= lim_inf y < lim_sup)
-        datos_filtrados = self.datos[self.datos < 1.0]  # Evitar que 1.0 entre al último intervalo
-        freq_observadas, _ = np.histogram(datos_filtrados, bins=limites)
+            # Frecuencia esperada uniforme
+            freq_esperada = self.n / self.num_intervalos
+        else:
+            # Intervalos equiprobables de la distribución (límites vía PPF, cacheados por (distribución, k))
+            limites, probabilidades = intervalos_equiprobables(self.distribucion, self.num_intervalos)
+            freq_esperada = self.n * probabilidades
 
-        # Frecuencia esperada uniforme
-        freq_esperada = self.n / self.num_intervalos
+        # Frecuencias observadas (solo cuenta valores >= lim_inf y < lim_sup; el 1.0 queda fuera)
+        if self.frecuencias_observadas is not None:
+            freq_observadas = np.asarray(self.frecuencias_observadas)
+        else:
+            freq_observadas = conteos_multiresolucion(
+                self.datos, [self.num_intervalos], self.distribucion)[self.num_intervalos]
 
         return limites, freq_observadas, freq_esperada
     
@@ -55,15 +86,28 @@ class PruebaChi:
         
         return chi_cuadrado, grados_libertad, limites, freq_obs, freq_esp
     
-    def obtener_valor_critico(self, grados_libertad):
+    def obtener_valor_critico(self, grados_libertad, alpha=None):
         """Obtener valor crítico de la tabla Chi-cuadrado"""
+        alpha = self.alpha if alpha is None else alpha
         if grados_libertad in self.tabla_chi:
-            if self.alpha in self.tabla_chi[grados_libertad]:
-                return self.tabla_chi[grados_libertad][self.alpha]
+            if alpha in self.tabla_chi[grados_libertad]:
+                return self.tabla_chi[grados_libertad][alpha]
         
         # Si no está en la tabla, usar scipy
-        return stats.chi2.ppf(1 - self.alpha, grados_libertad)
+        return stats.chi2.ppf(1 - alpha, grados_libertad)
+    
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = self.obtener_valor_critico(resultado['grados_libertad'], alpha)
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
     
+    @memorizar('num_intervalos', 'alpha', 'distribucion')
     def ejecutar(self):
         """Ejecutar la prueba Chi-cuadrado"""
         try:
@@ -86,6 +130,7 @@ class PruebaChi:
                 'frecuencias_observadas': freq_obs,
                 'frecuencia_esperada': freq_esp,
                 'tipo_prueba': 'Chi-cuadrado',
+                'distribucion': nombre_distribucion(self.distribucion),
                 'alpha': self.alpha,
                 'n': self.n
             }
@@ -95,6 +140,19 @@ class PruebaChi:
         except Exception as e:
             raise Exception(f"Error en prueba Chi-cuadrado: {str(e)}")
     
+    def barrido_intervalos(self, lista_intervalos):
+        """Ejecutar la prueba para varios números de intervalos con una sola pasada sobre los datos"""
+        conteos = conteos_multiresolucion(self.datos, lista_intervalos, self.distribucion)
+        
+        resultados = {}
+        # Cada k ya trae sus frecuencias: no vale la pena calcular huellas de los datos
+        with memoria_desactivada():
+            for k, freq_obs in conteos.items():
+                prueba = PruebaChi(self.datos, k, self.alpha, self.distribucion, frecuencias_observadas=freq_obs)
+                resultados[k] = prueba.ejecutar()
+        
+        return resultados
+    
     def mostrar_tabla_detallada(self, parent=None):
         """Mostrar tabla detallada de la prueba Chi-cuadrado"""
         ventana = tk.Toplevel(parent) if parent else tk.Tk()
@@ -105,7 +163,7 @@ class PruebaChi:
         resultado = self.ejecutar()
         limites = resultado['limites']
         freq_obs = resultado['frecuencias_observadas']
-        freq_esp = resultado['frecuencia_esperada']
+        freq_esp = np.broadcast_to(resultado['frecuencia_esperada'], freq_obs.shape)
         
         # Frame principal
         main_frame = ttk.Frame(ventana, padding="10")
@@ -131,7 +189,7 @@ class PruebaChi:
             limite_inf = limites[i]
             limite_sup = limites[i+1]
             oi = freq_obs[i]
-            ei = freq_esp
+            ei = freq_esp[i]
             chi_contrib = (oi - ei) ** 2 / ei
             chi_total += chi_contrib
             
@@ -150,7 +208,7 @@ class PruebaChi:
             "-",
             "-",
             f"{sum(freq_obs)}",
-            f"{freq_esp * len(freq_obs):.2f}",
+            f"{np.sum(freq_esp):.2f}",
             f"{chi_total:.4f}"
         ), tags=('total',))
         
@@ -173,13 +231,14 @@ class PruebaChi:
         ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=2, column=0, sticky=tk.W)
         ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=3, column=0, sticky=tk.W)
         ttk.Label(frame_resultados, text=f"Nivel de significancia: {self.alpha}").grid(row=4, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Distribución bajo H0: {resultado['distribucion']}").grid(row=5, column=0, sticky=tk.W)
         
         # Decisión
         decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
         color = "red" if resultado['rechaza_h0'] else "green"
         decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", 
                                   foreground=color, font=("Arial", 10, "bold"))
-        decision_label.grid(row=5, column=0, sticky=tk.W, pady=5)
+        decision_label.grid(row=6, column=0, sticky=tk.W, pady=5)
         
         # Gráfico
         self.crear_grafico_chi(main_frame, resultado)
@@ -204,7 +263,7 @@ class PruebaChi:
         # Datos para el gráfico
         intervalos = [f"Int {i+1}" for i in range(len(resultado['frecuencias_observadas']))]
         freq_obs = resultado['frecuencias_observadas']
-        freq_esp = [resultado['frecuencia_esperada']] * len(freq_obs)
+        freq_esp = np.broadcast_to(resultado['frecuencia_esperada'], freq_obs.shape)
         
         x = np.arange(len(intervalos))
         width = 0.35
@@ -258,6 +317,10 @@ def main():
     print(f"P-valor: {resultado['p_valor']:.6f}")
     print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
     
+    # Barrido de intervalos con una sola pasada sobre los datos
+    for k, resultado_k in prueba.barrido_intervalos([5, 10, 20, 50]).items():
+        print(f"k={k}: Chi²={resultado_k['estadistico']:.4f}, ¿Rechaza H0?: {resultado_k['rechaza_h0']}")
+    
     # Mostrar tabla detallada
     ventana = prueba.mostrar_tabla_detallada()
     ventana.mainloop()
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from memoria import describir_parametro
+
+# Pares (distribución, k) cuyos intervalos se conservan como máximo
+MAX_INTERVALOS = 128
+
+_intervalos = OrderedDict()
+
+
+def funcion_cdf(distribucion):
+    """
+    Obtiene la CDF vectorizada de una distribución.
+    :param distribucion: Distribución congelada de SciPy (por ejemplo
+        stats.expon(scale=2)) o una función CDF vectorizada del usuario.
+    """
+    if hasattr(distribucion, 'cdf'):
+        return distribucion.cdf
+    if callable(distribucion):
+        return distribucion
+    raise TypeError(
+        "La distribución debe ser una distribución congelada de SciPy o una función CDF.")
+
+
+def transformar_uniforme(datos, distribucion=None):
+    """
+    Transformada integral de probabilidad u = F(x). Si los datos siguen la
+    distribución, u sigue una U(0, 1). Sin distribución se retornan los datos.
+    """
+    datos = np.asarray(datos, dtype=float)
+    if distribucion is None:
+        return datos
+    return np.asarray(funcion_cdf(distribucion)(datos), dtype=float)
+
+
+def _invertir_cdf(cdf, probabilidades, iteraciones=200):
+    """PPF numérica por bisección vectorizada para CDFs del usuario."""
+    probabilidades = np.asarray(probabilidades, dtype=float)
+    inferior = np.full(probabilidades.shape, -1.0)
+    superior = np.full(probabilidades.shape, 1.0)
+
+    # Ampliar el intervalo de búsqueda hasta encerrar cada probabilidad
+    for _ in range(64):
+        bajos = np.asarray(cdf(inferior)) > probabilidades
+        altos = np.asarray(cdf(superior)) < probabilidades
+        if not (bajos.any() or altos.any()):
+            break
+        inferior[bajos] *= 2
+        superior[altos] *= 2
+
+    for _ in range(iteraciones):
+        medio = (inferior + superior) / 2
+        debajo = np.asarray(cdf(medio)) < probabilidades
+        inferior = np.where(debajo, medio, inferior)
+        superior = np.where(debajo, superior, medio)
+    return (inferior + superior) / 2
+
+
+def intervalos_equiprobables(distribucion, num_intervalos):
+    """
+    Límites de num_intervalos intervalos equiprobables (vía la PPF) en la escala
+    de los datos y la probabilidad de cada intervalo. Se cachea por
+    (familia y argumentos de la distribución, k), así que dos distribuciones
+    congeladas iguales comparten la entrada; los arrays retornados son de
+    solo lectura.
+    """
+    clave = (describir_parametro(distribucion), num_intervalos)
+    if clave in _intervalos:
+        _intervalos.move_to_end(clave)
+        return _intervalos[clave]
+    _intervalos[clave] = _calcular_intervalos(distribucion, num_intervalos)
+    while len(_intervalos) > MAX_INTERVALOS:
+        _intervalos.popitem(last=False)
+    return _intervalos[clave]
+
+
+def _calcular_intervalos(distribucion, num_intervalos):
+    cuantiles = np.linspace(0, 1, num_intervalos + 1)
+
+    if distribucion is None:
+        limites = cuantiles
+    elif hasattr(distribucion, 'ppf'):
+        limites = np.asarray(distribucion.ppf(cuantiles), dtype=float)
+    else:
+        limites = np.concatenate((
+            [-np.inf], _invertir_cdf(distribucion, cuantiles[1:-1]), [np.inf]))
+
+    if distribucion is None:
+        probabilidades = np.diff(cuantiles)
+    else:
+        probabilidades = np.diff(transformar_uniforme(limites, distribucion))
+
+    limites.setflags(write=False)
+    probabilidades.setflags(write=False)
+    return limites, probabilidades
+
+
+def nombre_distribucion(distribucion):
+    """Nombre legible de la distribución para tablas y reportes."""
+    if distribucion is None:
+        return "Uniforme(0, 1)"
+    if hasattr(distribucion, 'dist'):
+        argumentos = [f"{valor:g}" for valor in distribucion.args]
+        argumentos += [f"{clave}={valor:g}" for clave, valor in distribucion.kwds.items()]
+        return f"{distribucion.dist.name}({', '.join(argumentos)})"
+    return getattr(distribucion, '__name__', "CDF del usuario")
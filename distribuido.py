@@ -0,0 +1,387 @@
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from incremental import ACUMULADORES_INCREMENTALES
+from lectura import EXTENSIONES_EXCEL, TAMANO_BLOQUE, abrir_datos, leer_bloques
+
+# Números por tramo que se reparte a un trabajador
+TAMANO_TRAMO = 1 << 24
+
+# Veces que se reparte un tramo antes de darlo por fallido
+MAX_INTENTOS = 3
+
+# Segundos que se espera el resultado de un tramo antes de repartirlo de nuevo
+TIEMPO_LIMITE = 600.0
+
+# Segundos que un trabajador espera antes de volver a pedir cuando no hay tramos libres
+PAUSA_ESPERA = 0.2
+
+# Intentos de conexión de un trabajador (el coordinador puede arrancar después)
+INTENTOS_CONEXION = 50
+PAUSA_CONEXION = 0.2
+
+
+def _codificar(mensaje):
+    return json.dumps(mensaje).encode() + b'\n'
+
+
+def _estado_json(estado):
+    """Estado de un acumulador con valores de JSON (los arrays como listas)"""
+    return {campo: np.asarray(valor).tolist() for campo, valor in estado.items()}
+
+
+def dividir_archivo(ruta, dtype=np.float64, tamano_tramo=TAMANO_TRAMO):
+    """Tramos [inicio, fin) de un archivo; un Excel se lee completo y va en un solo tramo"""
+    n = len(abrir_datos(ruta, dtype))
+    if os.path.splitext(ruta)[1].lower() in EXTENSIONES_EXCEL or n == 0:
+        return [(0, n)]
+    return [(inicio, min(inicio + tamano_tramo, n)) for inicio in range(0, n, tamano_tramo)]
+
+
+def procesar_tramo(ruta, inicio, fin, pruebas, dtype=np.float64, tamano_bloque=TAMANO_BLOQUE):
+    """{clave: estado} de acumuladores que empiezan de cero en datos[inicio:fin]"""
+    datos = abrir_datos(ruta, dtype)[inicio:fin]
+    acumuladores = {clave: ACUMULADORES_INCREMENTALES[clave][1]() for clave in pruebas}
+    for bloque in leer_bloques(datos, 0, tamano_bloque):
+        for acumulador in acumuladores.values():
+            acumulador.actualizar(bloque)
+    return {clave: _estado_json(acumulador.estado()) for clave, acumulador in acumuladores.items()}
+
+
+class Coordinador:
+    """
+    Reparte las pruebas incrementales de varios archivos entre trabajadores
+    conectados por TCP (asyncio, un mensaje JSON por línea). Cada archivo se
+    divide en tramos; un trabajador pide un tramo, lo procesa con
+    acumuladores desde cero y devuelve su estado. Al final los estados de
+    cada archivo se combinan en orden, con el mismo resultado que procesarlo
+    de una pasada. Un tramo cuyo trabajador falla, se desconecta o no
+    responde en tiempo_limite segundos vuelve a la cola, hasta max_intentos
+    veces.
+
+    Los trabajadores abren los archivos por su ruta, así que en otras
+    máquinas tienen que verlos en la misma ruta (un directorio compartido).
+    """
+
+    def __init__(self, archivos, pruebas=tuple(ACUMULADORES_INCREMENTALES), dtype=np.float64,
+                 tamano_tramo=TAMANO_TRAMO, tamano_bloque=TAMANO_BLOQUE, host='127.0.0.1', puerto=0,
+                 max_intentos=MAX_INTENTOS, tiempo_limite=TIEMPO_LIMITE):
+        """
+        :param archivos: Archivos de datos (Excel, .npy o binario crudo).
+        :param pruebas: Claves de ACUMULADORES_INCREMENTALES.
+        :param dtype: Tipo de los valores de un binario crudo.
+        :param tamano_tramo: Números por tramo repartido.
+        :param tamano_bloque: Números por bloque al procesar un tramo.
+        :param host: Dirección donde escuchar ('0.0.0.0' para otras máquinas).
+        :param puerto: Puerto donde escuchar (0 elige uno libre).
+        :param max_intentos: Veces que se reparte un tramo antes de darlo por fallido.
+        :param tiempo_limite: Segundos para devolver un tramo.
+        """
+        for clave in pruebas:
+            if clave not in ACUMULADORES_INCREMENTALES:
+                raise ValueError(f"Prueba sin modo incremental: {clave}")
+        self.archivos = [os.path.abspath(ruta) for ruta in archivos]
+        self.pruebas = list(pruebas)
+        self.dtype = np.dtype(dtype)
+        self.tamano_tramo = tamano_tramo
+        self.tamano_bloque = tamano_bloque
+        self.host = host
+        self.puerto = puerto
+        self.max_intentos = max_intentos
+        self.tiempo_limite = tiempo_limite
+
+        self.tareas = []          # (ruta, inicio, fin) por número de tarea
+        self.pendientes = deque()
+        self.intentos = {}
+        self.estados = {}         # tarea -> {clave: estado}
+        self.fallidas = {}        # tarea -> último error
+        self.errores = {}         # ruta -> error al dividirla
+        self.reintentos = 0
+        self.terminado = None
+        self.servidor = None
+
+    def _preparar(self):
+        for ruta in self.archivos:
+            try:
+                tramos = dividir_archivo(ruta, self.dtype, self.tamano_tramo)
+            except (OSError, ValueError) as e:
+                self.errores[ruta] = str(e)
+                continue
+            for inicio, fin in tramos:
+                self.pendientes.append(len(self.tareas))
+                self.tareas.append((ruta, inicio, fin))
+
+    def _completa(self):
+        return len(self.estados) + len(self.fallidas) == len(self.tareas)
+
+    def _siguiente(self):
+        """Próxima tarea libre, o None"""
+        if not self.pendientes:
+            return None
+        tarea = self.pendientes.popleft()
+        self.intentos[tarea] = self.intentos.get(tarea, 0) + 1
+        return tarea
+
+    def _fallar(self, tarea, motivo):
+        """La tarea vuelve a la cola o, agotados los intentos, queda fallida"""
+        if self.intentos[tarea] < self.max_intentos:
+            self.reintentos += 1
+            self.pendientes.append(tarea)
+        else:
+            self.fallidas[tarea] = motivo
+            self._revisar_fin()
+
+    def _completar(self, tarea, estados):
+        self.estados[tarea] = estados
+        self._revisar_fin()
+
+    def _revisar_fin(self):
+        if self._completa():
+            self.terminado.set()
+
+    def _mensaje_tarea(self, tarea):
+        ruta, inicio, fin = self.tareas[tarea]
+        return {'tipo': 'tarea', 'tarea': tarea, 'ruta': ruta, 'inicio': inicio, 'fin': fin,
+                'pruebas': self.pruebas, 'dtype': self.dtype.str, 'tamano_bloque': self.tamano_bloque}
+
+    async def _atender(self, lector, escritor):
+        """Conversación con un trabajador: pide, recibe un tramo, devuelve el estado, pide otro..."""
+        tarea = None
+        try:
+            while True:
+                espera = self.tiempo_limite if tarea is not None else None
+                linea = await asyncio.wait_for(lector.readline(), espera)
+                if not linea:
+                    raise ConnectionError("El trabajador cerró la conexión")
+                mensaje = json.loads(linea)
+                if tarea is not None:
+                    if mensaje.get('tipo') == 'resultado' and mensaje.get('tarea') == tarea:
+                        self._completar(tarea, mensaje['estados'])
+                    else:
+                        self._fallar(tarea, mensaje.get('mensaje', "Respuesta inesperada del trabajador"))
+                    tarea = None
+
+                if self.terminado.is_set():
+                    escritor.write(_codificar({'tipo': 'fin'}))
+                    await escritor.drain()
+                    return
+                tarea = self._siguiente()
+                if tarea is None:
+                    # Lo que falta está en manos de otros trabajadores
+                    respuesta = {'tipo': 'esperar', 'segundos': PAUSA_ESPERA}
+                else:
+                    respuesta = self._mensaje_tarea(tarea)
+                escritor.write(_codificar(respuesta))
+                await escritor.drain()
+        except (ConnectionError, asyncio.TimeoutError, ValueError, KeyError) as e:
+            if tarea is not None:
+                self._fallar(tarea, str(e) or "Sin respuesta del trabajador")
+        finally:
+            escritor.close()
+
+    async def iniciar(self):
+        """Divide los archivos y empieza a escuchar; retorna el puerto"""
+        self.terminado = asyncio.Event()
+        self._preparar()
+        self._revisar_fin()
+        self.servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    async def esperar(self):
+        """Espera a que todos los tramos terminen (o fallen), deja de escuchar y retorna los resultados"""
+        await self.terminado.wait()
+        self.servidor.close()
+        return self.resultados()
+
+    async def ejecutar(self):
+        await self.iniciar()
+        return await self.esperar()
+
+    def resultados(self):
+        """
+        {ruta: {clave: resultado}} combinando los tramos de cada archivo en
+        orden; un archivo con algún tramo fallido queda como {'error': ...}.
+        """
+        resultados = {ruta: {'error': error} for ruta, error in self.errores.items()}
+        tareas_archivo = {}
+        for tarea, (ruta, inicio, _) in enumerate(self.tareas):
+            tareas_archivo.setdefault(ruta, []).append((inicio, tarea))
+
+        for ruta, tareas in tareas_archivo.items():
+            tareas = [tarea for _, tarea in sorted(tareas)]
+            fallidas = [tarea for tarea in tareas if tarea in self.fallidas]
+            if fallidas:
+                resultados[ruta] = {'error': f"{len(fallidas)} tramo(s) fallaron: {self.fallidas[fallidas[0]]}"}
+                continue
+            resultados[ruta] = {}
+            for clave in self.pruebas:
+                clase = ACUMULADORES_INCREMENTALES[clave][1]
+                acumulador = clase()
+                for tarea in tareas:
+                    acumulador.combinar(clase().restaurar(self.estados[tarea][clave]))
+                resultados[ruta][clave] = acumulador.ejecutar()
+        return {ruta: resultados[ruta] for ruta in self.archivos}
+
+
+def _conectar(host, puerto):
+    for intento in range(INTENTOS_CONEXION):
+        try:
+            return socket.create_connection((host, puerto))
+        except OSError:
+            if intento == INTENTOS_CONEXION - 1:
+                raise
+            time.sleep(PAUSA_CONEXION)
+
+
+def trabajador(host, puerto):
+    """
+    Pide tramos al coordinador hasta que responde 'fin' (o cierra la
+    conexión) y retorna cuántos procesó.
+    """
+    procesados = 0
+    with _conectar(host, puerto) as conexion, conexion.makefile('rwb') as canal:
+        mensaje = {'tipo': 'pedir'}
+        while True:
+            try:
+                canal.write(_codificar(mensaje))
+                canal.flush()
+                linea = canal.readline()
+            except OSError:
+                break
+            if not linea:
+                break
+            orden = json.loads(linea)
+            if orden['tipo'] == 'fin':
+                break
+            if orden['tipo'] == 'esperar':
+                time.sleep(orden['segundos'])
+                mensaje = {'tipo': 'pedir'}
+                continue
+            try:
+                estados = procesar_tramo(orden['ruta'], orden['inicio'], orden['fin'], orden['pruebas'],
+                                         orden['dtype'], orden['tamano_bloque'])
+                mensaje = {'tipo': 'resultado', 'tarea': orden['tarea'], 'estados': estados}
+                procesados += 1
+            except Exception as e:
+                mensaje = {'tipo': 'error', 'tarea': orden['tarea'], 'mensaje': f"{type(e).__name__}: {e}"}
+    return procesados
+
+
+async def _ejecutar_local(coordinador, trabajadores):
+    puerto = await coordinador.iniciar()
+    comando = [sys.executable, os.path.abspath(__file__), 'trabajador',
+               '--host', coordinador.host, '--puerto', str(puerto)]
+
+    async def lanzar():
+        return await asyncio.create_subprocess_exec(*comando)
+
+    procesos = [await lanzar() for _ in range(trabajadores)]
+    # Un trabajador que termina con error se reemplaza mientras quede trabajo
+    reemplazos = trabajadores * coordinador.max_intentos
+    fin = asyncio.create_task(coordinador.terminado.wait())
+    try:
+        while not fin.done():
+            vivos = {asyncio.create_task(proceso.wait()): proceso for proceso in procesos}
+            hechos, _ = await asyncio.wait([fin, *vivos], return_when=asyncio.FIRST_COMPLETED)
+            for tarea_proceso in vivos:
+                if tarea_proceso not in hechos:
+                    tarea_proceso.cancel()
+            if fin.done():
+                break
+            for tarea_proceso in hechos - {fin}:
+                proceso = vivos[tarea_proceso]
+                procesos.remove(proceso)
+                if proceso.returncode != 0 and reemplazos > 0:
+                    reemplazos -= 1
+                    procesos.append(await lanzar())
+            if not procesos:
+                raise RuntimeError("Todos los trabajadores terminaron antes de procesar los tramos")
+        return await coordinador.esperar()
+    finally:
+        fin.cancel()
+        for proceso in procesos:
+            try:
+                await asyncio.wait_for(proceso.wait(), 5)
+            except asyncio.TimeoutError:
+                proceso.kill()
+                await proceso.wait()
+
+
+def ejecutar_local(archivos, trabajadores=2, **opciones):
+    """
+    Coordinador y `trabajadores` procesos trabajadores en esta máquina
+    (puerto libre en 127.0.0.1); retorna {ruta: {clave: resultado}}.
+
+    :param opciones: Argumentos de Coordinador.
+    """
+    coordinador = Coordinador(archivos, **opciones)
+    return asyncio.run(_ejecutar_local(coordinador, trabajadores))
+
+
+def _mostrar(resultados):
+    for ruta, pruebas in resultados.items():
+        print(os.path.basename(ruta))
+        print("=" * 30)
+        if 'error' in pruebas:
+            print(f"Error: {pruebas['error']}")
+        else:
+            for resultado in pruebas.values():
+                print(f"{resultado['tipo_prueba']}: estadístico = {resultado['estadistico']:.6f}  "
+                      f"p-valor = {resultado['p_valor']:.6f}")
+        print()
+
+
+def main():
+    """Coordinador o trabajador de una evaluación distribuida desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Pruebas incrementales repartidas entre varios trabajadores")
+    modos = parser.add_subparsers(dest='modo', required=True)
+
+    coordinador = modos.add_parser('coordinador', help="Repartir los archivos y combinar los resultados")
+    coordinador.add_argument('archivos', nargs='+', help="Excel, .npy o binarios crudos")
+    coordinador.add_argument('--pruebas', nargs='+', default=list(ACUMULADORES_INCREMENTALES),
+                             choices=list(ACUMULADORES_INCREMENTALES))
+    coordinador.add_argument('--dtype', default='float64', help="Tipo de los valores de un binario crudo")
+    coordinador.add_argument('--host', default='127.0.0.1', help="'0.0.0.0' para aceptar otras máquinas")
+    coordinador.add_argument('--puerto', type=int, default=0)
+    coordinador.add_argument('--tamano-tramo', type=int, default=TAMANO_TRAMO, help="Números por tramo")
+    coordinador.add_argument('--intentos', type=int, default=MAX_INTENTOS, help="Repartos de un tramo antes de fallar")
+    coordinador.add_argument('--tiempo-limite', type=float, default=TIEMPO_LIMITE,
+                             help="Segundos para devolver un tramo")
+    coordinador.add_argument('--trabajadores-locales', type=int, default=0,
+                             help="Lanzar también trabajadores en esta máquina")
+
+    trabajo = modos.add_parser('trabajador', help="Procesar tramos de un coordinador")
+    trabajo.add_argument('--host', default='127.0.0.1')
+    trabajo.add_argument('--puerto', type=int, required=True)
+    args = parser.parse_args()
+
+    if args.modo == 'trabajador':
+        trabajador(args.host, args.puerto)
+        return
+
+    opciones = dict(pruebas=args.pruebas, dtype=args.dtype, tamano_tramo=args.tamano_tramo, host=args.host,
+                    puerto=args.puerto, max_intentos=args.intentos, tiempo_limite=args.tiempo_limite)
+    if args.trabajadores_locales:
+        resultados = ejecutar_local(args.archivos, args.trabajadores_locales, **opciones)
+    else:
+        async def coordinar():
+            instancia = Coordinador(args.archivos, **opciones)
+            puerto = await instancia.iniciar()
+            print(f"Coordinador escuchando en {args.host}:{puerto} "
+                  f"({len(instancia.tareas)} tramos)", flush=True)
+            return await instancia.esperar()
+        resultados = asyncio.run(coordinar())
+    _mostrar(resultados)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# Números por bloque al generar o al alimentar las pruebas
+TAMANO_BLOQUE = 1 << 20
+
+# Dígitos admitidos en el método de cuadrados medios
+DIGITOS_CUADRADOS_MEDIOS = (2, 4, 6, 8)
+
+# Generadores de bits de NumPy cuyo random_raw da palabras de 64 bits
+GENERADORES_NUMPY = ('PCG64', 'PCG64DXSM', 'Philox', 'SFC64')
+
+
+class Fuente(ABC):
+    """
+    Fuente de números pseudoaleatorios que se genera por bloques. Cada
+    subclase produce su salida entera cruda (_generar_enteros) y la lleva a
+    [0, 1) (a_uniforme); la fuente conserva su estado entre bloques, de modo
+    que los bloques concatenados son la misma secuencia que una sola llamada.
+    """
+
+    @abstractmethod
+    def reiniciar(self):
+        """Vuelve al estado inicial (la semilla)."""
+
+    @abstractmethod
+    def _generar_enteros(self, cantidad):
+        """Los siguientes `cantidad` enteros crudos."""
+
+    @abstractmethod
+    def a_uniforme(self, enteros):
+        """Lleva enteros crudos a [0, 1)."""
+
+    def siguiente_bloque(self, cantidad, enteros=False):
+        """Los siguientes `cantidad` números, en [0, 1) o como enteros crudos."""
+        crudos = self._generar_enteros(int(cantidad))
+        return crudos if enteros else self.a_uniforme(crudos)
+
+    def bloques(self, n, tamano_bloque=TAMANO_BLOQUE, enteros=False):
+        """Generador de bloques que en total suman n números."""
+        restantes = int(n)
+        while restantes > 0:
+            cantidad = min(tamano_bloque, restantes)
+            yield self.siguiente_bloque(cantidad, enteros)
+            restantes -= cantidad
+
+    def generar(self, n, tamano_bloque=TAMANO_BLOQUE):
+        """Los siguientes n números en [0, 1) en un solo array (por ejemplo, para la interfaz)."""
+        datos = np.empty(int(n))
+        inicio = 0
+        for bloque in self.bloques(n, tamano_bloque):
+            datos[inicio:inicio + bloque.size] = bloque
+            inicio += bloque.size
+        return datos
+
+
+class FuenteCongruencial(Fuente):
+    """
+    Generador congruencial mixto x_{k+1} = (a x_k + c) mod m con m <= 2^32.
+    Cada bloque se calcula sin recorrerlo elemento a elemento con los
+    coeficientes de salto x_{k+j} = (A_j x_k + C_j) mod m, donde A_j = a^j
+    y C_j = c (a^(j-1) + ... + 1) mod m; los productos caben en uint64.
+    """
+
+    nombre = 'Congruencial mixto'
+
+    def __init__(self, semilla=1, a=1664525, c=1013904223, m=2 ** 32):
+        """
+        :param semilla: Valor inicial x_0.
+        :param a: Multiplicador.
+        :param c: Incremento.
+        :param m: Módulo (entre 2 y 2^32).
+        """
+        self.a, self.c, self.m = int(a), int(c), int(m)
+        if not 2 <= self.m <= 2 ** 32:
+            raise ValueError("El módulo debe estar entre 2 y 2^32.")
+        if not 0 < self.a < self.m or not 0 <= self.c < self.m:
+            raise ValueError("Se necesita 0 < a < m y 0 <= c < m.")
+        self.semilla = int(semilla) % self.m
+        # Coeficientes A_j, C_j del bloque más grande pedido hasta ahora
+        self._saltos = np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.uint64)
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.estado = self.semilla
+
+    def coeficientes_salto(self, cantidad):
+        """A_j y C_j para j = 1..cantidad, duplicando la tabla: A_{k+j} = A_j a^k y C_{k+j} = A_j C_k + C_j"""
+        A, C = self._saltos
+        if A.size < cantidad:
+            m = np.uint64(self.m)
+            A = np.array([self.a], dtype=np.uint64)
+            C = np.array([self.c], dtype=np.uint64)
+            while A.size < cantidad:
+                A, C = (np.concatenate((A, A * A[-1] % m)),
+                        np.concatenate((C, (A * C[-1] + C) % m)))
+            self._saltos = A, C
+        return A[:cantidad], C[:cantidad]
+
+    def _generar_enteros(self, cantidad):
+        A, C = self.coeficientes_salto(cantidad)
+        valores = (A * np.uint64(self.estado) + C) % np.uint64(self.m)
+        if valores.size:
+            self.estado = int(valores[-1])
+        return valores.astype(np.uint32)
+
+    def a_uniforme(self, enteros):
+        return enteros / self.m
+
+
+class FuenteMultiplicativa(FuenteCongruencial):
+    """Generador congruencial multiplicativo x_{k+1} = a x_k mod m (c = 0, semilla distinta de 0)."""
+
+    nombre = 'Congruencial multiplicativo'
+
+    def __init__(self, semilla=1, a=16807, m=2 ** 31 - 1):
+        if int(semilla) % int(m) == 0:
+            raise ValueError("La semilla del generador multiplicativo no puede ser 0 módulo m.")
+        super().__init__(semilla, a, 0, m)
+
+
+class FuenteCuadradosMedios(Fuente):
+    """
+    Método de cuadrados medios de von Neumann con d dígitos: x_{k+1} son
+    los d dígitos centrales de x_k² (rellenado a 2d dígitos). La órbita
+    entra enseguida en un ciclo corto, así que se calcula una vez (parte
+    inicial + ciclo) y cada bloque se obtiene indexándola.
+    """
+
+    nombre = 'Cuadrados medios'
+
+    def __init__(self, semilla=5735, digitos=4):
+        """
+        :param semilla: Valor inicial de d dígitos.
+        :param digitos: Número de dígitos d (2, 4, 6 u 8).
+        """
+        if digitos not in DIGITOS_CUADRADOS_MEDIOS:
+            raise ValueError(f"Los dígitos deben ser uno de {DIGITOS_CUADRADOS_MEDIOS}.")
+        self.digitos = digitos
+        self.modulo = 10 ** digitos
+        self.semilla = int(semilla) % self.modulo
+        self.orbita, self.inicio_ciclo = self._calcular_orbita()
+        self.reiniciar()
+
+    def _calcular_orbita(self):
+        """Valores x_1, x_2, ... hasta la primera repetición y el índice donde empieza el ciclo"""
+        divisor = 10 ** (self.digitos // 2)
+        vistos = {}
+        orbita = []
+        x = self.semilla
+        while True:
+            x = (x * x // divisor) % self.modulo
+            if x in vistos:
+                return np.array(orbita, dtype=np.uint32), vistos[x]
+            vistos[x] = len(orbita)
+            orbita.append(x)
+
+    def reiniciar(self):
+        self.posicion = 0
+
+    def _generar_enteros(self, cantidad):
+        indices = np.arange(self.posicion, self.posicion + cantidad, dtype=np.int64)
+        longitud_ciclo = self.orbita.size - self.inicio_ciclo
+        indices = np.where(indices < self.inicio_ciclo, indices,
+                           self.inicio_ciclo + (indices - self.inicio_ciclo) % longitud_ciclo)
+        self.posicion += cantidad
+        return self.orbita[indices]
+
+    def a_uniforme(self, enteros):
+        return enteros / self.modulo
+
+
+class FuenteNumpy(Fuente):
+    """
+    Generadores de bits de NumPy de 64 bits (GENERADORES_NUMPY) con
+    semilla. La salida entera son palabras de 64 bits (random_raw) y los
+    U(0, 1) usan sus 53 bits altos, igual que np.random.Generator.random.
+    MT19937 no se admite: su random_raw da palabras de 32 bits.
+    """
+
+    def __init__(self, semilla=None, generador='PCG64'):
+        """
+        :param semilla: Semilla (None = entropía del sistema).
+        :param generador: Nombre de GENERADORES_NUMPY.
+        """
+        if generador not in GENERADORES_NUMPY:
+            raise ValueError(f"'{generador}' no es un generador de bits de 64 bits de NumPy "
+                             f"({', '.join(GENERADORES_NUMPY)}).")
+        self.generador = generador
+        self.nombre = f'{generador} (NumPy)'
+        # Con semilla None se fija una al crear la fuente para poder reiniciarla
+        self.semilla = np.random.SeedSequence(semilla).entropy if semilla is None else semilla
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.bits = getattr(np.random, self.generador)(self.semilla)
+
+    def _generar_enteros(self, cantidad):
+        return self.bits.random_raw(cantidad)
+
+    def a_uniforme(self, enteros):
+        return (enteros >> np.uint64(11)) * (1.0 / 2 ** 53)
+
+
+# Fuentes disponibles en la interfaz y sus parámetros por defecto (además de la semilla)
+FUENTES = {
+    "Congruencial mixto (LCG)": (FuenteCongruencial, {'a': 1664525, 'c': 1013904223, 'm': 2 ** 32}),
+    "Congruencial multiplicativo": (FuenteMultiplicativa, {'a': 16807, 'm': 2 ** 31 - 1}),
+    "Cuadrados medios": (FuenteCuadradosMedios, {'digitos': 4}),
+    "PCG64 (NumPy)": (FuenteNumpy, {'generador': 'PCG64'}),
+    "Philox (NumPy)": (FuenteNumpy, {'generador': 'Philox'}),
+}
+
+
+def crear_fuente(nombre, semilla, **parametros):
+    """Crea la fuente registrada en FUENTES con sus parámetros por defecto y los dados."""
+    if nombre not in FUENTES:
+        raise ValueError(f"Fuente desconocida: {nombre}")
+    clase, por_defecto = FUENTES[nombre]
+    return clase(semilla, **{**por_defecto, **parametros})
+
+
+def ejecutar_flujo(fuente, n, pruebas, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Alimenta por bloques (método actualizar) las pruebas con n números de la
+    fuente y retorna sus resultados (método ejecutar). En memoria solo hay un
+    bloque a la vez, así que n puede ser de miles de millones sin archivos
+    intermedios. Las pruebas de bits (usa_enteros) reciben la salida entera
+    cruda y el resto los U(0, 1) del mismo bloque.
+
+    Las pruebas que necesitan todos los datos en el constructor (PruebaChi,
+    PruebaKS, las de rachas) no tienen modo por bloques: en su lugar se pasan
+    sus acumuladores (AcumuladorChi, AcumuladorRachasEncimaDebajo, ...).
+    """
+    for prueba in pruebas:
+        if not (callable(getattr(prueba, 'actualizar', None)) and callable(getattr(prueba, 'ejecutar', None))):
+            raise ValueError(
+                f"{type(prueba).__name__} no se puede alimentar por bloques (le falta actualizar o "
+                f"ejecutar); para chi-cuadrado y rachas use los acumuladores de acumuladores.py.")
+    for crudos in fuente.bloques(n, tamano_bloque, enteros=True):
+        uniformes = None
+        for prueba in pruebas:
+            if getattr(prueba, 'usa_enteros', False):
+                prueba.actualizar(crudos)
+            else:
+                if uniformes is None:
+                    uniformes = fuente.a_uniforme(crudos)
+                prueba.actualizar(uniformes)
+    return [prueba.ejecutar() for prueba in pruebas]
+
+
+def main():
+    """Función para probar el módulo independientemente"""
+    from prueba_huecos import PruebaHuecos
+    from pruebas_bits import PruebaMonobit, PruebaRachasBits
+
+    n = 10_000_000
+    for nombre in FUENTES:
+        fuente = crear_fuente(nombre, 12345)
+        resultados = ejecutar_flujo(fuente, n, [
+            PruebaHuecos(), PruebaMonobit(), PruebaRachasBits(posicion=0)])
+        print(f"\n{nombre}")
+        print("=" * 30)
+        for resultado in resultados:
+            print(f"{resultado['tipo_prueba']}: p-valor = {resultado['p_valor']:.6f}  "
+                  f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+
+if __name__ == "__main__":
+    main()
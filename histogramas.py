@@ -0,0 +1,61 @@
+import math
+from functools import reduce
+
+import numpy as np
+
+from distribuciones import transformar_uniforme
+
+# Máximo de intervalos finos para el conteo común; si el MCM de los k pedidos
+# lo supera, cada k se cuenta por separado
+MAX_INTERVALOS_FINOS = 1 << 22
+
+# Tamaño de bloque para acotar la memoria de los índices temporales
+TAMANO_BLOQUE = 1 << 20
+
+
+def resolucion_comun(lista_intervalos):
+    """Mínimo común múltiplo de los números de intervalos pedidos."""
+    return reduce(math.lcm, (int(k) for k in lista_intervalos), 1)
+
+
+def conteos_finos(datos, K, distribucion=None):
+    """
+    Frecuencias de los datos en K intervalos iguales de [0, 1) usando
+    floor(x*K) + bincount. Los valores fuera de [0, 1) se descartan.
+    Con una distribución se cuenta u = F(x) bloque a bloque, lo que equivale
+    a K intervalos equiprobables en la escala de los datos.
+    """
+    datos = np.asarray(datos, dtype=float)
+    conteos = np.zeros(K, dtype=np.int64)
+    for inicio in range(0, datos.size, TAMANO_BLOQUE):
+        bloque = transformar_uniforme(datos[inicio:inicio + TAMANO_BLOQUE], distribucion)
+        bloque = bloque[(bloque >= 0) & (bloque < 1.0)]
+        # El mínimo evita que el redondeo de x*K mande un valor < 1 al índice K
+        indices = np.minimum((bloque * K).astype(np.int64), K - 1)
+        conteos += np.bincount(indices, minlength=K)
+    return conteos
+
+
+def agrupar_conteos(conteos, k):
+    """Sumar intervalos finos adyacentes para obtener k intervalos."""
+    return conteos.reshape(k, -1).sum(axis=1)
+
+
+def conteos_multiresolucion(datos, lista_intervalos, distribucion=None):
+    """
+    Frecuencias observadas en [0, 1) para varios números de intervalos.
+    Se hace una sola pasada sobre los datos con K = MCM(k) intervalos finos y
+    cada k se obtiene sumando intervalos adyacentes (costo O(n) + O(K)).
+    Retorna un diccionario {k: frecuencias}.
+    """
+    lista = sorted({int(k) for k in lista_intervalos})
+    if not lista or lista[0] < 1:
+        raise ValueError("El número de intervalos debe ser un entero positivo.")
+
+    K = resolucion_comun(lista)
+    if K <= MAX_INTERVALOS_FINOS:
+        finos = conteos_finos(datos, K, distribucion)
+        return {k: agrupar_conteos(finos, k) for k in lista}
+
+    # MCM demasiado grande: una pasada por cada k
+    return {k: conteos_finos(datos, k, distribucion) for k in lista}
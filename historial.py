@@ -0,0 +1,295 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import tkinter as tk
+from datetime import datetime
+from functools import lru_cache
+from tkinter import ttk
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from memoria import huella_datos
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Base SQLite donde se acumulan los resultados de todas las ejecuciones
+RUTA_HISTORIAL = os.path.join(DIRECTORIO, 'historial.sqlite')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    id INTEGER PRIMARY KEY,
+    huella TEXT NOT NULL,
+    prueba TEXT NOT NULL,
+    parametros TEXT NOT NULL,
+    alpha REAL NOT NULL,
+    version TEXT NOT NULL,
+    generador TEXT NOT NULL,
+    semilla INTEGER,
+    n INTEGER NOT NULL,
+    fecha TEXT NOT NULL,
+    estadistico REAL,
+    p_valor REAL,
+    rechaza_h0 INTEGER,
+    error TEXT,
+    UNIQUE (huella, prueba, parametros, alpha, version)
+);
+CREATE INDEX IF NOT EXISTS idx_resultados_generador_fecha ON resultados (generador, fecha);
+CREATE INDEX IF NOT EXISTS idx_resultados_fecha ON resultados (fecha);
+"""
+
+COLUMNAS = ('huella', 'prueba', 'parametros', 'alpha', 'version', 'generador',
+            'semilla', 'n', 'fecha', 'estadistico', 'p_valor', 'rechaza_h0', 'error')
+
+
+def huella_generada(fuente, parametros_fuente, semilla, n):
+    """Huella de una secuencia de una fuente incorporada (queda determinada sin generarla)"""
+    descripcion = json.dumps({'fuente': fuente, 'parametros_fuente': parametros_fuente,
+                              'semilla': semilla, 'n': int(n)}, sort_keys=True, default=str)
+    return hashlib.sha256(descripcion.encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def version_codigo():
+    """
+    Hash corto de los módulos .py del proyecto: un resultado guardado con
+    otra versión del código no se confunde con uno recalculado.
+    """
+    suma = hashlib.sha256()
+    for ruta in sorted(glob.glob(os.path.join(DIRECTORIO, '*.py'))):
+        with open(ruta, 'rb') as archivo:
+            suma.update(os.path.basename(ruta).encode())
+            suma.update(archivo.read())
+    return suma.hexdigest()[:12]
+
+
+def resumen_resultado(resultado):
+    """Estadístico, p-valor, decisión y error de un resultado con el formato de la interfaz"""
+    if 'error' in resultado:
+        return {'estadistico': None, 'p_valor': None, 'rechaza_h0': None, 'error': str(resultado['error'])}
+    estadistico = resultado.get('estadistico', resultado.get('estadistico_z'))
+    return {'estadistico': None if estadistico is None else float(estadistico),
+            'p_valor': float(resultado['p_valor']),
+            'rechaza_h0': bool(resultado['rechaza_h0']), 'error': None}
+
+
+def _ahora():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class HistorialResultados:
+    """
+    Resultados de las pruebas guardados en SQLite, uno por (huella de los
+    datos, prueba, parámetros, alpha, versión del código). Volver a guardar
+    la misma combinación no duplica filas, así que el historial de un
+    generador muestra cada conjunto de datos una vez, en la fecha en que se
+    evaluó por primera vez.
+    """
+
+    def __init__(self, ruta=RUTA_HISTORIAL):
+        self.ruta = ruta
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.execute('PRAGMA journal_mode=WAL')
+        self.conexion.executescript(ESQUEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def guardar(self, registros):
+        """
+        Inserta una lista de diccionarios con las COLUMNAS (fecha y versión
+        por defecto: ahora y la actual) en una sola transacción. Retorna
+        cuántos eran nuevos.
+        """
+        fecha, version = _ahora(), version_codigo()
+        filas = []
+        for registro in registros:
+            registro = {'fecha': fecha, 'version': version, 'semilla': None, **registro}
+            if not isinstance(registro['parametros'], str):
+                registro['parametros'] = json.dumps(registro['parametros'], sort_keys=True, default=str)
+            if registro['rechaza_h0'] is not None:
+                registro['rechaza_h0'] = int(registro['rechaza_h0'])
+            filas.append(tuple(registro.get(columna) for columna in COLUMNAS))
+
+        with self.conexion:
+            antes = self.conexion.total_changes
+            self.conexion.executemany(
+                f"INSERT OR IGNORE INTO resultados ({', '.join(COLUMNAS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNAS))})", filas)
+            return self.conexion.total_changes - antes
+
+    def guardar_resultados(self, datos, resultados, generador, alpha, parametros=None, semilla=None):
+        """
+        Guarda los resultados de una ejecución sobre un conjunto de datos.
+
+        :param resultados: {clave de prueba: resultado} como en la interfaz.
+        :param parametros: {clave de prueba: parámetros} (las ausentes, sin parámetros).
+        """
+        parametros = parametros or {}
+        huella = huella_datos(datos)
+        return self.guardar([
+            {'huella': huella, 'prueba': clave, 'parametros': parametros.get(clave, {}),
+             'alpha': alpha, 'generador': generador, 'semilla': semilla, 'n': len(datos),
+             **resumen_resultado(resultado)}
+            for clave, resultado in resultados.items()])
+
+    def guardar_bateria(self, detalle, alpha, parametros_fuentes):
+        """
+        Guarda el detalle de Bateria.ejecutar (una fila por fuente, semilla,
+        n y prueba). La huella de cada secuencia sale de su descripción, sin
+        volver a generarla.
+        """
+        return self.guardar([
+            {'huella': huella_generada(fila.fuente, parametros_fuentes[fila.fuente], int(fila.semilla), fila.n),
+             'prueba': fila.prueba, 'parametros': fila.parametros, 'alpha': alpha,
+             'generador': fila.fuente, 'semilla': int(fila.semilla), 'n': int(fila.n),
+             'estadistico': None if pd.isna(fila.estadistico) else float(fila.estadistico),
+             'p_valor': None if pd.isna(fila.p_valor) else float(fila.p_valor),
+             'rechaza_h0': None if pd.isna(fila.rechaza_h0) else bool(fila.rechaza_h0),
+             'error': None if pd.isna(fila.error) else str(fila.error)}
+            for fila in detalle.itertuples(index=False)])
+
+    def consultar(self, generador=None, prueba=None, desde=None, hasta=None):
+        """DataFrame con los resultados que cumplen los filtros, ordenados por fecha"""
+        if hasta is not None and len(hasta) == 10:
+            # Una fecha sin hora incluye todo ese día
+            hasta += 'T23:59:59'
+        condiciones, valores = [], []
+        for columna, operador, valor in (('generador', '=', generador), ('prueba', '=', prueba),
+                                         ('fecha', '>=', desde), ('fecha', '<=', hasta)):
+            if valor is not None:
+                condiciones.append(f'{columna} {operador} ?')
+                valores.append(valor)
+        consulta = f"SELECT {', '.join(COLUMNAS)} FROM resultados"
+        if condiciones:
+            consulta += ' WHERE ' + ' AND '.join(condiciones)
+        tabla = pd.read_sql_query(consulta + ' ORDER BY fecha, id', self.conexion, params=valores)
+        tabla['fecha'] = pd.to_datetime(tabla['fecha'])
+        return tabla
+
+    def generadores(self):
+        """Generadores (fuentes o archivos) con resultados guardados"""
+        return [fila[0] for fila in self.conexion.execute(
+            'SELECT DISTINCT generador FROM resultados ORDER BY generador')]
+
+
+def crear_grafico_historial(tabla, fig=None):
+    """
+    Estadístico y p-valor de cada prueba contra la fecha, con el alpha como
+    referencia; las líneas verticales marcan cambios de versión del código.
+    """
+    if fig is None:
+        fig = plt.figure(figsize=(9, 6))
+    ax_estadistico, ax_p = fig.subplots(2, 1, sharex=True)
+    validos = tabla.dropna(subset=['p_valor'])
+    for prueba, grupo in validos.groupby('prueba', sort=False):
+        ax_estadistico.plot(grupo['fecha'], grupo['estadistico'], marker='o', markersize=3, label=prueba)
+        ax_p.plot(grupo['fecha'], grupo['p_valor'], marker='o', markersize=3, linestyle='none', label=prueba)
+
+    for alpha in validos['alpha'].unique():
+        ax_p.axhline(alpha, color='red', linestyle='--', alpha=0.5)
+    cambios = tabla['version'] != tabla['version'].shift()
+    for fecha in tabla.loc[cambios, 'fecha'].iloc[1:]:
+        for ax in (ax_estadistico, ax_p):
+            ax.axvline(fecha, color='gray', linestyle=':')
+
+    ax_estadistico.set_ylabel('Estadístico')
+    ax_estadistico.set_title('Historial de resultados')
+    ax_estadistico.grid(True, alpha=0.3)
+    ax_p.set_ylabel('p-valor')
+    ax_p.set_ylim(0, 1)
+    ax_p.set_xlabel('Fecha')
+    ax_p.grid(True, alpha=0.3)
+    if not validos.empty:
+        ax_estadistico.legend(fontsize=8)
+    fig.autofmt_xdate()
+    return fig
+
+
+def mostrar_historial(parent=None, ruta=RUTA_HISTORIAL):
+    """Ventana con el historial de un generador (y opcionalmente una prueba)"""
+    ventana = tk.Toplevel(parent) if parent else tk.Tk()
+    ventana.title("Historial de Resultados")
+    ventana.geometry("900x700")
+
+    with HistorialResultados(ruta) as historial:
+        generadores = historial.generadores()
+
+    main_frame = ttk.Frame(ventana, padding="10")
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    frame_filtros = ttk.Frame(main_frame)
+    frame_filtros.pack(fill=tk.X)
+    ttk.Label(frame_filtros, text="Generador:").pack(side=tk.LEFT)
+    var_generador = tk.StringVar(value=generadores[0] if generadores else "")
+    combo_generador = ttk.Combobox(frame_filtros, textvariable=var_generador, values=generadores,
+                                   state="readonly", width=30)
+    combo_generador.pack(side=tk.LEFT, padx=5)
+    ttk.Label(frame_filtros, text="Prueba:").pack(side=tk.LEFT)
+    var_prueba = tk.StringVar(value="Todas")
+    combo_prueba = ttk.Combobox(frame_filtros, textvariable=var_prueba, state="readonly", width=35)
+    combo_prueba.pack(side=tk.LEFT, padx=5)
+
+    lbl_resumen = ttk.Label(main_frame, text="")
+    lbl_resumen.pack(anchor=tk.W, pady=5)
+
+    fig = plt.figure(figsize=(9, 6))
+    canvas = FigureCanvasTkAgg(fig, main_frame)
+    canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+    def actualizar(*_):
+        if not var_generador.get():
+            lbl_resumen.config(text="No hay resultados guardados todavía.")
+            return
+        with HistorialResultados(ruta) as historial:
+            tabla = historial.consultar(var_generador.get())
+        combo_prueba['values'] = ["Todas"] + sorted(tabla['prueba'].unique())
+        if var_prueba.get() != "Todas":
+            tabla = tabla[tabla['prueba'] == var_prueba.get()]
+        rechazos = tabla['rechaza_h0'].dropna()
+        lbl_resumen.config(text=f"{len(tabla)} resultados, {tabla['huella'].nunique()} conjuntos de datos, "
+                                f"{rechazos.mean():.1%} de rechazos" if len(rechazos) else
+                                f"{len(tabla)} resultados")
+        fig.clear()
+        crear_grafico_historial(tabla, fig)
+        fig.tight_layout()
+        canvas.draw()
+
+    combo_generador.bind("<<ComboboxSelected>>", actualizar)
+    combo_prueba.bind("<<ComboboxSelected>>", actualizar)
+    actualizar()
+
+
+def main():
+    """Consultar el historial desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Historial de resultados de las pruebas")
+    parser.add_argument('--generador', help="Fuente o archivo")
+    parser.add_argument('--prueba')
+    parser.add_argument('--desde', help="Fecha ISO, por ejemplo 2024-01-31")
+    parser.add_argument('--hasta', help="Fecha ISO")
+    parser.add_argument('--base', default=RUTA_HISTORIAL, help="Archivo SQLite del historial")
+    parser.add_argument('--grafico', help="Archivo donde guardar el gráfico del historial")
+    args = parser.parse_args()
+
+    with HistorialResultados(args.base) as historial:
+        tabla = historial.consultar(args.generador, args.prueba, args.desde, args.hasta)
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(tabla.drop(columns=['huella']).to_string(index=False, float_format='{:.4f}'.format))
+    if args.grafico:
+        fig = crear_grafico_historial(tabla)
+        fig.tight_layout()
+        fig.savefig(args.grafico)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import hashlib
+import os
+import time
+
+import numpy as np
+
+from acumuladores import (AcumuladorChi, AcumuladorLongitudRachasAscDesc,
+                          AcumuladorLongitudRachasEncimaDebajo,
+                          AcumuladorRachasAscDesc,
+                          AcumuladorRachasEncimaDebajo)
+from checkpoint import (cargar_checkpoint, estados_con_prefijo,
+                        guardar_checkpoint)
+from lectura import TAMANO_BLOQUE, abrir_datos, leer_bloques
+
+# Directorio donde se guarda el estado de cada conjunto de datos
+DIRECTORIO_ESTADO = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'incremental')
+
+# Pruebas con estado acumulable: clave -> (nombre, clase del acumulador)
+ACUMULADORES_INCREMENTALES = {
+    'chi_cuadrado': ("Chi-cuadrado", AcumuladorChi),
+    'rachas_encima_debajo': ("Rachas Enc/Deb", AcumuladorRachasEncimaDebajo),
+    'rachas_ascendentes_descendentes': ("Rachas Asc/Desc", AcumuladorRachasAscDesc),
+    'longitud_rachas_enc': ("L. Enc/Deb", AcumuladorLongitudRachasEncimaDebajo),
+    'longitud_rachas_ascendentes_descendentes': ("L. Asc/Desc", AcumuladorLongitudRachasAscDesc),
+}
+
+# Valores del inicio y del final ya procesado que se guardan para comprobar
+# que el archivo solo creció (si cambian, se recalcula todo)
+VALORES_HUELLA = 1024
+
+# Segundos entre guardados del estado durante una pasada larga
+INTERVALO_CHECKPOINT = 30.0
+
+
+def guardar_estado(ruta, n, acumuladores, datos):
+    """Guarda n, la huella y el estado de cada acumulador (escritura atómica)"""
+    contenido = {
+        'n': np.int64(n),
+        'pruebas': np.array(list(acumuladores)),
+        'cabeza': np.asarray(datos[:min(n, VALORES_HUELLA)], dtype=float),
+        'cola': np.asarray(datos[max(0, n - VALORES_HUELLA):n], dtype=float),
+    }
+    for clave, acumulador in acumuladores.items():
+        for campo, valor in acumulador.estado().items():
+            contenido[f'{clave}.{campo}'] = valor
+    guardar_checkpoint(ruta, contenido)
+
+
+class EvaluacionIncremental:
+    """
+    Pruebas sobre un archivo que crece (Excel, .npy o binario crudo). El
+    estado de los acumuladores (frecuencias por intervalo, contadores de
+    rachas con el signo o valor del borde, conteos de longitudes con la
+    racha abierta) se guarda por archivo; en la siguiente evaluación solo se
+    procesa lo agregado al final y el resultado es el mismo que recalcular
+    todo. Si el inicio o el final ya procesado cambió, se empieza de cero.
+    Durante una pasada larga el estado también se guarda cada
+    intervalo_checkpoint segundos, así que una evaluación cortada sigue
+    desde el último checkpoint la próxima vez.
+    """
+
+    def __init__(self, ruta, pruebas=tuple(ACUMULADORES_INCREMENTALES), dtype=np.float64,
+                 directorio_estado=DIRECTORIO_ESTADO, tamano_bloque=TAMANO_BLOQUE,
+                 intervalo_checkpoint=INTERVALO_CHECKPOINT):
+        """
+        :param ruta: Archivo de datos.
+        :param pruebas: Claves de ACUMULADORES_INCREMENTALES.
+        :param dtype: Tipo de los valores de un binario crudo.
+        :param directorio_estado: Dónde guardar el estado.
+        :param tamano_bloque: Números por bloque al procesar.
+        :param intervalo_checkpoint: Segundos entre guardados del estado durante la pasada.
+        """
+        for clave in pruebas:
+            if clave not in ACUMULADORES_INCREMENTALES:
+                raise ValueError(f"Prueba sin modo incremental: {clave}")
+        self.ruta = os.path.abspath(ruta)
+        self.pruebas = list(pruebas)
+        self.dtype = np.dtype(dtype)
+        self.tamano_bloque = tamano_bloque
+        self.intervalo_checkpoint = intervalo_checkpoint
+        nombre = hashlib.sha256(f'{self.ruta}|{self.dtype.str}'.encode()).hexdigest()[:32]
+        self.ruta_estado = os.path.join(directorio_estado, nombre + '.npz')
+        self.procesados = 0
+        self.reiniciada = False
+
+    def _nuevos_acumuladores(self):
+        return {clave: ACUMULADORES_INCREMENTALES[clave][1]() for clave in self.pruebas}
+
+    def _cargar_estado(self, datos):
+        """(n, acumuladores) del estado guardado si sigue valiendo para estos datos, o None"""
+        estado = cargar_checkpoint(self.ruta_estado)
+        if estado is None:
+            return None
+        n = int(estado['n'])
+        if list(estado['pruebas']) != self.pruebas or n > len(datos):
+            return None
+        cabeza = np.asarray(datos[:min(n, VALORES_HUELLA)], dtype=float)
+        cola = np.asarray(datos[max(0, n - VALORES_HUELLA):n], dtype=float)
+        if not (np.array_equal(cabeza, estado['cabeza']) and np.array_equal(cola, estado['cola'])):
+            return None
+        acumuladores = self._nuevos_acumuladores()
+        for clave, acumulador in acumuladores.items():
+            acumulador.restaurar(estados_con_prefijo(estado, clave))
+        return n, acumuladores
+
+    def reiniciar(self):
+        """Borra el estado guardado (la próxima evaluación procesa todo)"""
+        if os.path.exists(self.ruta_estado):
+            os.remove(self.ruta_estado)
+
+    def ejecutar(self):
+        """Procesa lo nuevo del archivo, guarda el estado y retorna {clave: resultado}"""
+        datos = abrir_datos(self.ruta, self.dtype)
+        cargado = self._cargar_estado(datos)
+        self.reiniciada = cargado is None
+        desde, acumuladores = (0, self._nuevos_acumuladores()) if cargado is None else cargado
+
+        n = desde
+        ultimo_checkpoint = time.monotonic()
+        for bloque in leer_bloques(datos, desde, self.tamano_bloque):
+            for acumulador in acumuladores.values():
+                acumulador.actualizar(bloque)
+            n += bloque.size
+            if time.monotonic() - ultimo_checkpoint >= self.intervalo_checkpoint:
+                guardar_estado(self.ruta_estado, n, acumuladores, datos)
+                ultimo_checkpoint = time.monotonic()
+        self.procesados = len(datos) - desde
+        guardar_estado(self.ruta_estado, len(datos), acumuladores, datos)
+
+        return {clave: acumulador.ejecutar() for clave, acumulador in acumuladores.items()}
+
+
+def main():
+    """Evaluación incremental de un archivo desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Pruebas que solo procesan los datos agregados al archivo")
+    parser.add_argument('archivo', help="Excel, .npy o binario crudo")
+    parser.add_argument('--dtype', default='float64', help="Tipo de los valores de un binario crudo")
+    parser.add_argument('--reiniciar', action='store_true', help="Descartar el estado guardado")
+    args = parser.parse_args()
+
+    evaluacion = EvaluacionIncremental(args.archivo, dtype=args.dtype)
+    if args.reiniciar:
+        evaluacion.reiniciar()
+    resultados = evaluacion.ejecutar()
+
+    origen = "desde cero" if evaluacion.reiniciada else "solo lo agregado"
+    print(f"{os.path.basename(args.archivo)}: {evaluacion.procesados:,} números procesados ({origen})")
+    print("=" * 30)
+    for resultado in resultados.values():
+        print(f"{resultado['tipo_prueba']}: estadístico = {resultado['estadistico']:.6f}  "
+              f"p-valor = {resultado['p_valor']:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+import os
+import shutil
+import socket
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from histogramas import conteos_multiresolucion
+from utilidades_rachas import (longitudes_rachas, secuencia_diferencias,
+                               secuencia_direcciones, secuencia_umbral)
+
+# Directorio donde se comparten los intermedios entre procesos
+DIRECTORIO_INTERMEDIOS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'intermedios')
+
+# Segundos que se espera a otro proceso que está calculando el mismo intermedio
+ESPERA_MAXIMA = 300.0
+PAUSA_ESPERA = 0.01
+
+
+def _marca():
+    """Pid, instante y máquina de este proceso, para los bloqueos y las referencias"""
+    return f'{os.getpid()} {time.time()} {socket.gethostname()}'
+
+
+def _tomar_bloqueo(ruta):
+    """
+    Crea el archivo de bloqueo con la marca de este proceso y la retorna
+    (FileExistsError si otro ya lo tiene).
+    """
+    marca = _marca()
+    descriptor = os.open(ruta, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    try:
+        os.write(descriptor, marca.encode())
+    finally:
+        os.close(descriptor)
+    return marca
+
+
+def _soltar_bloqueo(ruta, marca):
+    """Borra el bloqueo solo si sigue siendo el de este proceso (otro pudo romperlo y tomarlo)"""
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            if archivo.read() != marca:
+                return
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+
+def _marca_abandonada(ruta):
+    """
+    True si el proceso que dejó la marca (un bloqueo o una referencia) ya no
+    existe: en esta máquina se pregunta por su pid (solo POSIX); si no se
+    puede saber, cuenta su antigüedad.
+    """
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            pid, instante, maquina = archivo.read().split()
+        pid, instante = int(pid), float(instante)
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        # Recién creado y todavía sin marca, o ilegible: se juzga por la fecha del archivo
+        try:
+            return time.time() - os.path.getmtime(ruta) > ESPERA_MAXIMA
+        except OSError:
+            return False
+    if os.name == 'posix' and maquina == socket.gethostname():
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+    return time.time() - instante > ESPERA_MAXIMA
+
+
+def limpiar_abandonados(directorio=DIRECTORIO_INTERMEDIOS):
+    """
+    Borra los intermedios cuyas referencias son todas de procesos que ya no
+    existen (una batería cortada de golpe no llega a soltarlas) y los que
+    quedaron sin referencias hace más de ESPERA_MAXIMA. Retorna cuántos borró.
+    """
+    try:
+        claves = os.listdir(directorio)
+    except FileNotFoundError:
+        return 0
+    borrados = 0
+    for clave in claves:
+        ruta = os.path.join(directorio, clave)
+        directorio_refs = os.path.join(ruta, 'refs')
+        try:
+            referencias = os.listdir(directorio_refs)
+        except FileNotFoundError:
+            referencias = []
+        except NotADirectoryError:
+            continue
+        if referencias:
+            abandonado = all(_marca_abandonada(os.path.join(directorio_refs, referencia))
+                             for referencia in referencias)
+        else:
+            # Recién creado por otra batería que todavía no reservó, o huérfano
+            try:
+                abandonado = time.time() - os.path.getmtime(ruta) > ESPERA_MAXIMA
+            except OSError:
+                abandonado = False
+        if abandonado:
+            shutil.rmtree(ruta, ignore_errors=True)
+            borrados += 1
+    return borrados
+
+
+def _abrir(ruta):
+    """Un .npy como memmap de solo lectura (los vacíos no se pueden mapear y se leen)"""
+    try:
+        return np.load(ruta, mmap_mode='r')
+    except ValueError:
+        return np.load(ruta)
+
+
+class AlmacenIntermedios:
+    """
+    Arrays intermedios de un conjunto de datos (la secuencia, signos,
+    longitudes de racha, histogramas) guardados como .npy en un directorio
+    compartido. El primer proceso que necesita uno lo calcula y lo escribe
+    (temporal + renombrado) mientras los demás esperan; después todos lo
+    abren como memmap de solo lectura, sin copiarlo.
+
+    La vida del directorio se lleva con referencias: cada usuario tiene un
+    archivo en refs/ (se reservan de antemano, por ejemplo una por trabajo)
+    y lo borra al soltarla; quien suelta la última borra los intermedios.
+    Cada referencia lleva la marca del proceso que la reservó, así que las
+    de un proceso muerto se reconocen (limpiar_abandonados).
+    """
+
+    def __init__(self, clave, directorio=DIRECTORIO_INTERMEDIOS):
+        self.directorio = os.path.join(directorio, clave)
+        self.directorio_refs = os.path.join(self.directorio, 'refs')
+        self.referencia = None
+
+    def reservar(self, cantidad=1):
+        """Crea `cantidad` referencias y retorna sus nombres"""
+        os.makedirs(self.directorio_refs, exist_ok=True)
+        referencias = []
+        for _ in range(cantidad):
+            referencia = uuid.uuid4().hex
+            with open(os.path.join(self.directorio_refs, referencia), 'x', encoding='utf-8') as archivo:
+                archivo.write(_marca())
+            referencias.append(referencia)
+        return referencias
+
+    def referencias(self):
+        """Cantidad de referencias vivas"""
+        try:
+            return len(os.listdir(self.directorio_refs))
+        except FileNotFoundError:
+            return 0
+
+    def soltar(self, referencia):
+        """Suelta una referencia (soltarla dos veces no hace nada); sin referencias se borra todo"""
+        try:
+            os.remove(os.path.join(self.directorio_refs, referencia))
+        except FileNotFoundError:
+            pass
+        if self.referencias() == 0:
+            self.eliminar()
+
+    def eliminar(self):
+        # En Windows un memmap abierto impide borrar su archivo: queda para la próxima limpieza
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def __enter__(self):
+        self.referencia = self.reservar()[0]
+        return self
+
+    def __exit__(self, *_):
+        self.soltar(self.referencia)
+
+    def _escribir(self, ruta, valor):
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.npy')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                np.save(archivo, valor)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    def obtener(self, nombre, calcular):
+        """
+        El intermedio `nombre` como memmap de solo lectura; si todavía no
+        existe lo calcula este proceso con calcular() (o espera a que termine
+        otro que ya lo está calculando). El bloqueo de un proceso que murió
+        a mitad del cálculo se rompe y el intermedio se calcula aquí.
+        """
+        ruta = os.path.join(self.directorio, nombre + '.npy')
+        bloqueo = ruta + '.calculando'
+        inicio = time.monotonic()
+        while not os.path.exists(ruta):
+            try:
+                os.makedirs(self.directorio, exist_ok=True)
+                marca = _tomar_bloqueo(bloqueo)
+            except FileExistsError:
+                if _marca_abandonada(bloqueo):
+                    try:
+                        os.remove(bloqueo)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                if time.monotonic() - inicio > ESPERA_MAXIMA:
+                    # Quien lo calculaba no terminó: se calcula aquí sin compartirlo
+                    return np.asarray(calcular())
+                time.sleep(PAUSA_ESPERA)
+                continue
+            try:
+                if not os.path.exists(ruta):
+                    self._escribir(ruta, np.asarray(calcular()))
+            finally:
+                _soltar_bloqueo(bloqueo, marca)
+        return _abrir(ruta)
+
+
+def direcciones(almacen, datos):
+    """Dirección de cada diferencia (los empates mantienen la anterior)"""
+    return almacen.obtener('direcciones', lambda: secuencia_direcciones(datos))
+
+
+def longitudes_direcciones(almacen, datos):
+    """Longitudes de racha de las direcciones"""
+    return almacen.obtener('longitudes_direcciones', lambda: longitudes_rachas(direcciones(almacen, datos)))
+
+
+def signos_diferencias(almacen, datos):
+    """Signos de las diferencias sin los empates"""
+    return almacen.obtener('signos_diferencias', lambda: secuencia_diferencias(datos))
+
+
+def signos_umbral(almacen, datos, incluir_igual=True):
+    """Signos respecto a 0.5 (>= o, con incluir_igual=False, >)"""
+    nombre = 'signos_umbral' if incluir_igual else 'signos_umbral_estricto'
+    return almacen.obtener(nombre, lambda: secuencia_umbral(datos, 0.5, incluir_igual))
+
+
+def longitudes_umbral(almacen, datos, incluir_igual=True):
+    """Longitudes de racha de los signos respecto a 0.5"""
+    nombre = 'longitudes_umbral' if incluir_igual else 'longitudes_umbral_estricto'
+    return almacen.obtener(nombre, lambda: longitudes_rachas(signos_umbral(almacen, datos, incluir_igual)))
+
+
+def histograma(almacen, datos, num_intervalos):
+    """Frecuencias en num_intervalos intervalos iguales de [0, 1)"""
+    return almacen.obtener(f'histograma_{num_intervalos}',
+                           lambda: conteos_multiresolucion(datos, [num_intervalos], None)[num_intervalos])
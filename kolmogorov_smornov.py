@@ -6,12 +6,82 @@ from tkinter import ttk
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from distribuciones import (intervalos_equiprobables, nombre_distribucion,
+                            transformar_uniforme)
+from histogramas import conteos_multiresolucion
+from memoria import memoria_desactivada, memorizar
+
+# Puntos máximos de la función de distribución empírica en los gráficos
+MAX_PUNTOS_GRAFICO = 2000
+
+class VistaOrdenada:
+    """
+    Valores u = F(x) ordenados de un conjunto de datos. Ordenar es el paso
+    O(n log n) de K-S exacta, Anderson-Darling y Cramér-von Mises; se hace una
+    sola vez por conjunto de datos y distribución y las pruebas lo comparten.
+    Las tres contrastan los mismos uniformes(), así que prueban la misma H0.
+    """
+    def __init__(self, datos, distribucion=None):
+        self.distribucion = distribucion
+        self.ordenados = np.sort(transformar_uniforme(datos, distribucion))
+        self.n = self.ordenados.size
+
+    def normalizados(self):
+        """Datos llevados a [0, 1] con mínimo y máximo (sigue ordenado, sin volver a ordenar)"""
+        minimo, maximo = self.ordenados[0], self.ordenados[-1]
+        return (self.ordenados - minimo) / (maximo - minimo)
+
+    def uniformes(self):
+        """u ordenados para contrastar contra U(0, 1): normalizados si no hay distribución"""
+        return self.normalizados() if self.distribucion is None else self.ordenados
+
+    def uniformes_abiertos(self):
+        """
+        uniformes() dentro de (0, 1), para los logaritmos de Anderson-Darling.
+        Sin distribución el mínimo y el máximo normalizados valen 0 y 1 por
+        construcción: pasan a sus valores esperados 1/(n+1) y n/(n+1) (sin
+        cruzar a sus vecinos). Con distribución un u en el borde del soporte
+        queda apenas dentro.
+        """
+        u = self.uniformes()
+        if self.distribucion is None and self.n > 1:
+            u = u.copy()
+            u[0] = min(1 / (self.n + 1), u[1])
+            u[-1] = max(self.n / (self.n + 1), u[-2])
+        return np.clip(u, 1e-300, 1 - np.finfo(float).epsneg)
+
+    def descripcion(self):
+        """Cómo se llevan los datos a U(0, 1), para la interfaz y el reporte"""
+        if self.distribucion is None:
+            return "Datos normalizados a [0, 1] con el mínimo y el máximo"
+        return f"u = F(x) con F de {nombre_distribucion(self.distribucion)}"
+
+    def estadistico_ks(self):
+        """D = max(i/n - u_i, u_i - (i-1)/n) sobre los u ordenados"""
+        u = self.uniformes()
+        i = np.arange(1, self.n + 1)
+        return max(np.max(i / self.n - u), np.max(u - (i - 1) / self.n))
+
+    def puntos_grafico(self, max_puntos=MAX_PUNTOS_GRAFICO):
+        """Pares (u_i, i/n) de la función empírica, submuestreados para graficar"""
+        indices = np.unique(np.linspace(0, self.n - 1, min(self.n, max_puntos)).astype(np.int64))
+        return self.uniformes()[indices], (indices + 1) / self.n
+
 class PruebaKS:
-    def __init__(self, datos, num_intervalos=10, alpha=0.05):
+    def __init__(self, datos, num_intervalos=10, alpha=0.05, distribucion=None, frecuencias_observadas=None, vista=None):
         self.datos = np.array(datos)
         self.num_intervalos = num_intervalos
         self.alpha = alpha
         self.n = len(datos)
+        # Distribución bajo H0: None = U(0,1), distribución congelada de SciPy o CDF vectorizada
+        self.distribucion = distribucion
+        # Frecuencias ya contadas (por ejemplo, en un barrido de intervalos)
+        self.frecuencias_observadas = frecuencias_observadas
+        # Vista ordenada compartida con Anderson-Darling y Cramér-von Mises
+        self.vista = vista
+        # P-valor y D exacto, no dependen del número de intervalos
+        self._p_valor = None
+        self._d_exacto = None
         
         # Tabla de valores críticos para Kolmogorov-Smirnov
         self.tabla_ks = {
@@ -26,15 +96,20 @@ class PruebaKS:
     def calcular_frecuencias_acumuladas(self):
         """Calcular frecuencias acumuladas observadas y teóricas en [0, 1)"""
 
-        # Asegurarse de que los datos estén en el rango [0, 1)
-        datos_normalizados = self.datos[(self.datos >= 0) & (self.datos < 1.0)]
-
-        # Crear límites uniformes en [0, 1)
-        step = 1 / self.num_intervalos
-        limites = np.arange(0, 1 + 1e-10, step)  # Agrega epsilon para incluir el último límite
+        if self.distribucion is None:
+            # Crear límites uniformes en [0, 1)
+            step = 1 / self.num_intervalos
+            limites = np.arange(0, 1 + 1e-10, step)  # Agrega epsilon para incluir el último límite
+        else:
+            # Intervalos equiprobables de la distribución (límites vía PPF, cacheados por (distribución, k))
+            limites, probabilidades = intervalos_equiprobables(self.distribucion, self.num_intervalos)
 
-        # Calcular frecuencias observadas
-        freq_obs, _ = np.histogram(datos_normalizados, bins=limites)
+        # Calcular frecuencias observadas (solo datos en el rango [0, 1), o u = F(x) con distribución)
+        if self.frecuencias_observadas is not None:
+            freq_obs = np.asarray(self.frecuencias_observadas)
+        else:
+            freq_obs = conteos_multiresolucion(
+                self.datos, [self.num_intervalos], self.distribucion)[self.num_intervalos]
 
         # Calcular frecuencia acumulada observada (proporción)
         freq_acum_obs = np.cumsum(freq_obs) / self.n  # Usa self.n si quieres mantener proporción respecto al total original
@@ -42,8 +117,11 @@ class PruebaKS:
         # Límites superiores de cada intervalo
         limites_superiores = limites[1:]
 
-        # Calcular frecuencia acumulada teórica en cada límite superior (F(x) = x)
-        freq_acum_teorica = limites_superiores  # En uniforme sobre [0, 1), F(x) = x
+        # Calcular frecuencia acumulada teórica en cada límite superior
+        if self.distribucion is None:
+            freq_acum_teorica = limites_superiores  # En uniforme sobre [0, 1), F(x) = x
+        else:
+            freq_acum_teorica = np.cumsum(probabilidades)
 
         return limites, freq_obs, freq_acum_obs, freq_acum_teorica, limites_superiores
 
@@ -61,28 +139,54 @@ class PruebaKS:
         
         return d_max, limites, freq_obs, freq_acum_obs, freq_acum_teorica, puntos_medios, diferencias
     
-    def obtener_valor_critico(self):
+    def obtener_valor_critico(self, alpha=None):
         """Obtener valor crítico para la prueba KS"""
+        alpha = self.alpha if alpha is None else alpha
         # Valor crítico aproximado: K_alpha / sqrt(n)
-        if self.alpha in self.tabla_ks:
-            k_alpha = self.tabla_ks[self.alpha]
+        if alpha in self.tabla_ks:
+            k_alpha = self.tabla_ks[alpha]
         else:
             # Interpolación o aproximación
-            if self.alpha <= 0.001:
+            if alpha <= 0.001:
                 k_alpha = 1.95
-            elif self.alpha <= 0.005:
+            elif alpha <= 0.005:
                 k_alpha = 1.73
-            elif self.alpha <= 0.01:
+            elif alpha <= 0.01:
                 k_alpha = 1.63
-            elif self.alpha <= 0.025:
+            elif alpha <= 0.025:
                 k_alpha = 1.48
-            elif self.alpha <= 0.05:
+            elif alpha <= 0.05:
                 k_alpha = 1.36
             else:
                 k_alpha = 1.22
         
         return k_alpha / np.sqrt(self.n)
     
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = self.obtener_valor_critico(alpha)
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+    
+    def obtener_vista(self):
+        """Vista ordenada de los datos (se crea solo si no se recibió una)"""
+        if self.vista is None:
+            self.vista = VistaOrdenada(self.datos, self.distribucion)
+        return self.vista
+    
+    def calcular_p_valor(self):
+        """P-valor exacto (kstwo, como scipy.stats.kstest) sobre la vista ordenada (se calcula una sola vez)"""
+        if self._p_valor is None:
+            self._d_exacto = self.obtener_vista().estadistico_ks()
+            self._p_valor = float(np.clip(stats.kstwo.sf(self._d_exacto, self.n), 0.0, 1.0))
+        return self._p_valor
+    
+    @memorizar('num_intervalos', 'alpha', 'distribucion')
     def ejecutar(self):
         """Ejecutar la prueba de Kolmogorov-Smirnov"""
         try:
@@ -90,8 +194,7 @@ class PruebaKS:
             valor_critico = self.obtener_valor_critico()
             
             # También usar scipy para comparar
-            datos_normalizados = (self.datos - np.min(self.datos)) / (np.max(self.datos) - np.min(self.datos))
-            ks_stat_scipy, p_valor_scipy = stats.kstest(datos_normalizados, 'uniform')
+            p_valor_scipy = self.calcular_p_valor()
             
             # Decisión de la prueba
             rechaza_h0 = d_max > valor_critico
@@ -101,6 +204,7 @@ class PruebaKS:
                 'valor_critico': valor_critico,
                 'p_valor': p_valor_scipy,
                 'rechaza_h0': rechaza_h0,
+                'estadistico_exacto': self._d_exacto,
                 'limites': limites,
                 'frecuencias_observadas': freq_obs,
                 'frecuencias_acumuladas_obs': freq_acum_obs,
@@ -108,6 +212,8 @@ class PruebaKS:
                 'puntos_medios': puntos_medios,
                 'diferencias': diferencias,
                 'tipo_prueba': 'Kolmogorov-Smirnov',
+                'distribucion': nombre_distribucion(self.distribucion),
+                'transformacion': self.obtener_vista().descripcion(),
                 'alpha': self.alpha,
                 'n': self.n
             }
@@ -117,6 +223,24 @@ class PruebaKS:
         except Exception as e:
             raise Exception(f"Error en prueba Kolmogorov-Smirnov: {str(e)}")
     
+    def barrido_intervalos(self, lista_intervalos):
+        """Ejecutar la prueba para varios números de intervalos con una sola pasada sobre los datos"""
+        conteos = conteos_multiresolucion(self.datos, lista_intervalos, self.distribucion)
+        p_valor = self.calcular_p_valor()
+        
+        resultados = {}
+        # Cada k ya trae sus frecuencias: no vale la pena calcular huellas de los datos
+        with memoria_desactivada():
+            for k, freq_obs in conteos.items():
+                # La vista ordenada también se comparte: se ordena una sola vez
+                prueba = PruebaKS(self.datos, k, self.alpha, self.distribucion, frecuencias_observadas=freq_obs,
+                                  vista=self.obtener_vista())
+                prueba._p_valor = p_valor
+                prueba._d_exacto = self._d_exacto
+                resultados[k] = prueba.ejecutar()
+        
+        return resultados
+    
     def mostrar_tabla_detallada(self, parent=None):
         """Mostrar tabla detallada de la prueba KS"""
         ventana = tk.Toplevel(parent) if parent else tk.Tk()
@@ -184,13 +308,14 @@ class PruebaKS:
         ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=1, column=0, sticky=tk.W)
         ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=2, column=0, sticky=tk.W)
         ttk.Label(frame_resultados, text=f"Nivel de significancia: {self.alpha}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Distribución bajo H0: {resultado['distribucion']}").grid(row=4, column=0, sticky=tk.W)
         
         # Decisión
         decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
         color = "red" if resultado['rechaza_h0'] else "green"
         decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", 
                                   foreground=color, font=("Arial", 10, "bold"))
-        decision_label.grid(row=4, column=0, sticky=tk.W, pady=5)
+        decision_label.grid(row=5, column=0, sticky=tk.W, pady=5)
         
         # Gráfico
         self.crear_grafico_ks(main_frame, resultado)
@@ -217,8 +342,14 @@ class PruebaKS:
         freq_acum_obs = resultado['frecuencias_acumuladas_obs']
         freq_acum_teorica = resultado['frecuencias_acumuladas_teorica']
         
+        # Con distribuciones no acotadas el último límite es infinito y no se grafica
+        finitos = np.isfinite(puntos_medios)
+        puntos_medios = puntos_medios[finitos]
+        freq_acum_obs = freq_acum_obs[finitos]
+        freq_acum_teorica = freq_acum_teorica[finitos]
+        
         ax1.plot(puntos_medios, freq_acum_obs, 'o-', label='Observada', color='blue', linewidth=2)
-        ax1.plot(puntos_medios, freq_acum_teorica, 's-', label='Teórica (Uniforme)', color='red', linewidth=2)
+        ax1.plot(puntos_medios, freq_acum_teorica, 's-', label=f"Teórica ({resultado['distribucion']})", color='red', linewidth=2)
         
         # Líneas verticales para mostrar diferencias
         for i, (x, y_obs, y_teo) in enumerate(zip(puntos_medios, freq_acum_obs, freq_acum_teorica)):
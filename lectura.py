@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Números por bloque al recorrer un archivo
+TAMANO_BLOQUE = 1 << 20
+
+EXTENSIONES_EXCEL = ('.xlsx', '.xls')
+
+
+def leer_excel(ruta):
+    """Primera columna numérica de un libro de Excel (sin vacíos), como en la interfaz"""
+    df = pd.read_excel(ruta)
+    if df.empty:
+        raise ValueError("El archivo está vacío")
+    for col in df.columns:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            return df[col].dropna().to_numpy(dtype=float)
+    raise ValueError("No se encontró ninguna columna numérica")
+
+
+def abrir_datos(ruta, dtype=np.float64):
+    """
+    Los datos de un archivo como array: Excel se lee completo; .npy y los
+    binarios crudos (valores dtype seguidos, sin encabezado) se abren como
+    memmap, de modo que tomar un tramo solo lee esas páginas del disco.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in EXTENSIONES_EXCEL:
+        return leer_excel(ruta)
+    if extension == '.npy':
+        return np.load(ruta, mmap_mode='r')
+    dtype = np.dtype(dtype)
+    if os.path.getsize(ruta) < dtype.itemsize:
+        return np.empty(0, dtype=dtype)
+    # Un último valor incompleto (archivo a medio escribir) se ignora
+    return np.memmap(ruta, dtype=dtype, mode='r', shape=(os.path.getsize(ruta) // dtype.itemsize,))
+
+
+def leer_bloques(datos, desde=0, tamano_bloque=TAMANO_BLOQUE):
+    """Tramos consecutivos de datos[desde:] de a lo sumo tamano_bloque valores"""
+    for inicio in range(desde, len(datos), tamano_bloque):
+        yield np.asarray(datos[inicio:inicio + tamano_bloque], dtype=float)
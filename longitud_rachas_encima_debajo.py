@@ -1,5 +1,4 @@
 import tkinter as tk
-from collections import defaultdict
 from tkinter import ttk
 
 import matplotlib.pyplot as plt
@@ -8,6 +7,10 @@ import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from scipy import stats
 
+from memoria import memorizar
+from utilidades_rachas import (agrupar_frecuencias, frecuencias_longitudes,
+                               longitudes_rachas, secuencia_umbral)
+
 
 class LongitudRachasEncimaDebajo:
     """
@@ -17,13 +20,14 @@ class LongitudRachasEncimaDebajo:
     esperadas (Ei).
     """
 
-    def __init__(self, datos, alpha):
+    def __init__(self, datos, alpha, secuencia=None):
         """
         Inicializa la prueba.
         :param datos: Una lista o array de números.
         :param alpha: Nivel de significancia para la prueba.
+        :param secuencia: Signos respecto al umbral ya calculados (datos > 0.5), opcional.
         """
-        self.datos = np.array(datos)
+        self.datos = np.asarray(datos)
         self.alpha = alpha
         self.n_total = len(self.datos)
 
@@ -33,13 +37,16 @@ class LongitudRachasEncimaDebajo:
         # --- MODIFICACIÓN CLAVE AQUÍ: Usar 0.5 como umbral en lugar de la media ---
         self.umbral = 0.5  # Definimos el umbral como 0.5
 
-        # Generar secuencia de '+' y '-' basada en el umbral
-        self.secuencia = ['+' if dato >
-                          self.umbral else '-' for dato in self.datos]
+        # Generar secuencia de signos basada en el umbral (True = '+', False = '-')
+        if secuencia is not None:
+            self.secuencia = np.asarray(secuencia)
+        else:
+            self.secuencia = secuencia_umbral(
+                self.datos, self.umbral, incluir_igual=False)
 
         # Contar n1 (encima del umbral) y n2 (debajo del umbral)
-        self.n1 = self.secuencia.count('+')
-        self.n2 = self.secuencia.count('-')
+        self.n1 = int(np.count_nonzero(self.secuencia))
+        self.n2 = self.n_total - self.n1
         self.N = self.n1 + self.n2  # Total de elementos considerados
 
     def _calcular_frecuencias(self):
@@ -47,24 +54,11 @@ class LongitudRachasEncimaDebajo:
         Calcula las frecuencias observadas y esperadas de las longitudes de racha.
         """
         # --- Frecuencias Observadas (Oi) ---
-        if not self.secuencia:
+        if self.secuencia.size == 0:
             return {}, {}
 
-        observed_counts = defaultdict(int)
-        current_run_length = 0
-        current_run_char = self.secuencia[0]
-
-        for char in self.secuencia:
-            if char == current_run_char:
-                current_run_length += 1
-            else:
-                if current_run_length > 0:
-                    observed_counts[current_run_length] += 1
-                current_run_char = char
-                current_run_length = 1
-
-        # Contar la última racha
-        observed_counts[current_run_length] += 1
+        observed_counts = frecuencias_longitudes(
+            longitudes_rachas(self.secuencia))
 
         max_len_obs = max(observed_counts.keys()) if observed_counts else 0
 
@@ -81,6 +75,7 @@ class LongitudRachasEncimaDebajo:
 
         return observed_counts, expected_counts
 
+    @memorizar('alpha', 'umbral')
     def ejecutar(self):
         """
         Ejecuta la prueba completa y devuelve los resultados.
@@ -100,29 +95,7 @@ class LongitudRachasEncimaDebajo:
 
         # --- Agrupar si Ei < 5 ---
         # Se agrupan desde la longitud más larga hacia atrás
-        grouped_Oi = []
-        grouped_Ei = []
-
-        temp_Oi = 0
-        temp_Ei = 0
-
-        for i in reversed(df.index):
-            temp_Oi += df.loc[i, 'Oi']
-            temp_Ei += df.loc[i, 'Ei']
-
-            if temp_Ei >= 5:
-                grouped_Oi.insert(0, temp_Oi)
-                grouped_Ei.insert(0, temp_Ei)
-                temp_Oi = 0
-                temp_Ei = 0
-
-        # Si queda un grupo pequeño al final, se une con el siguiente
-        if temp_Ei > 0 and grouped_Ei:
-            grouped_Oi[0] += temp_Oi
-            grouped_Ei[0] += temp_Ei
-        elif temp_Ei > 0:  # Caso en que todos los Ei son < 5
-            grouped_Oi.append(temp_Oi)
-            grouped_Ei.append(temp_Ei)
+        grouped_Oi, grouped_Ei = agrupar_frecuencias(df['Oi'], df['Ei'])
 
         # --- Calcular Chi-cuadrado ---
         k = len(grouped_Oi)
@@ -155,6 +128,7 @@ class LongitudRachasEncimaDebajo:
             'umbral': self.umbral,  # Se agrega el umbral a los resultados
             'n1': self.n1,
             'n2': self.n2,
+            'longitud_maxima': int(df.index.max()),
             'df_original': df,
             'grouped_oi': grouped_Oi,
             'grouped_ei': grouped_Ei
@@ -162,6 +136,21 @@ class LongitudRachasEncimaDebajo:
 
         return resultado
 
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico Chi-cuadrado ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
     def mostrar_tabla_detallada(self, parent=None):
         """Muestra una ventana con la tabla detallada de la prueba."""
         resultado = self.ejecutar()
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
@@ -11,22 +12,51 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfgen import canvas
 from reportlab.platypus import (Paragraph, SimpleDocTemplate, Spacer, Table,
                                 TableStyle)
+from scipy import stats
 from scipy.stats import norm
 
 # Importar los módulos de pruebas estadísticas
 try:
 
+    from anderson_darling import PruebaAndersonDarling
     from chi_cuadrado import PruebaChi
-    from kolmogorov_smornov import PruebaKS
+    from cramer_von_mises import PruebaCramerVonMises
+    from fuentes import FUENTES, crear_fuente
+    from historial import HistorialResultados, mostrar_historial
+    from kolmogorov_smornov import PruebaKS, VistaOrdenada
     from longitud_rachas_encima_debajo import LongitudRachasEncimaDebajo
     from LongitudRachasAscendenteDescendente import \
         LongitudRachasAscendenteDescendente
+    from prueba_poker import PruebaPoker
+    from prueba_racha_maxima import PruebaRachaMaxima
     from prueba_rachas_asc_desc import RachasAscendentesDescendentes
     from prueba_rachas_enc_deb import RachasEncimaDebajo
 except ImportError as e:
     print(f"Error importando módulos: {e}")
     print("Asegúrate de que todos los módulos estén en el mismo directorio")
 
+# Distribuciones disponibles bajo H0 para Chi², K-S, A-D y CvM (None = U(0,1))
+DISTRIBUCIONES = {
+    "Uniforme(0,1)": None,
+    "Exponencial": stats.expon,
+    "Normal": stats.norm,
+}
+
+# Nombres cortos usados en la grilla de decisiones por nivel de significancia
+NOMBRES_CORTOS = {
+    'chi_cuadrado': "Chi²",
+    'kolmogorov_smornov': "K-S",
+    'rachas_ascendentes_descendentes': "R. Asc/Desc",
+    'rachas_encima_debajo': "R. Enc/Deb",
+    'longitud_rachas_ascendentes_descendentes': "L. Asc/Desc",
+    'longitud_rachas_enc': "L. Enc/Deb",
+    'poker': "Póker",
+    'racha_maxima_asc': "Máx. Asc/Desc",
+    'racha_maxima_enc': "Máx. Enc/Deb",
+    'anderson_darling': "A-D",
+    'cramer_von_mises': "CvM",
+}
+
 
 class InterfazPrincipal:
     def __init__(self, root):
@@ -39,6 +69,9 @@ class InterfazPrincipal:
         self.datos = None
         self.archivo_cargado = False
         self.pruebas_seleccionadas = {}
+        # Generador o archivo de los datos y semilla, para el historial
+        self.origen_datos = None
+        self.semilla_datos = None
 
         # Store instances of test objects
         self.instancias_pruebas = {}
@@ -74,6 +107,10 @@ class InterfazPrincipal:
                                         command=self.ver_datos, state="disabled")
         self.btn_ver_datos.grid(row=0, column=2, padx=5)
 
+        self.btn_generar_datos = ttk.Button(frame_archivo, text="Generar datos",
+                                            command=self.generar_datos)
+        self.btn_generar_datos.grid(row=0, column=3, padx=5)
+
         # Instrucciones
         instrucciones = ttk.Label(frame_archivo,
                                   text="El archivo Excel debe tener una columna con números aleatorios.\nFormatos aceptados: .xlsx, .xls",
@@ -93,6 +130,11 @@ class InterfazPrincipal:
         self.var_rachas_enc = tk.BooleanVar()
         self.var_long_asc = tk.BooleanVar()
         self.var_long_enc = tk.BooleanVar()
+        self.var_poker = tk.BooleanVar()
+        self.var_max_asc = tk.BooleanVar()
+        self.var_max_enc = tk.BooleanVar()
+        self.var_ad = tk.BooleanVar()
+        self.var_cvm = tk.BooleanVar()
 
         # Checkboxes para pruebas
         ttk.Checkbutton(frame_pruebas, text="Chi Cuadrado",
@@ -108,6 +150,16 @@ class InterfazPrincipal:
                         variable=self.var_long_asc).grid(row=2, column=0, sticky=tk.W)
         ttk.Checkbutton(frame_pruebas, text="Longitud Rachas Enc/Deb",
                         variable=self.var_long_enc).grid(row=2, column=1, sticky=tk.W)
+        ttk.Checkbutton(frame_pruebas, text="Póker",
+                        variable=self.var_poker).grid(row=3, column=0, sticky=tk.W)
+        ttk.Checkbutton(frame_pruebas, text="Racha Máxima Asc/Desc",
+                        variable=self.var_max_asc).grid(row=3, column=1, sticky=tk.W)
+        ttk.Checkbutton(frame_pruebas, text="Racha Máxima Enc/Deb",
+                        variable=self.var_max_enc).grid(row=4, column=0, sticky=tk.W)
+        ttk.Checkbutton(frame_pruebas, text="Anderson-Darling",
+                        variable=self.var_ad).grid(row=4, column=1, sticky=tk.W)
+        ttk.Checkbutton(frame_pruebas, text="Cramér-von Mises",
+                        variable=self.var_cvm).grid(row=5, column=0, sticky=tk.W)
 
         # Parámetros
         frame_params = ttk.LabelFrame(
@@ -115,13 +167,15 @@ class InterfazPrincipal:
         frame_params.grid(row=3, column=0, columnspan=4,
                           sticky=(tk.W, tk.E), pady=5)
 
-        # Nivel de significancia
-        ttk.Label(frame_params, text="Nivel de significancia:").grid(
+        # Nivel de significancia (uno o varios separados por comas)
+        ttk.Label(frame_params, text="Nivel(es) de significancia:").grid(
             row=0, column=0, sticky=tk.W)
-        self.var_alpha = tk.DoubleVar(value=0.05)
+        self.var_alpha = tk.StringVar(value="0.05")
         self.entry_alpha = ttk.Entry(
-            frame_params, textvariable=self.var_alpha, width=10)
+            frame_params, textvariable=self.var_alpha, width=20)
         self.entry_alpha.grid(row=0, column=1, padx=5)
+        ttk.Label(frame_params, text="Ej: 0.01, 0.05, 0.10",
+                  font=("Arial", 8)).grid(row=0, column=2, sticky=tk.W)
 
         # Número de intervalos
         ttk.Label(
@@ -131,6 +185,31 @@ class InterfazPrincipal:
             frame_params, textvariable=self.var_intervalos, width=10)
         self.entry_intervalos.grid(row=1, column=1, padx=5)
 
+        # Distribución bajo H0 para Chi², K-S, A-D y CvM
+        ttk.Label(
+            frame_params, text="Distribución H0 (Chi², K-S, A-D, CvM):").grid(row=2, column=0, sticky=tk.W)
+        self.var_distribucion = tk.StringVar(value="Uniforme(0,1)")
+        self.combo_distribucion = ttk.Combobox(
+            frame_params, textvariable=self.var_distribucion,
+            values=list(DISTRIBUCIONES), state="readonly", width=17)
+        self.combo_distribucion.grid(row=2, column=1, padx=5)
+
+        ttk.Label(frame_params, text="Parámetros (loc, scale):").grid(
+            row=3, column=0, sticky=tk.W)
+        self.var_parametros_dist = tk.StringVar(value="0, 1")
+        self.entry_parametros_dist = ttk.Entry(
+            frame_params, textvariable=self.var_parametros_dist, width=20)
+        self.entry_parametros_dist.grid(row=3, column=1, padx=5)
+
+        # Dígitos por número para la prueba de póker
+        ttk.Label(frame_params, text="Dígitos (Póker):").grid(
+            row=4, column=0, sticky=tk.W)
+        self.var_digitos_poker = tk.IntVar(value=5)
+        self.combo_digitos_poker = ttk.Combobox(
+            frame_params, textvariable=self.var_digitos_poker,
+            values=[3, 4, 5], state="readonly", width=17)
+        self.combo_digitos_poker.grid(row=4, column=1, padx=5)
+
         # Botones de acción
         frame_botones = ttk.Frame(main_frame)
         frame_botones.grid(row=4, column=0, columnspan=4, pady=20)
@@ -143,6 +222,10 @@ class InterfazPrincipal:
                                           command=self.generar_pdf, state="disabled")
         self.btn_generar_pdf.grid(row=0, column=1, padx=5)
 
+        self.btn_historial = ttk.Button(frame_botones, text="Historial",
+                                        command=lambda: mostrar_historial(self.root))
+        self.btn_historial.grid(row=0, column=2, padx=5)
+
         # Área de resultados (summary)
         frame_resultados_summary = ttk.LabelFrame(
             main_frame, text="Resumen de Resultados", padding="10")
@@ -196,6 +279,31 @@ class InterfazPrincipal:
         self.btn_detalle_long_enc.grid(
             row=2, column=1, padx=5, pady=2, sticky=tk.W)
 
+        self.btn_detalle_poker = ttk.Button(self.frame_resultados_detalles, text="Detalle Póker",
+                                            command=self.mostrar_detalle_poker, state="disabled")
+        self.btn_detalle_poker.grid(
+            row=3, column=0, padx=5, pady=2, sticky=tk.W)
+
+        self.btn_detalle_max_asc = ttk.Button(self.frame_resultados_detalles, text="Detalle Racha Máxima Asc/Desc",
+                                              command=self.mostrar_detalle_max_asc, state="disabled")
+        self.btn_detalle_max_asc.grid(
+            row=3, column=1, padx=5, pady=2, sticky=tk.W)
+
+        self.btn_detalle_max_enc = ttk.Button(self.frame_resultados_detalles, text="Detalle Racha Máxima Enc/Deb",
+                                              command=self.mostrar_detalle_max_enc, state="disabled")
+        self.btn_detalle_max_enc.grid(
+            row=4, column=0, padx=5, pady=2, sticky=tk.W)
+
+        self.btn_detalle_ad = ttk.Button(self.frame_resultados_detalles, text="Detalle Anderson-Darling",
+                                         command=self.mostrar_detalle_ad, state="disabled")
+        self.btn_detalle_ad.grid(
+            row=4, column=1, padx=5, pady=2, sticky=tk.W)
+
+        self.btn_detalle_cvm = ttk.Button(self.frame_resultados_detalles, text="Detalle Cramér-von Mises",
+                                          command=self.mostrar_detalle_cvm, state="disabled")
+        self.btn_detalle_cvm.grid(
+            row=5, column=0, padx=5, pady=2, sticky=tk.W)
+
         # Configurar weights para redimensionamiento
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -207,6 +315,7 @@ class InterfazPrincipal:
 
         # Almacenar resultados (summary dictionaries for PDF generation)
         self.resultados = {}
+        self.alphas = []
 
         # CORRECCIÓN: Configurar protocolo de cierre para la ventana principal
         def on_main_closing():
@@ -256,36 +365,110 @@ class InterfazPrincipal:
                     return
 
                 self.datos = df[columna_numerica].dropna().values
-                self.archivo_cargado = True
-
-                # Actualizar interfaz
-                self.lbl_archivo.config(
-                    text=f"Archivo cargado: {os.path.basename(archivo)} ({len(self.datos)} datos)")
-                self.btn_ver_datos.config(state="normal")
-                self.btn_ejecutar.config(state="normal")
-
-                self.text_resultados.delete(1.0, tk.END)
-                self.text_resultados.insert(
-                    tk.END, f"Archivo cargado exitosamente.\n")
-                self.text_resultados.insert(
-                    tk.END, f"Datos encontrados: {len(self.datos)}\n")
-                self.text_resultados.insert(
-                    tk.END, f"Rango: [{self.datos.min():.4f}, {self.datos.max():.4f}]\n\n")
-
-                # Disable all detail buttons until tests are run
-                self.btn_detalle_chi.config(state="disabled")
-                self.btn_detalle_ks.config(state="disabled")
-                self.btn_detalle_rachas_asc.config(state="disabled")
-                self.btn_detalle_rachas_enc.config(state="disabled")
-                # Commented if LongitudRachas not used
-                self.btn_detalle_long_asc.config(state="disabled")
-                # Commented if LongitudRachas not used
-                self.btn_detalle_long_enc.config(state="disabled")
+                self.origen_datos = os.path.basename(archivo)
+                self.semilla_datos = None
+                self.mostrar_datos_cargados(
+                    f"Archivo cargado: {os.path.basename(archivo)}",
+                    "Archivo cargado exitosamente.")
 
             except Exception as e:
                 messagebox.showerror(
                     "Error", f"Error al cargar el archivo: {str(e)}")
 
+    def mostrar_datos_cargados(self, descripcion, mensaje):
+        """Actualizar la interfaz con los datos nuevos (de archivo o generados)"""
+        self.archivo_cargado = True
+
+        # Actualizar interfaz
+        self.lbl_archivo.config(
+            text=f"{descripcion} ({len(self.datos)} datos)")
+        self.btn_ver_datos.config(state="normal")
+        self.btn_ejecutar.config(state="normal")
+
+        self.text_resultados.delete(1.0, tk.END)
+        self.text_resultados.insert(
+            tk.END, f"{mensaje}\n")
+        self.text_resultados.insert(
+            tk.END, f"Datos encontrados: {len(self.datos)}\n")
+        self.text_resultados.insert(
+            tk.END, f"Rango: [{self.datos.min():.4f}, {self.datos.max():.4f}]\n\n")
+
+        # Disable all detail buttons until tests are run
+        self.btn_detalle_chi.config(state="disabled")
+        self.btn_detalle_ks.config(state="disabled")
+        self.btn_detalle_rachas_asc.config(state="disabled")
+        self.btn_detalle_rachas_enc.config(state="disabled")
+        # Commented if LongitudRachas not used
+        self.btn_detalle_long_asc.config(state="disabled")
+        # Commented if LongitudRachas not used
+        self.btn_detalle_long_enc.config(state="disabled")
+        self.btn_detalle_poker.config(state="disabled")
+        self.btn_detalle_max_asc.config(state="disabled")
+        self.btn_detalle_max_enc.config(state="disabled")
+        self.btn_detalle_ad.config(state="disabled")
+        self.btn_detalle_cvm.config(state="disabled")
+
+    def generar_datos(self):
+        """Ventana para generar los datos con una de las fuentes incorporadas"""
+        ventana = tk.Toplevel(self.root)
+        ventana.title("Generar Datos")
+        ventana.geometry("420x220")
+
+        frame = ttk.Frame(ventana, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        ttk.Label(frame, text="Generador:").grid(row=0, column=0, sticky=tk.W)
+        var_fuente = tk.StringVar(value=next(iter(FUENTES)))
+        combo_fuente = ttk.Combobox(frame, textvariable=var_fuente, values=list(FUENTES),
+                                    state="readonly", width=28)
+        combo_fuente.grid(row=0, column=1, padx=5, pady=2)
+
+        ttk.Label(frame, text="Semilla:").grid(row=1, column=0, sticky=tk.W)
+        var_semilla = tk.StringVar(value="12345")
+        ttk.Entry(frame, textvariable=var_semilla, width=30).grid(row=1, column=1, padx=5, pady=2)
+
+        ttk.Label(frame, text="Cantidad de números:").grid(row=2, column=0, sticky=tk.W)
+        var_cantidad = tk.StringVar(value="10000")
+        ttk.Entry(frame, textvariable=var_cantidad, width=30).grid(row=2, column=1, padx=5, pady=2)
+
+        ttk.Label(frame, text="Parámetros:").grid(row=3, column=0, sticky=tk.W)
+        var_parametros = tk.StringVar()
+        ttk.Entry(frame, textvariable=var_parametros, width=30).grid(row=3, column=1, padx=5, pady=2)
+
+        def mostrar_parametros(*_):
+            """Mostrar los parámetros por defecto del generador elegido"""
+            var_parametros.set(", ".join(
+                f"{clave}={valor}" for clave, valor in FUENTES[var_fuente.get()][1].items()))
+
+        combo_fuente.bind("<<ComboboxSelected>>", mostrar_parametros)
+        mostrar_parametros()
+
+        def aceptar():
+            try:
+                cantidad = int(var_cantidad.get())
+                if cantidad < 1:
+                    raise ValueError("La cantidad de números debe ser mayor que 0")
+                parametros = {}
+                for par in var_parametros.get().split(','):
+                    if par.strip():
+                        clave, _, valor = par.partition('=')
+                        valor = valor.strip()
+                        parametros[clave.strip()] = int(valor) if valor.lstrip('-').isdigit() else valor
+                fuente = crear_fuente(var_fuente.get(), int(var_semilla.get()), **parametros)
+                self.datos = fuente.generar(cantidad)
+                self.origen_datos = var_fuente.get()
+                self.semilla_datos = int(var_semilla.get())
+            except (TypeError, ValueError) as e:
+                messagebox.showerror("Error", f"Error al generar los datos: {str(e)}")
+                return
+
+            ventana.destroy()
+            self.mostrar_datos_cargados(
+                f"Generados con {var_fuente.get()}",
+                f"Datos generados con {var_fuente.get()} (semilla {var_semilla.get()}).")
+
+        ttk.Button(frame, text="Generar", command=aceptar).grid(row=4, column=0, columnspan=2, pady=10)
+
     def ver_datos(self):
         """Mostrar ventana con los datos cargados"""
         if not self.archivo_cargado:
@@ -332,7 +515,9 @@ class InterfazPrincipal:
         # Verificar que al menos una prueba esté seleccionada
         pruebas_seleccionadas = [
             self.var_chi.get(), self.var_ks.get(), self.var_rachas_asc.get(),
-            self.var_rachas_enc.get(), self.var_long_asc.get(), self.var_long_enc.get()
+            self.var_rachas_enc.get(), self.var_long_asc.get(), self.var_long_enc.get(),
+            self.var_poker.get(), self.var_max_asc.get(), self.var_max_enc.get(),
+            self.var_ad.get(), self.var_cvm.get()
         ]
 
         if not any(pruebas_seleccionadas):
@@ -340,6 +525,13 @@ class InterfazPrincipal:
                 "Error", "Debe seleccionar al menos una prueba")
             return
 
+        try:
+            alphas = self.obtener_alphas()
+            distribucion = self.obtener_distribucion()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
         # Limpiar resultados anteriores y disable detail buttons
         self.text_resultados.delete(1.0, tk.END)
         self.resultados = {}  # Clear summary results for PDF
@@ -351,8 +543,16 @@ class InterfazPrincipal:
         self.btn_detalle_rachas_enc.config(state="disabled")
         self.btn_detalle_long_asc.config(state="disabled")
         self.btn_detalle_long_enc.config(state="disabled")
-
-        alpha = self.var_alpha.get()
+        self.btn_detalle_poker.config(state="disabled")
+        self.btn_detalle_max_asc.config(state="disabled")
+        self.btn_detalle_max_enc.config(state="disabled")
+        self.btn_detalle_ad.config(state="disabled")
+        self.btn_detalle_cvm.config(state="disabled")
+
+        # Las decisiones principales usan el primer alpha; el resto se
+        # evalúa sobre los mismos estadísticos en la grilla de decisiones
+        self.alphas = alphas
+        alpha = alphas[0]
         intervalos = self.var_intervalos.get()
 
         self.text_resultados.insert(
@@ -360,13 +560,21 @@ class InterfazPrincipal:
         self.text_resultados.insert(tk.END, "=" * 50 + "\n\n")
 
         try:
+            # K-S, Anderson-Darling y Cramér-von Mises comparten los datos ordenados
+            vista = None
+            if self.var_ks.get() or self.var_ad.get() or self.var_cvm.get():
+                vista = VistaOrdenada(self.datos, distribucion)
+
             # Chi Cuadrado
             if self.var_chi.get():
                 self.text_resultados.insert(
                     tk.END, "Ejecutando prueba Chi Cuadrado...\n")
                 self.root.update()
-                prueba_chi = PruebaChi(self.datos, intervalos, alpha)
+                prueba_chi = PruebaChi(
+                    self.datos, intervalos, alpha, distribucion)
                 resultado_chi = prueba_chi.ejecutar()
+                resultado_chi['decisiones_alpha'] = prueba_chi.evaluar_alphas(
+                    resultado_chi, alphas)
                 # Store summary for PDF
                 self.resultados['chi_cuadrado'] = resultado_chi
                 # Store instance for detail view
@@ -383,8 +591,11 @@ class InterfazPrincipal:
                 # Assuming PruebaKS class is available and works similarly
                 # For demonstration, let's create a dummy KS result if PruebaKS is not provided
                 try:
-                    prueba_ks = PruebaKS(self.datos, intervalos, alpha)
+                    prueba_ks = PruebaKS(
+                        self.datos, intervalos, alpha, distribucion, vista=vista)
                     resultado_ks = prueba_ks.ejecutar()
+                    resultado_ks['decisiones_alpha'] = prueba_ks.evaluar_alphas(
+                        resultado_ks, alphas)
                 except NameError:  # Fallback if PruebaKS is not imported/defined
                     resultado_ks = {
                         'estadistico': 0.123, 'valor_critico': 0.135, 'p_valor': 0.25,
@@ -419,6 +630,8 @@ class InterfazPrincipal:
                         'rechaza_h0': resultado_rasc['rechaza_H0'],
                         'tipo_prueba': 'Rachas Asc/Desc',
                         'alpha': alpha,
+                        'decisiones_alpha': prueba_rasc.evaluar_alphas(
+                            resultado_rasc, alphas),
                         # Guardamos todo el resultado para el detalle
                         'resultado_completo': resultado_rasc
                     }
@@ -454,6 +667,8 @@ class InterfazPrincipal:
                     'rechaza_h0': resultado_renc['rechaza_h0'],
                     'tipo_prueba': 'Rachas Enc/Deb',
                     'alpha': alpha,
+                    'decisiones_alpha': prueba_renc.evaluar_alphas(
+                        resultado_renc, alphas),
                     # Guardamos todo el resultado para el detalle
                     'resultado_completo': resultado_renc
                 }
@@ -473,6 +688,9 @@ class InterfazPrincipal:
                     prueba_long_asc = LongitudRachasAscendenteDescendente(
                         self.datos, alpha)
                     resultado_long_asc = prueba_long_asc.ejecutar()
+                    if 'error' not in resultado_long_asc:
+                        resultado_long_asc['decisiones_alpha'] = prueba_long_asc.evaluar_alphas(
+                            resultado_long_asc, alphas)
                     self.resultados['longitud_rachas_ascendentes_descendentes'] = resultado_long_asc
                     self.instancias_pruebas['longitud_rachas_ascendentes_descendentes'] = prueba_long_asc
                     self.mostrar_resultado(
@@ -491,6 +709,9 @@ class InterfazPrincipal:
                 self.root.update()
                 prueba_long_enc = LongitudRachasEncimaDebajo(self.datos, alpha)
                 resultado_long_enc = prueba_long_enc.ejecutar()
+                if 'error' not in resultado_long_enc:
+                    resultado_long_enc['decisiones_alpha'] = prueba_long_enc.evaluar_alphas(
+                        resultado_long_enc, alphas)
 
                 self.resultados['longitud_rachas_enc'] = resultado_long_enc
                 self.instancias_pruebas['longitud_rachas_enc'] = prueba_long_enc
@@ -498,9 +719,100 @@ class InterfazPrincipal:
                     "LONGITUD RACHAS ENCIMA/DEBAJO", resultado_long_enc)
                 self.btn_detalle_long_enc.config(state="normal")
 
-                self.text_resultados.insert(tk.END, "\n" + "=" * 50 + "\n")
+            # Póker
+            if self.var_poker.get():
+                self.text_resultados.insert(
+                    tk.END, "Ejecutando prueba de Póker...\n")
+                self.root.update()
+                prueba_poker = PruebaPoker(
+                    self.datos, self.var_digitos_poker.get(), alpha)
+                resultado_poker = prueba_poker.ejecutar()
+                if 'error' in resultado_poker:
+                    messagebox.showerror(
+                        "Error", f"Error en Póker: {resultado_poker['error']}")
+                else:
+                    resultado_poker['decisiones_alpha'] = prueba_poker.evaluar_alphas(
+                        resultado_poker, alphas)
+                    self.resultados['poker'] = resultado_poker
+                    self.instancias_pruebas['poker'] = prueba_poker
+                    self.mostrar_resultado("PÓKER", resultado_poker)
+                    self.btn_detalle_poker.config(state="normal")
+
+            # Racha máxima: si ya se ejecutó la prueba de rachas o de longitud
+            # de rachas correspondiente se reutiliza su racha máxima
+            if self.var_max_asc.get():
+                self.text_resultados.insert(
+                    tk.END, "Ejecutando prueba Racha Máxima Asc/Desc...\n")
+                self.root.update()
+                longitud_maxima = None
+                if 'rachas_ascendentes_descendentes' in self.resultados:
+                    longitud_maxima = self.resultados['rachas_ascendentes_descendentes'].get(
+                        'resultado_completo', {}).get('longitud_maxima')
+                prueba_max_asc = PruebaRachaMaxima(
+                    self.datos, 'ascendente_descendente', alpha, longitud_maxima)
+                resultado_max_asc = prueba_max_asc.ejecutar()
+                resultado_max_asc['decisiones_alpha'] = prueba_max_asc.evaluar_alphas(
+                    resultado_max_asc, alphas)
+                self.resultados['racha_maxima_asc'] = resultado_max_asc
+                self.instancias_pruebas['racha_maxima_asc'] = prueba_max_asc
+                self.mostrar_resultado(
+                    "RACHA MÁXIMA ASCENDENTE/DESCENDENTE", resultado_max_asc)
+                self.btn_detalle_max_asc.config(state="normal")
+
+            if self.var_max_enc.get():
                 self.text_resultados.insert(
-                    tk.END, "TODAS LAS PRUEBAS COMPLETADAS\n")
+                    tk.END, "Ejecutando prueba Racha Máxima Enc/Deb...\n")
+                self.root.update()
+                longitud_maxima = self.resultados.get(
+                    'longitud_rachas_enc', {}).get('longitud_maxima')
+                prueba_max_enc = PruebaRachaMaxima(
+                    self.datos, 'encima_debajo', alpha, longitud_maxima)
+                resultado_max_enc = prueba_max_enc.ejecutar()
+                resultado_max_enc['decisiones_alpha'] = prueba_max_enc.evaluar_alphas(
+                    resultado_max_enc, alphas)
+                self.resultados['racha_maxima_enc'] = resultado_max_enc
+                self.instancias_pruebas['racha_maxima_enc'] = prueba_max_enc
+                self.mostrar_resultado(
+                    "RACHA MÁXIMA ENCIMA/DEBAJO", resultado_max_enc)
+                self.btn_detalle_max_enc.config(state="normal")
+
+            # Anderson-Darling
+            if self.var_ad.get():
+                self.text_resultados.insert(
+                    tk.END, "Ejecutando prueba Anderson-Darling...\n")
+                self.root.update()
+                prueba_ad = PruebaAndersonDarling(
+                    self.datos, alpha, distribucion, vista=vista)
+                resultado_ad = prueba_ad.ejecutar()
+                resultado_ad['decisiones_alpha'] = prueba_ad.evaluar_alphas(
+                    resultado_ad, alphas)
+                self.resultados['anderson_darling'] = resultado_ad
+                self.instancias_pruebas['anderson_darling'] = prueba_ad
+                self.mostrar_resultado("ANDERSON-DARLING", resultado_ad)
+                self.btn_detalle_ad.config(state="normal")
+
+            # Cramér-von Mises
+            if self.var_cvm.get():
+                self.text_resultados.insert(
+                    tk.END, "Ejecutando prueba Cramér-von Mises...\n")
+                self.root.update()
+                prueba_cvm = PruebaCramerVonMises(
+                    self.datos, alpha, distribucion, vista=vista)
+                resultado_cvm = prueba_cvm.ejecutar()
+                resultado_cvm['decisiones_alpha'] = prueba_cvm.evaluar_alphas(
+                    resultado_cvm, alphas)
+                self.resultados['cramer_von_mises'] = resultado_cvm
+                self.instancias_pruebas['cramer_von_mises'] = prueba_cvm
+                self.mostrar_resultado("CRAMÉR-VON MISES", resultado_cvm)
+                self.btn_detalle_cvm.config(state="normal")
+
+            self.text_resultados.insert(tk.END, "\n" + "=" * 50 + "\n")
+            self.text_resultados.insert(
+                tk.END, "TODAS LAS PRUEBAS COMPLETADAS\n")
+
+            # Grilla compacta alpha x prueba
+            self.mostrar_grilla_alphas()
+            self.guardar_historial(alpha, intervalos)
 
             # Habilitar botón de PDF
             self.btn_generar_pdf.config(state="normal")
@@ -509,6 +821,94 @@ class InterfazPrincipal:
             messagebox.showerror(
                 "Error", f"Error al ejecutar las pruebas: {str(e)}")
 
+    def guardar_historial(self, alpha, intervalos):
+        """Agregar los resultados de esta ejecución al historial de resultados"""
+        distribucion = f"{self.var_distribucion.get()} ({self.var_parametros_dist.get()})"
+        parametros = {
+            'chi_cuadrado': {'num_intervalos': intervalos, 'distribucion': distribucion},
+            'kolmogorov_smornov': {'num_intervalos': intervalos, 'distribucion': distribucion},
+            'anderson_darling': {'distribucion': distribucion},
+            'cramer_von_mises': {'distribucion': distribucion},
+            'poker': {'num_digitos': self.var_digitos_poker.get()},
+        }
+        try:
+            with HistorialResultados() as historial:
+                historial.guardar_resultados(self.datos, self.resultados, self.origen_datos, alpha,
+                                             parametros, self.semilla_datos)
+        except sqlite3.Error as e:
+            # Sin historial las pruebas siguen siendo válidas
+            self.text_resultados.insert(
+                tk.END, f"No se pudo guardar en el historial: {str(e)}\n")
+
+    def obtener_alphas(self):
+        """Leer uno o varios niveles de significancia separados por comas"""
+        texto = str(self.var_alpha.get()).replace(';', ',')
+        try:
+            alphas = [float(valor) for valor in texto.split(',') if valor.strip()]
+        except ValueError:
+            raise ValueError(
+                "Los niveles de significancia deben ser números separados por comas")
+
+        if not alphas or any(not 0 < a < 1 for a in alphas):
+            raise ValueError(
+                "Los niveles de significancia deben estar entre 0 y 1")
+
+        # Eliminar repetidos conservando el orden ingresado
+        return list(dict.fromkeys(alphas))
+
+    def obtener_distribucion(self):
+        """Construir la distribución congelada de SciPy seleccionada para Chi², K-S, A-D y CvM"""
+        familia = DISTRIBUCIONES.get(self.var_distribucion.get())
+        if familia is None:
+            return None
+
+        try:
+            parametros = [float(valor) for valor in
+                          self.var_parametros_dist.get().split(',') if valor.strip()]
+        except ValueError:
+            raise ValueError(
+                "Los parámetros de la distribución deben ser números: loc, scale")
+
+        loc = parametros[0] if len(parametros) > 0 else 0.0
+        scale = parametros[1] if len(parametros) > 1 else 1.0
+        if scale <= 0:
+            raise ValueError("El parámetro scale debe ser mayor que 0")
+        return familia(loc=loc, scale=scale)
+
+    def construir_grilla_alphas(self):
+        """Construir las filas de la grilla de decisiones (alpha x prueba)"""
+        claves = [clave for clave, resultado in self.resultados.items()
+                  if 'decisiones_alpha' in resultado]
+        if not claves:
+            return []
+
+        filas = [['Alfa'] + [NOMBRES_CORTOS.get(clave, clave) for clave in claves]]
+        for alpha in self.alphas:
+            fila = [f"{alpha:g}"]
+            for clave in claves:
+                decision = self.resultados[clave]['decisiones_alpha'][alpha]
+                fila.append("Rechaza" if decision['rechaza_h0'] else "Acepta")
+            filas.append(fila)
+        return filas
+
+    def mostrar_grilla_alphas(self):
+        """Mostrar en el resumen la grilla de decisiones por nivel de significancia"""
+        filas = self.construir_grilla_alphas()
+        if not filas:
+            return
+
+        anchos = [max(len(fila[i]) for fila in filas)
+                  for i in range(len(filas[0]))]
+        self.text_resultados.insert(
+            tk.END, "\nDECISIONES POR NIVEL DE SIGNIFICANCIA\n")
+        for numero, fila in enumerate(filas):
+            linea = " | ".join(valor.ljust(ancho)
+                               for valor, ancho in zip(fila, anchos))
+            self.text_resultados.insert(tk.END, linea + "\n")
+            if numero == 0:
+                self.text_resultados.insert(tk.END, "-" * len(linea) + "\n")
+        self.text_resultados.see(tk.END)
+
     def mostrar_resultado(self, nombre_prueba, resultado):
         """Mostrar resultado de una prueba en el área de texto de resumen"""
         self.text_resultados.insert(tk.END, f"\n{nombre_prueba}\n")
@@ -523,6 +923,9 @@ class InterfazPrincipal:
         if 'p_valor' in resultado:
             self.text_resultados.insert(
                 tk.END, f"P-valor: {resultado['p_valor']:.6f}\n")
+        if 'transformacion' in resultado:
+            self.text_resultados.insert(
+                tk.END, f"Transformación: {resultado['transformacion']}\n")
 
         # Resultado de la prueba
         if resultado['rechaza_h0']:
@@ -604,6 +1007,51 @@ class InterfazPrincipal:
             messagebox.showinfo(
                 "Información", "La prueba de Longitud Rachas Encima/Debajo no ha sido ejecutada o no se pudo cargar.")
 
+    def mostrar_detalle_poker(self):
+        """Muestra la ventana de detalle para la prueba de Póker."""
+        if 'poker' in self.instancias_pruebas and self.instancias_pruebas['poker'] is not None:
+            self.instancias_pruebas['poker'].mostrar_tabla_detallada(
+                parent=self.root)
+        else:
+            messagebox.showinfo(
+                "Información", "La prueba de Póker no ha sido ejecutada o no se pudo cargar.")
+
+    def mostrar_detalle_max_asc(self):
+        """Muestra la ventana de detalle para la prueba de racha máxima ascendente/descendente."""
+        if 'racha_maxima_asc' in self.instancias_pruebas and self.instancias_pruebas['racha_maxima_asc'] is not None:
+            self.instancias_pruebas['racha_maxima_asc'].mostrar_tabla_detallada(
+                parent=self.root)
+        else:
+            messagebox.showinfo(
+                "Información", "La prueba de Racha Máxima Asc/Desc no ha sido ejecutada.")
+
+    def mostrar_detalle_max_enc(self):
+        """Muestra la ventana de detalle para la prueba de racha máxima encima/debajo."""
+        if 'racha_maxima_enc' in self.instancias_pruebas and self.instancias_pruebas['racha_maxima_enc'] is not None:
+            self.instancias_pruebas['racha_maxima_enc'].mostrar_tabla_detallada(
+                parent=self.root)
+        else:
+            messagebox.showinfo(
+                "Información", "La prueba de Racha Máxima Enc/Deb no ha sido ejecutada.")
+
+    def mostrar_detalle_ad(self):
+        """Muestra la ventana de detalle para la prueba de Anderson-Darling."""
+        if 'anderson_darling' in self.instancias_pruebas and self.instancias_pruebas['anderson_darling'] is not None:
+            self.instancias_pruebas['anderson_darling'].mostrar_tabla_detallada(
+                parent=self.root)
+        else:
+            messagebox.showinfo(
+                "Información", "La prueba de Anderson-Darling no ha sido ejecutada.")
+
+    def mostrar_detalle_cvm(self):
+        """Muestra la ventana de detalle para la prueba de Cramér-von Mises."""
+        if 'cramer_von_mises' in self.instancias_pruebas and self.instancias_pruebas['cramer_von_mises'] is not None:
+            self.instancias_pruebas['cramer_von_mises'].mostrar_tabla_detallada(
+                parent=self.root)
+        else:
+            messagebox.showinfo(
+                "Información", "La prueba de Cramér-von Mises no ha sido ejecutada.")
+
     def generar_pdf(self):
         """Generar reporte PDF con los resultados"""
         if not self.resultados:
@@ -637,7 +1085,7 @@ class InterfazPrincipal:
             Desviación estándar: {np.std(self.datos):.6f}<br/>
             Mínimo: {np.min(self.datos):.6f}<br/>
             Máximo: {np.max(self.datos):.6f}<br/>
-            Nivel de significancia: {self.var_alpha.get()}
+            Nivel(es) de significancia: {', '.join(f"{a:g}" for a in self.alphas)}
             """
 
             story.append(Paragraph(info_datos, styles['Normal']))
@@ -652,6 +1100,11 @@ class InterfazPrincipal:
                     'rachas_encima_debajo': "Rachas Encima/Debajo",
                     'longitud_rachas_asc': "Longitud Rachas Ascendentes/Descendentes",
                     'longitud_rachas_enc': "Longitud Rachas Encima/Debajo",
+                    'poker': "Póker",
+                    'racha_maxima_asc': "Racha Máxima Ascendente/Descendente",
+                    'racha_maxima_enc': "Racha Máxima Encima/Debajo",
+                    'anderson_darling': "Anderson-Darling",
+                    'cramer_von_mises': "Cramér-von Mises",
                 }
                 titulo_prueba = display_name_map.get(
                     nombre_clave_prueba, nombre_clave_prueba.replace('_', ' ').title())
@@ -669,6 +1122,9 @@ class InterfazPrincipal:
                 if 'p_valor' in resultado_summary:
                     datos_tabla.append(
                         ['P-valor', f"{resultado_summary['p_valor']:.6f}"])
+                if 'transformacion' in resultado_summary:
+                    datos_tabla.append(
+                        ['Transformación', resultado_summary['transformacion']])
 
                 if resultado_summary['rechaza_h0']:
                     decision = "Se rechaza H0"
@@ -695,6 +1151,29 @@ class InterfazPrincipal:
                 story.append(tabla)
                 story.append(Spacer(1, 20))
 
+            # Grilla compacta de decisiones alpha x prueba
+            filas_grilla = self.construir_grilla_alphas()
+            if filas_grilla:
+                story.append(Paragraph(
+                    "Decisiones por nivel de significancia", styles['Heading2']))
+                tabla_grilla = Table(filas_grilla)
+                estilo_grilla = [
+                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                    ('FONTSIZE', (0, 0), (-1, -1), 9),
+                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+                ]
+                for fila_idx, fila in enumerate(filas_grilla[1:], start=1):
+                    for col_idx, valor in enumerate(fila[1:], start=1):
+                        color = colors.salmon if valor == "Rechaza" else colors.lightgreen
+                        estilo_grilla.append(
+                            ('BACKGROUND', (col_idx, fila_idx), (col_idx, fila_idx), color))
+                tabla_grilla.setStyle(TableStyle(estilo_grilla))
+                story.append(tabla_grilla)
+                story.append(Spacer(1, 20))
+
             doc.build(story)
 
             messagebox.showinfo(
@@ -0,0 +1,102 @@
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from operator import attrgetter
+
+import numpy as np
+
+# Resultados que se conservan como máximo (se descarta el usado hace más tiempo)
+MAX_RESULTADOS = 32
+
+
+def huella_datos(datos):
+    """sha256 de los valores (como float64), para reconocer el mismo conjunto de datos"""
+    valores = np.ascontiguousarray(datos, dtype=np.float64)
+    return hashlib.sha256(memoryview(valores).cast('B')).hexdigest()
+
+
+def describir_parametro(valor):
+    """Valor hashable que identifica un parámetro (las distribuciones congeladas por familia y argumentos)"""
+    if hasattr(valor, 'dist') and hasattr(valor, 'kwds'):
+        return (valor.dist.name, valor.args, tuple(sorted(valor.kwds.items())))
+    if isinstance(valor, np.ndarray):
+        return huella_datos(valor)
+    return valor
+
+
+class MemoriaResultados:
+    """
+    Resultados de ejecutar() por (prueba, huella de los datos, parámetros)
+    con descarte LRU. Se entrega una copia del diccionario para que quien
+    lo complete (por ejemplo con 'decisiones_alpha') no altere el guardado.
+    """
+
+    def __init__(self, maximo=MAX_RESULTADOS):
+        self.maximo = maximo
+        self.activa = True
+        self.resultados = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """Copia del resultado guardado, o None"""
+        resultado = self.resultados.get(clave)
+        if resultado is None:
+            self.fallos += 1
+            return None
+        self.resultados.move_to_end(clave)
+        self.aciertos += 1
+        return dict(resultado)
+
+    def guardar(self, clave, resultado):
+        self.resultados[clave] = dict(resultado)
+        self.resultados.move_to_end(clave)
+        while len(self.resultados) > self.maximo:
+            self.resultados.popitem(last=False)
+
+    def limpiar(self):
+        self.resultados.clear()
+
+
+MEMORIA = MemoriaResultados()
+
+
+@contextmanager
+def memoria_desactivada():
+    """Ejecuciones que no se van a repetir (réplicas, baterías): sin calcular huellas ni guardar"""
+    activa, MEMORIA.activa = MEMORIA.activa, False
+    try:
+        yield
+    finally:
+        MEMORIA.activa = activa
+
+
+def memorizar(*parametros, datos='datos'):
+    """
+    Decorador para ejecutar(): si la misma prueba ya se ejecutó sobre los
+    mismos datos con los mismos parámetros se retorna ese resultado. La
+    huella de los datos se calcula una vez por instancia.
+
+    :param parametros: Atributos de la instancia que cambian el resultado.
+    :param datos: Atributo (puede ser 'vista.ordenados') con los datos.
+    """
+    obtener_datos = attrgetter(datos)
+
+    def decorador(ejecutar):
+        @wraps(ejecutar)
+        def envoltura(self):
+            if not MEMORIA.activa:
+                return ejecutar(self)
+            if '_huella_memoria' not in self.__dict__:
+                self._huella_memoria = huella_datos(obtener_datos(self))
+            clave = (type(self).__qualname__, self._huella_memoria,
+                     tuple(describir_parametro(getattr(self, nombre)) for nombre in parametros))
+            resultado = MEMORIA.obtener(clave)
+            if resultado is None:
+                resultado = ejecutar(self)
+                MEMORIA.guardar(clave, resultado)
+                resultado = dict(resultado)
+            return resultado
+        return envoltura
+    return decorador
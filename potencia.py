@@ -0,0 +1,329 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.signal import lfilter
+
+from bateria import PRUEBAS, normalizar_prueba, resumir_resultado
+from fuentes import FuenteCongruencial
+from memoria import memoria_desactivada
+
+# Máximo de números (réplicas x n) que se generan a la vez en un lote
+MAX_ELEMENTOS_LOTE = 1 << 22
+
+# Réplicas por ronda; tras cada ronda se revisa si las bandas ya son angostas
+REPLICAS_RONDA = 200
+
+# Réplicas por sublote con semilla propia; no depende de los procesos, así
+# que el resultado es el mismo con cualquier cantidad
+REPLICAS_SUBLOTE = 25
+
+
+def _uniforme(rng, replicas, n):
+    """H0: U(0, 1) independientes (la potencia estimada debe ser alpha)"""
+    return rng.random((replicas, n))
+
+
+def _sesgo(rng, replicas, n, sesgo=0.05):
+    """Salida sesgada hacia 0: u^(1 + sesgo)"""
+    return rng.random((replicas, n)) ** (1 + sesgo)
+
+
+def _correlacion(rng, replicas, n, rho=0.05):
+    """Valores consecutivos correlacionados: cópula gaussiana de un AR(1) con correlación rho"""
+    ruido = rng.standard_normal((replicas, n))
+    # El primer valor con varianza 1 / (1 - rho²) deja el proceso estacionario desde el inicio
+    ruido[:, 0] /= np.sqrt(1 - rho ** 2)
+    z = lfilter([np.sqrt(1 - rho ** 2)], [1, -rho], ruido, axis=1)
+    return stats.norm.cdf(z)
+
+
+def _periodo_corto(rng, replicas, n, periodo=1000):
+    """Secuencia que se repite cada `periodo` valores"""
+    ciclo = rng.random((replicas, periodo))
+    return np.tile(ciclo, (1, -(-n // periodo)))[:, :n]
+
+
+def _lcg(rng, replicas, n, a=25173, c=13849, m=2 ** 16):
+    """Generador congruencial de módulo pequeño, con una semilla al azar por réplica"""
+    A, C = FuenteCongruencial(1, a, c, m).coeficientes_salto(n)
+    semillas = rng.integers(0, m, size=(replicas, 1), dtype=np.uint64)
+    return ((A * semillas + C) % np.uint64(m)) / m
+
+
+# Alternativas simulables: nombre -> (función, parámetros por defecto)
+ALTERNATIVAS = {
+    'uniforme': (_uniforme, {}),
+    'sesgo': (_sesgo, {'sesgo': 0.05}),
+    'correlacion': (_correlacion, {'rho': 0.05}),
+    'periodo_corto': (_periodo_corto, {'periodo': 1000}),
+    'lcg': (_lcg, {'a': 25173, 'c': 13849, 'm': 2 ** 16}),
+}
+
+
+def _p_chi_cuadrado(u, num_intervalos=10):
+    """Chi² con intervalos iguales de [0, 1), una réplica por fila"""
+    replicas, n = u.shape
+    celdas = np.minimum((u * num_intervalos).astype(np.int64), num_intervalos - 1)
+    celdas += np.arange(replicas)[:, None] * num_intervalos
+    observadas = np.bincount(celdas.ravel(), minlength=replicas * num_intervalos).reshape(replicas, -1)
+    esperada = n / num_intervalos
+    chi2 = np.sum((observadas - esperada) ** 2, axis=1) / esperada
+    return stats.chi2.sf(chi2, num_intervalos - 1)
+
+
+def _p_kolmogorov_smornov(u):
+    """D de K-S exacto y p-valor kstwo, una réplica por fila (como PruebaKS, sobre los datos normalizados)"""
+    n = u.shape[1]
+    ordenados = np.sort(u, axis=1)
+    minimo, maximo = ordenados[:, :1], ordenados[:, -1:]
+    ordenados = (ordenados - minimo) / (maximo - minimo)
+    i = np.arange(1, n + 1)
+    d = np.maximum(np.max(i / n - ordenados, axis=1), np.max(ordenados - (i - 1) / n, axis=1))
+    return stats.kstwo.sf(d, n)
+
+
+def _p_rachas_encima_debajo(u):
+    """Número de rachas respecto a 0.5 con la aproximación normal de RachasEncimaDebajo"""
+    n = u.shape[1]
+    signos = u >= 0.5
+    n1 = np.count_nonzero(signos, axis=1).astype(float)
+    n2 = n - n1
+    rachas = 1 + np.count_nonzero(signos[:, 1:] != signos[:, :-1], axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = 2 * n1 * n2 / n + 1
+        varianza = 2 * n1 * n2 * (2 * n1 * n2 - n) / (n ** 2 * (n - 1))
+        p = 2 * stats.norm.sf(np.abs(rachas - media) / np.sqrt(varianza))
+    # Sin valores a un lado del umbral la prueba no se puede hacer
+    return np.where((n1 > 0) & (n2 > 0), p, np.nan)
+
+
+def _p_rachas_ascendentes_descendentes(u):
+    """Rachas de subidas y bajadas (los empates mantienen la dirección) como RachasAscendentesDescendentes"""
+    n = u.shape[1]
+    signos = np.sign(np.diff(u, axis=1))
+    ultimo = np.maximum.accumulate(np.where(signos != 0, np.arange(n - 1), 0), axis=1)
+    direcciones = np.take_along_axis(signos, ultimo, axis=1) >= 0
+    rachas = 1 + np.count_nonzero(direcciones[:, 1:] != direcciones[:, :-1], axis=1)
+    z = np.abs(rachas - (2 * n - 1) / 3) / np.sqrt((16 * n - 29) / 90)
+    return 2 * stats.norm.sf(z)
+
+
+# Pruebas con versión por lotes (todas las réplicas a la vez); el resto se
+# ejecuta réplica por réplica con su clase de PRUEBAS
+P_VALORES_LOTE = {
+    'chi_cuadrado': _p_chi_cuadrado,
+    'kolmogorov_smornov': _p_kolmogorov_smornov,
+    'rachas_encima_debajo': _p_rachas_encima_debajo,
+    'rachas_ascendentes_descendentes': _p_rachas_ascendentes_descendentes,
+}
+
+
+def p_valores(clave, parametros, u, alpha=0.05):
+    """P-valores de una prueba sobre cada fila de u (NaN si la prueba no se pudo hacer)"""
+    if clave in P_VALORES_LOTE:
+        return P_VALORES_LOTE[clave](u, **parametros)
+    clase = PRUEBAS[clave][0]
+    salida = np.full(u.shape[0], np.nan)
+    # Cada réplica se evalúa una sola vez: sin memoria de resultados
+    with memoria_desactivada():
+        for fila, datos in enumerate(u):
+            try:
+                resultado = clase(datos, alpha=alpha, **parametros).ejecutar()
+            except Exception:
+                continue
+            p = resumir_resultado(clave, resultado)['p_valor']
+            salida[fila] = np.nan if p is None else p
+    return salida
+
+
+def _simular_lote(alternativa, parametros, n, pruebas, alpha, semilla, replicas):
+    """
+    Simula `replicas` secuencias de la alternativa y cuenta, por prueba,
+    (rechazos, réplicas válidas). Se ejecuta en un proceso del pool.
+    """
+    rng = np.random.default_rng(semilla)
+    funcion = ALTERNATIVAS[alternativa][0]
+    conteos = {clave: [0, 0] for clave, _ in pruebas}
+    por_lote = max(1, MAX_ELEMENTOS_LOTE // n)
+    for inicio in range(0, replicas, por_lote):
+        u = funcion(rng, min(por_lote, replicas - inicio), n, **parametros)
+        for clave, parametros_prueba in pruebas:
+            p = p_valores(clave, parametros_prueba, u, alpha)
+            validos = ~np.isnan(p)
+            conteos[clave][0] += int(np.count_nonzero(p[validos] < alpha))
+            conteos[clave][1] += int(np.count_nonzero(validos))
+    return conteos
+
+
+def intervalo_wilson(rechazos, total, confianza=0.95):
+    """Intervalo de Wilson para una proporción (NaN si no hay réplicas)"""
+    rechazos = np.asarray(rechazos, dtype=float)
+    total = np.asarray(total, dtype=float)
+    z = stats.norm.ppf(0.5 + confianza / 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = rechazos / total
+        centro = (p + z ** 2 / (2 * total)) / (1 + z ** 2 / total)
+        radio = z * np.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / (1 + z ** 2 / total)
+    return centro - radio, centro + radio
+
+
+class AnalisisPotencia:
+    """
+    Estima por Monte Carlo la potencia (tasa de rechazo con p-valor < alpha)
+    de cada prueba frente a una alternativa para varios tamaños n. Las
+    réplicas se simulan por rondas repartidas entre procesos; la estimación
+    de un n se detiene cuando la banda de Wilson de todas las pruebas mide a
+    lo sumo 2 x precision, o al llegar a max_replicas.
+    """
+
+    def __init__(self, alternativa, tamanos, pruebas=tuple(P_VALORES_LOTE), parametros=None,
+                 alpha=0.05, confianza=0.95, precision=0.02, max_replicas=5000,
+                 semilla=0, procesos=None):
+        """
+        :param alternativa: Nombre de ALTERNATIVAS.
+        :param tamanos: Cantidades de números n a evaluar.
+        :param pruebas: Claves de PRUEBAS o pares (clave, parámetros).
+        :param parametros: Parámetros de la alternativa (sobre los de ALTERNATIVAS).
+        :param alpha: Nivel de significancia de cada prueba.
+        :param confianza: Nivel de confianza de las bandas de Wilson.
+        :param precision: Semiancho de banda con el que se detiene la simulación.
+        :param max_replicas: Réplicas máximas por tamaño.
+        :param semilla: Semilla de la simulación (reproducible con cualquier número de procesos).
+        :param procesos: Procesos del pool (None = núcleos disponibles, 1 = sin pool).
+        """
+        if alternativa not in ALTERNATIVAS:
+            raise ValueError(f"Alternativa desconocida: {alternativa}")
+        self.alternativa = alternativa
+        self.parametros = {**ALTERNATIVAS[alternativa][1], **(parametros or {})}
+        self.tamanos = sorted(int(n) for n in tamanos)
+        self.pruebas = [normalizar_prueba(prueba) for prueba in pruebas]
+        for clave, _ in self.pruebas:
+            if getattr(PRUEBAS[clave][0], 'usa_enteros', False):
+                raise ValueError(f"La prueba {clave} usa enteros y las alternativas generan U(0, 1).")
+        self.alpha = alpha
+        self.confianza = confianza
+        self.precision = precision
+        self.max_replicas = max_replicas
+        self.semilla = semilla
+        self.procesos = procesos
+
+    def _rondas(self, n, pool, lotes):
+        """Conteos acumulados para un n, ronda a ronda hasta que las bandas sean angostas"""
+        totales = {clave: [0, 0] for clave, _ in self.pruebas}
+        simuladas = ronda = 0
+        while simuladas < self.max_replicas:
+            replicas = min(REPLICAS_RONDA, self.max_replicas - simuladas)
+            # Cada sublote tiene su propia semilla derivada de (semilla, n, ronda, sublote)
+            argumentos = [(self.alternativa, self.parametros, n, self.pruebas, self.alpha,
+                           [self.semilla, n, ronda, sublote], min(REPLICAS_SUBLOTE, replicas - inicio))
+                          for sublote, inicio in enumerate(range(0, replicas, REPLICAS_SUBLOTE))]
+            if pool is None:
+                conteos = [_simular_lote(*args) for args in argumentos]
+            else:
+                # Los sublotes se reparten en `lotes` tandas, una por proceso
+                conteos = list(pool.map(_simular_lote, *zip(*argumentos),
+                                        chunksize=-(-len(argumentos) // lotes)))
+            for conteo in conteos:
+                for clave, (rechazos, validos) in conteo.items():
+                    totales[clave][0] += rechazos
+                    totales[clave][1] += validos
+            simuladas += replicas
+            ronda += 1
+
+            rechazos, validos = np.array(list(totales.values())).T
+            inferior, superior = intervalo_wilson(rechazos, validos, self.confianza)
+            if np.all(validos > 0) and np.all((superior - inferior) / 2 <= self.precision):
+                break
+        return totales, simuladas
+
+    def ejecutar(self):
+        """DataFrame con potencia y banda de confianza por (n, prueba)"""
+        filas = []
+        pool = None
+        if self.procesos != 1:
+            pool = ProcessPoolExecutor(max_workers=self.procesos)
+        try:
+            lotes = 1 if pool is None else (self.procesos or os.cpu_count() or 1)
+            for n in self.tamanos:
+                totales, simuladas = self._rondas(n, pool, lotes)
+                for clave, (rechazos, validos) in totales.items():
+                    inferior, superior = intervalo_wilson(rechazos, validos, self.confianza)
+                    filas.append({
+                        'alternativa': self.alternativa, 'n': n, 'prueba': clave,
+                        'replicas': simuladas, 'validas': validos,
+                        'potencia': rechazos / validos if validos else np.nan,
+                        'inferior': float(inferior), 'superior': float(superior),
+                    })
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return pd.DataFrame(filas)
+
+    @staticmethod
+    def n_minimo(tabla, potencia_objetivo=0.8):
+        """Menor n en que la cota inferior de la potencia alcanza el objetivo, por prueba (NaN si ninguno)"""
+        alcanzados = tabla[tabla['inferior'] >= potencia_objetivo]
+        return (alcanzados.groupby('prueba')['n'].min()
+                .reindex(tabla['prueba'].unique()).rename('n_minimo'))
+
+    @staticmethod
+    def crear_grafico(tabla, ax=None):
+        """Curvas de potencia contra n con sus bandas de confianza"""
+        if ax is None:
+            _, ax = plt.subplots(figsize=(8, 5))
+        for prueba, grupo in tabla.groupby('prueba', sort=False):
+            linea, = ax.plot(grupo['n'], grupo['potencia'], marker='o', label=prueba)
+            ax.fill_between(grupo['n'], grupo['inferior'], grupo['superior'],
+                            color=linea.get_color(), alpha=0.2)
+        ax.axhline(0.8, color='gray', linestyle=':')
+        ax.set_xscale('log')
+        ax.set_ylim(0, 1)
+        ax.set_xlabel('n')
+        ax.set_ylabel('Tasa de rechazo')
+        ax.set_title(f"Potencia frente a '{tabla['alternativa'].iloc[0]}'" if not tabla.empty else 'Potencia')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        return ax
+
+
+def main():
+    """Análisis de potencia desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Potencia de las pruebas frente a una alternativa")
+    parser.add_argument('alternativa', choices=list(ALTERNATIVAS))
+    parser.add_argument('--parametro', action='append', default=[], metavar='CLAVE=VALOR',
+                        help="Parámetro de la alternativa, por ejemplo rho=0.1")
+    parser.add_argument('--n', nargs='+', type=int, default=[100, 1000, 10000])
+    parser.add_argument('--pruebas', nargs='+', default=list(P_VALORES_LOTE), choices=list(PRUEBAS))
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--precision', type=float, default=0.02)
+    parser.add_argument('--max-replicas', type=int, default=5000)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--grafico', help="Archivo donde guardar las curvas de potencia")
+    args = parser.parse_args()
+
+    parametros = {}
+    for par in args.parametro:
+        clave, _, valor = par.partition('=')
+        parametros[clave] = float(valor) if '.' in valor or 'e' in valor else int(valor)
+
+    analisis = AnalisisPotencia(args.alternativa, args.n, args.pruebas, parametros, args.alpha,
+                                precision=args.precision, max_replicas=args.max_replicas,
+                                semilla=args.semilla, procesos=args.procesos)
+    tabla = analisis.ejecutar()
+    print(tabla.to_string(index=False, float_format='{:.4f}'.format))
+    print("\nn mínimo para potencia 0.8")
+    print("=" * 30)
+    print(AnalisisPotencia.n_minimo(tabla).to_string())
+    if args.grafico:
+        ax = AnalisisPotencia.crear_grafico(tabla)
+        ax.figure.savefig(args.grafico)
+
+
+if __name__ == "__main__":
+    main()
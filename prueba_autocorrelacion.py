@@ -0,0 +1,335 @@
+import numpy as np
+from scipy import fft, stats
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Tamaño de bloque al procesar un array completo
+TAMANO_BLOQUE = 1 << 20
+
+# Filas máximas en la tabla detallada y puntos máximos por curva en el gráfico
+MAX_FILAS_TABLA = 1000
+MAX_PUNTOS_GRAFICO = 2000
+
+
+def sumas_rezagadas(datos, max_lag):
+    """
+    Sumas de productos rezagados S_k = sum_i x_i * x_{i+k} para k = 0..max_lag
+    vía FFT en O(n log n). El relleno con ceros hasta n + max_lag evita que la
+    correlación circular mezcle el final con el inicio.
+    """
+    datos = np.asarray(datos, dtype=float)
+    n = datos.size
+    sumas = np.zeros(max_lag + 1)
+    if n == 0:
+        return sumas
+    nfft = fft.next_fast_len(n + max_lag, real=True)
+    espectro = fft.rfft(datos, nfft)
+    correlacion = fft.irfft(espectro * np.conj(espectro), nfft)
+    hasta = min(max_lag, n - 1) + 1
+    sumas[:hasta] = correlacion[:hasta]
+    return sumas
+
+
+def reducir_puntos(valores, max_puntos=MAX_PUNTOS_GRAFICO):
+    """
+    Índices representativos para graficar muchos puntos: se divide en
+    max_puntos tramos y de cada uno se toma el de mayor valor absoluto,
+    de modo que los picos no se pierden.
+    """
+    valores = np.asarray(valores)
+    if valores.size <= max_puntos:
+        return np.arange(valores.size)
+    tramos = np.array_split(np.arange(valores.size), max_puntos)
+    return np.array([tramo[np.argmax(np.abs(valores[tramo]))] for tramo in tramos])
+
+
+class PruebaAutocorrelacion:
+    """
+    Prueba de autocorrelación para todos los rezagos k = 1..L a la vez.
+    Para cada rezago se calcula r_k, su estadístico Z y su p-valor bilateral;
+    la decisión global usa el estadístico de Ljung-Box
+    Q = n(n+2) sum r_k^2 / (n-k), que bajo H0 sigue una Chi-cuadrado con L gl.
+
+    Admite modo por bloques: se crea la prueba sin datos y se llama a
+    actualizar(bloque) por cada bloque. Se acumulan las sumas rezagadas
+    crudas y se guardan los primeros y últimos L datos, lo que basta para
+    corregir por la media de forma exacta al final.
+    """
+
+    def __init__(self, datos=None, max_lag=20, alpha=0.05):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números (opcional en modo por bloques).
+        :param max_lag: Rezago máximo L.
+        :param alpha: Nivel de significancia para la prueba.
+        """
+        if max_lag < 1:
+            raise ValueError("El rezago máximo debe ser al menos 1.")
+
+        self.max_lag = int(max_lag)
+        self.alpha = alpha
+
+        # Estado acumulado
+        self.n = 0
+        self.suma = 0.0
+        self.sumas = np.zeros(self.max_lag + 1)
+        self.cabeza = np.empty(0)
+        self.cola = np.empty(0)
+        # Desplazamiento fijado con el primer bloque para evitar cancelaciones
+        self.desplazamiento = None
+
+        if datos is not None:
+            datos = np.asarray(datos, dtype=float)
+            for inicio in range(0, datos.size, TAMANO_BLOQUE):
+                self.actualizar(datos[inicio:inicio + TAMANO_BLOQUE])
+
+    def actualizar(self, bloque):
+        """Acumula las sumas rezagadas de un bloque en O(m log m)."""
+        bloque = np.asarray(bloque, dtype=float)
+        if bloque.size == 0:
+            return
+        if self.desplazamiento is None:
+            self.desplazamiento = float(bloque.mean())
+        bloque = bloque - self.desplazamiento
+
+        # Los productos que cruzan el borde se obtienen anteponiendo la cola
+        # anterior; los que caen dentro de la cola ya estaban contados
+        extendido = np.concatenate((self.cola, bloque))
+        self.sumas += sumas_rezagadas(extendido, self.max_lag)
+        self.sumas -= sumas_rezagadas(self.cola, self.max_lag)
+
+        self.n += bloque.size
+        self.suma += float(bloque.sum())
+        if self.cabeza.size < self.max_lag:
+            self.cabeza = np.concatenate(
+                (self.cabeza, bloque[:self.max_lag - self.cabeza.size]))
+        self.cola = extendido[-self.max_lag:].copy()
+
+    def calcular_covarianzas(self):
+        """
+        Sumas C_k = sum_{i=1}^{n-k} (x_i - m)(x_{i+k} - m), k = 0..L, desarrolladas como
+        S_k - m (sum de los primeros n-k + sum de los últimos n-k) + (n-k) m^2.
+        """
+        L = self.max_lag
+        k = np.arange(L + 1)
+        media = self.suma / self.n
+
+        # Sumas acumuladas de los últimos y primeros k datos (k = 0..L)
+        suma_ultimos = np.concatenate(([0.0], np.cumsum(self.cola[::-1])))
+        suma_primeros = np.concatenate(([0.0], np.cumsum(self.cabeza)))
+        suma_sin_final = self.suma - suma_ultimos
+        suma_sin_inicio = self.suma - suma_primeros
+
+        covarianzas = (self.sumas
+                       - media * (suma_sin_final + suma_sin_inicio)
+                       + (self.n - k) * media ** 2)
+        return covarianzas
+
+    def ejecutar(self):
+        """
+        Ejecuta la prueba con los datos procesados hasta el momento.
+        """
+        n = self.n
+        L = self.max_lag
+        if n <= L + 1:
+            return {
+                'error': f'Se necesitan más de {L + 1} datos para {L} rezagos (n = {n}).'
+            }
+
+        covarianzas = self.calcular_covarianzas()
+        if covarianzas[0] <= 0:
+            return {
+                'error': 'Los datos son constantes; la autocorrelación no está definida.'
+            }
+
+        rezagos = np.arange(1, L + 1)
+        autocorrelaciones = covarianzas[1:] / covarianzas[0]
+
+        # Varianza de r_k bajo H0 consistente con Ljung-Box
+        errores_estandar = np.sqrt((n - rezagos) / (n * (n + 2.0)))
+        z = autocorrelaciones / errores_estandar
+        p_valores = 2 * stats.norm.sf(np.abs(z))
+
+        q_ljung_box = float(np.sum(z ** 2))
+        valor_critico = stats.chi2.ppf(1 - self.alpha, L)
+        p_valor = stats.chi2.sf(q_ljung_box, L)
+
+        z_critico = stats.norm.ppf(1 - self.alpha / 2)
+
+        resultado = {
+            'estadistico': q_ljung_box,
+            'grados_libertad': L,
+            'valor_critico': valor_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': q_ljung_box > valor_critico,
+            'tipo_prueba': f'Autocorrelación (L={L})',
+            'alpha': self.alpha,
+            'n_total': n,
+            'rezagos': rezagos,
+            'autocorrelaciones': autocorrelaciones,
+            'estadisticos_z': z,
+            'p_valores': p_valores,
+            'bandas': z_critico * errores_estandar,
+            'rezagos_significativos': int(np.count_nonzero(np.abs(z) > z_critico))
+        }
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico de Ljung-Box ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba de autocorrelación"""
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Autocorrelación")
+        ventana.geometry("900x700")
+
+        resultado = self.ejecutar()
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        titulo = ttk.Label(main_frame, text="Prueba de Autocorrelación - Tabla Detallada",
+                           font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        if 'error' in resultado:
+            ttk.Label(main_frame, text=resultado['error'], foreground="red").grid(
+                row=1, column=0, sticky=tk.W)
+            return ventana
+
+        # Crear tabla
+        columns = ('Rezago', 'r_k', 'Z', 'P-valor', 'Banda ±')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=120, anchor='center')
+
+        filas = min(len(resultado['rezagos']), MAX_FILAS_TABLA)
+        for i in range(filas):
+            tree.insert('', 'end', values=(
+                resultado['rezagos'][i],
+                f"{resultado['autocorrelaciones'][i]:.6f}",
+                f"{resultado['estadisticos_z'][i]:.4f}",
+                f"{resultado['p_valores'][i]:.6f}",
+                f"{resultado['bandas'][i]:.6f}"
+            ))
+
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"Q de Ljung-Box: {resultado['estadistico']:.6f}").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Rezagos fuera de la banda: {resultado['rezagos_significativos']} de {resultado['grados_libertad']}").grid(row=4, column=0, sticky=tk.W)
+        if filas < len(resultado['rezagos']):
+            ttk.Label(frame_resultados, text=f"(Se muestran los primeros {filas} rezagos)").grid(row=5, column=0, sticky=tk.W)
+
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                   foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=6, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_autocorrelacion(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_autocorrelacion(self, parent, resultado):
+        """Crear gráfico de autocorrelaciones y p-valores por rezago"""
+        frame_grafico = ttk.LabelFrame(parent, text="Autocorrelación por Rezago", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+
+        # Con muchos rezagos se grafica el de mayor |r_k| de cada tramo
+        indices = reducir_puntos(resultado['autocorrelaciones'])
+        rezagos = resultado['rezagos'][indices]
+        autocorrelaciones = resultado['autocorrelaciones'][indices]
+        bandas = resultado['bandas'][indices]
+        p_valores = resultado['p_valores'][indices]
+        fuera = np.abs(autocorrelaciones) > bandas
+
+        # Gráfico 1: r_k con bandas de confianza
+        ax1.vlines(rezagos, 0, autocorrelaciones, color='blue', alpha=0.7)
+        ax1.plot(rezagos[fuera], autocorrelaciones[fuera], 'o', color='red',
+                 label='Fuera de la banda')
+        ax1.plot(rezagos, bandas, 'r--', linewidth=1, label=f'Banda (α={self.alpha})')
+        ax1.plot(rezagos, -bandas, 'r--', linewidth=1)
+        ax1.axhline(y=0, color='black', linewidth=0.8)
+
+        ax1.set_xlabel('Rezago k')
+        ax1.set_ylabel('r_k')
+        ax1.set_title('Autocorrelaciones')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
+
+        # Gráfico 2: p-valores por rezago
+        ax2.semilogy(rezagos, np.maximum(p_valores, 1e-300), 'o', markersize=3,
+                     color='orange', alpha=0.7)
+        ax2.axhline(y=self.alpha, color='red', linestyle='--',
+                    label=f'α = {self.alpha}')
+
+        ax2.set_xlabel('Rezago k')
+        ax2.set_ylabel('P-valor')
+        ax2.set_title(f"P-valores (Ljung-Box Q = {resultado['estadistico']:.2f})")
+        ax2.legend()
+        ax2.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+
+def main():
+    """Función para probar el módulo independientemente"""
+    np.random.seed(42)
+    datos_test = np.random.uniform(0, 1, 10000)
+
+    prueba = PruebaAutocorrelacion(datos_test, max_lag=50, alpha=0.05)
+    resultado = prueba.ejecutar()
+
+    print("Prueba de Autocorrelación")
+    print("=" * 30)
+    print(f"Q de Ljung-Box: {resultado['estadistico']:.6f}")
+    print(f"Valor crítico: {resultado['valor_critico']:.6f}")
+    print(f"P-valor: {resultado['p_valor']:.6f}")
+    print(f"Rezagos fuera de la banda: {resultado['rezagos_significativos']}")
+    print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+import numpy as np
+from scipy import stats
+
+from utilidades_rachas import secuencia_umbral
+
+# Tamaño de bloque al procesar un array completo
+TAMANO_BLOQUE = 1 << 20
+
+# Longitud de bloque máxima (2^17 contadores para m + 1)
+MAX_LONGITUD_BLOQUE = 16
+
+# Patrones que se listan en la tabla detallada
+MAX_FILAS_TABLA = 1000
+
+
+def codigos_ventana(bits, longitud):
+    """
+    Código entero de cada ventana solapada de `longitud` bits: una ventana
+    rodante construida con desplazamientos y OR, una pasada por bit.
+    """
+    num_ventanas = bits.size - longitud + 1
+    if num_ventanas <= 0:
+        return np.empty(0, dtype=np.uint32)
+    codigos = np.zeros(num_ventanas, dtype=np.uint32)
+    for j in range(longitud):
+        codigos <<= 1
+        codigos |= bits[j:j + num_ventanas]
+    return codigos
+
+
+def phi(conteos, n):
+    """phi^(m) = sum pi log(pi) con pi = Ci / n (los patrones ausentes no aportan)."""
+    pi = conteos[conteos > 0] / n
+    return float(np.sum(pi * np.log(pi)))
+
+
+class PruebaEntropiaAproximada:
+    """
+    Prueba de entropía aproximada (ApEn, NIST SP 800-22) sobre la secuencia
+    binaria encima/debajo del umbral. Compara la frecuencia de los patrones
+    solapados de m y m+1 bits (con la secuencia tomada como circular):
+    ApEn(m) = phi^(m) - phi^(m+1) y chi² = 2n (ln 2 - ApEn) con 2^m gl.
+
+    Admite modo por bloques: se crea la prueba sin datos y se llama a
+    actualizar(bloque) por cada bloque; se conservan los últimos m bits
+    para las ventanas que cruzan el borde y los primeros m para cerrar el
+    círculo al final.
+    """
+
+    def __init__(self, datos=None, longitud_bloque=2, alpha=0.05, umbral=0.5):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números (opcional en modo por bloques).
+        :param longitud_bloque: Longitud m de los patrones (1 a 16).
+        :param alpha: Nivel de significancia para la prueba.
+        :param umbral: Umbral para la secuencia binaria.
+        """
+        if not 1 <= longitud_bloque <= MAX_LONGITUD_BLOQUE:
+            raise ValueError(
+                f"La longitud de bloque debe estar entre 1 y {MAX_LONGITUD_BLOQUE}.")
+
+        self.m = int(longitud_bloque)
+        self.alpha = alpha
+        self.umbral = umbral
+
+        # Estado acumulado: conteos de patrones de m+1 bits sin cerrar el círculo
+        self.conteos = np.zeros(1 << (self.m + 1), dtype=np.int64)
+        self.n_total = 0
+        self.cabeza = np.empty(0, dtype=bool)
+        self.cola = np.empty(0, dtype=bool)
+
+        if datos is not None:
+            datos = np.asarray(datos, dtype=float)
+            for inicio in range(0, datos.size, TAMANO_BLOQUE):
+                self.actualizar(datos[inicio:inicio + TAMANO_BLOQUE])
+
+    def actualizar(self, bloque):
+        """Cuenta las ventanas de m+1 bits que terminan en el bloque."""
+        bits = secuencia_umbral(np.asarray(bloque, dtype=float), self.umbral)
+        if bits.size == 0:
+            return
+
+        extendido = np.concatenate((self.cola, bits))
+        self.conteos += np.bincount(codigos_ventana(extendido, self.m + 1),
+                                    minlength=self.conteos.size)
+
+        self.n_total += bits.size
+        if self.cabeza.size < self.m:
+            self.cabeza = np.concatenate((self.cabeza, bits[:self.m - self.cabeza.size]))
+        self.cola = extendido[-self.m:].copy()
+
+    def conteos_circulares(self):
+        """
+        Conteos de los patrones de m+1 y de m bits sobre la secuencia circular.
+        Cada ventana de m bits es prefijo de la de m+1 que empieza en el mismo
+        lugar, así que sus conteos se obtienen sumando pares de patrones.
+        """
+        cierre = np.concatenate((self.cola, self.cabeza))
+        conteos_mayor = self.conteos + np.bincount(
+            codigos_ventana(cierre, self.m + 1), minlength=self.conteos.size)
+        conteos_m = conteos_mayor.reshape(-1, 2).sum(axis=1)
+        return conteos_m, conteos_mayor
+
+    def ejecutar(self):
+        """
+        Ejecuta la prueba con los datos procesados hasta el momento.
+        """
+        n = self.n_total
+        if n <= self.m + 1:
+            return {
+                'error': f'Se necesitan más de {self.m + 1} datos para bloques de longitud {self.m}.'
+            }
+
+        conteos_m, conteos_mayor = self.conteos_circulares()
+        phi_m = phi(conteos_m, n)
+        phi_mayor = phi(conteos_mayor, n)
+        apen = phi_m - phi_mayor
+
+        chi_cuadrado_calculado = 2 * n * (np.log(2) - apen)
+        grados_libertad = 1 << self.m
+
+        valor_critico = stats.chi2.ppf(1 - self.alpha, grados_libertad)
+        p_valor = stats.chi2.sf(chi_cuadrado_calculado, grados_libertad)
+
+        resultado = {
+            'estadistico': chi_cuadrado_calculado,
+            'grados_libertad': grados_libertad,
+            'valor_critico': valor_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': chi_cuadrado_calculado > valor_critico,
+            'tipo_prueba': f'Entropía Aproximada (m={self.m})',
+            'alpha': self.alpha,
+            'n_total': n,
+            'longitud_bloque': self.m,
+            'phi_m': phi_m,
+            'phi_m_mas_1': phi_mayor,
+            'apen': apen,
+            'conteos_m': conteos_m,
+            'conteos_m_mas_1': conteos_mayor
+        }
+
+        # NIST recomienda m < log2(n) - 5
+        if self.m >= np.floor(np.log2(n)) - 5:
+            resultado['advertencia'] = (
+                f"Con n = {n} se recomienda m < {int(np.floor(np.log2(n)) - 5)}; "
+                "la aproximación Chi-cuadrado es poco confiable.")
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico Chi-cuadrado ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Muestra una ventana con la tabla detallada de la prueba."""
+        resultado = self.ejecutar()
+
+        if 'error' in resultado:
+            if parent:
+                messagebox.showerror("Error", resultado['error'])
+            else:
+                print(f"Error: {resultado['error']}")
+            return None
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Entropía Aproximada")
+        ventana.geometry("700x600")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de Entropía Aproximada (m={self.m})", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # --- Tabla de patrones de m bits ---
+        frame_conteos = ttk.LabelFrame(
+            main_frame, text=f"Patrones de {self.m} bits", padding="10")
+        frame_conteos.pack(fill=tk.BOTH, expand=True, pady=5)
+
+        cols = ('Patrón', 'Ci', 'πi = Ci/n', 'Esperado')
+        tree = ttk.Treeview(frame_conteos, columns=cols, show='headings', height=10)
+        scrollbar = ttk.Scrollbar(frame_conteos, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=140, anchor='center')
+
+        conteos_m = resultado['conteos_m']
+        esperado = resultado['n_total'] / conteos_m.size
+        for patron in range(min(conteos_m.size, MAX_FILAS_TABLA)):
+            tree.insert('', 'end', values=(
+                format(patron, f'0{self.m}b'), f"{conteos_m[patron]}",
+                f"{conteos_m[patron] / resultado['n_total']:.6f}", f"{esperado:.2f}"))
+        if conteos_m.size > MAX_FILAS_TABLA:
+            tree.insert('', 'end', values=(
+                f"... {conteos_m.size - MAX_FILAS_TABLA} patrones más", "-", "-", "-"))
+
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # --- Resultados ---
+        frame_resultados = ttk.LabelFrame(
+            main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados,
+                  text=f"φ(m) = {resultado['phi_m']:.6f}   φ(m+1) = {resultado['phi_m_mas_1']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"ApEn(m) = {resultado['apen']:.6f}   (máximo ln 2 = {np.log(2):.6f})").pack(anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"Estadístico Chi-cuadrado (χ²): {resultado['estadistico']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico (α={self.alpha}): {resultado['valor_critico']:.6f}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"P-valor: {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+        if 'advertencia' in resultado:
+            ttk.Label(frame_resultados, text=resultado['advertencia'],
+                      foreground="orange").pack(anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los datos NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los datos son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        return ventana
+
+
+def main():
+    """Función para probar el módulo independientemente."""
+    np.random.seed(0)
+    datos_test = np.random.rand(100000)
+
+    for m in (2, 5, 10):
+        prueba = PruebaEntropiaAproximada(datos_test, longitud_bloque=m, alpha=0.05)
+        resultado = prueba.ejecutar()
+        print(f"Entropía Aproximada (m={m})")
+        print(f"ApEn: {resultado['apen']:.6f}")
+        print(f"Chi-cuadrado: {resultado['estadistico']:.6f}")
+        print(f"P-valor: {resultado['p_valor']:.6f}")
+        print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = PruebaEntropiaAproximada(datos_test, longitud_bloque=2).mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from memoria import memoria_desactivada, memorizar
+from prueba_autocorrelacion import reducir_puntos
+from utilidades_rachas import secuencia_umbral
+
+# Fracción de picos que, bajo H0, queda por debajo del umbral T
+FRACCION_BAJO_UMBRAL = 0.95
+
+# Número de picos mayores que se reportan
+NUM_PICOS = 10
+
+
+class PruebaEspectral:
+    """
+    Prueba espectral (DFT) al estilo NIST SP 800-22 sobre la secuencia de
+    signos respecto al umbral (la misma de la prueba de rachas por encima y
+    por debajo), llevada a ±1.
+    Bajo H0 el 95% de los módulos |S_k|, k < n/2, queda por debajo de
+    T = sqrt(ln(1/0.05) n). Un período corto produce picos que rompen esa
+    proporción.
+
+    Con tamano_segmento la secuencia se divide en segmentos independientes
+    y se suman los conteos N1 y N0 de todos ellos, de modo que la memoria
+    queda acotada por el segmento y no por n.
+    """
+
+    def __init__(self, datos, alpha=0.05, umbral=0.5, precision_simple=False, tamano_segmento=None):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números.
+        :param alpha: Nivel de significancia para la prueba.
+        :param umbral: Umbral para la secuencia de signos.
+        :param precision_simple: Si es True la FFT se calcula en float32.
+        :param tamano_segmento: Longitud de cada segmento (None = toda la secuencia).
+        """
+        self.datos = np.asarray(datos)
+        self.alpha = alpha
+        self.umbral = umbral
+        self.precision_simple = precision_simple
+        self.n_total = len(self.datos)
+
+        if tamano_segmento is None:
+            tamano_segmento = self.n_total
+        self.tamano_segmento = int(tamano_segmento)
+
+        if self.tamano_segmento < 2 or self.n_total < self.tamano_segmento:
+            raise ValueError("Se necesitan al menos 2 datos por segmento para la prueba espectral.")
+
+    def _modulos_segmento(self, segmento):
+        """Módulos |S_k|, k = 0..m/2-1, de la DFT del segmento llevado a ±1."""
+        tipo = np.float32 if self.precision_simple else np.float64
+        signos = secuencia_umbral(segmento, self.umbral)
+        x = np.where(signos, tipo(1), tipo(-1))
+        return np.abs(np.fft.rfft(x)[:x.size // 2])
+
+    @memorizar('alpha', 'umbral', 'precision_simple', 'tamano_segmento')
+    def ejecutar(self):
+        """
+        Ejecuta la prueba espectral.
+        Retorna un diccionario con los resultados.
+        """
+        m = self.tamano_segmento
+        num_segmentos = self.n_total // m
+        umbral_picos = np.sqrt(np.log(1 / 0.05) * m)
+
+        N1 = 0
+        suma_modulos = np.zeros(m // 2)
+        for s in range(num_segmentos):
+            modulos = self._modulos_segmento(self.datos[s * m:(s + 1) * m])
+            N1 += int(np.count_nonzero(modulos < umbral_picos))
+            suma_modulos += modulos
+
+        # Valores esperados sumados sobre los segmentos
+        n_usados = num_segmentos * m
+        N0 = FRACCION_BAJO_UMBRAL * num_segmentos * (m // 2)
+        varianza = n_usados * FRACCION_BAJO_UMBRAL * (1 - FRACCION_BAJO_UMBRAL) / 4
+        z_calculado = (N1 - N0) / np.sqrt(varianza)
+
+        z_critico = stats.norm.ppf(1 - self.alpha / 2)
+        p_valor = 2 * stats.norm.sf(abs(z_calculado))
+
+        # Espectro promedio y picos más altos (el índice 0 es la componente continua)
+        espectro = suma_modulos / num_segmentos
+        candidatos = np.argsort(espectro[1:])[::-1][:NUM_PICOS] + 1
+        picos = pd.DataFrame({
+            'Frecuencia k': candidatos,
+            'Período m/k': m / candidatos,
+            '|S_k| promedio': espectro[candidatos]
+        })
+
+        resultado = {
+            'picos_bajo_umbral': N1,
+            'picos_esperados': N0,
+            'picos_sobre_umbral': num_segmentos * (m // 2) - N1,
+            'umbral_picos': umbral_picos,
+            'estadistico_z': z_calculado,
+            'valor_critico_z': z_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': abs(z_calculado) > z_critico,
+            'tipo_prueba': 'Espectral (DFT)',
+            'alpha': self.alpha,
+            'n_total_datos': self.n_total,
+            'n_usados': n_usados,
+            'tamano_segmento': m,
+            'num_segmentos': num_segmentos,
+            'umbral': self.umbral,
+            'espectro': espectro,
+            'picos': picos
+        }
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico Z y la decisión para cada nivel de significancia
+        reutilizando el estadístico ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            z_critico = stats.norm.ppf(1 - alpha / 2)
+            decisiones[alpha] = {
+                'valor_critico': z_critico,
+                'rechaza_h0': abs(resultado['estadistico_z']) > z_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba espectral"""
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba Espectral")
+        ventana.geometry("900x700")
+
+        resultado = self.ejecutar()
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        titulo = ttk.Label(main_frame, text="Prueba Espectral (DFT) - Picos Principales",
+                           font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        # Tabla de picos
+        picos = resultado['picos']
+        columns = tuple(picos.columns)
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=NUM_PICOS)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=160, anchor='center')
+        for _, fila in picos.iterrows():
+            tree.insert('', 'end', values=(
+                f"{fila.iloc[0]:.0f}", f"{fila.iloc[1]:.2f}", f"{fila.iloc[2]:.4f}"))
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"Segmentos: {resultado['num_segmentos']} de {resultado['tamano_segmento']} datos").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Umbral T: {resultado['umbral_picos']:.4f}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Picos bajo T (N1): {resultado['picos_bajo_umbral']}  -  Esperados (N0): {resultado['picos_esperados']:.1f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Estadístico Z: {resultado['estadistico_z']:.6f}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: ±{resultado['valor_critico_z']:.6f}").grid(row=4, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=5, column=0, sticky=tk.W)
+
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                   foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=6, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_espectro(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_espectro(self, parent, resultado):
+        """Crear gráfico del espectro con el umbral de picos"""
+        frame_grafico = ttk.LabelFrame(parent, text="Espectro de la Secuencia ±1", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, ax = plt.subplots(figsize=(12, 4))
+
+        # Con espectros largos se grafica el pico de cada tramo
+        espectro = resultado['espectro']
+        indices = reducir_puntos(espectro)
+        ax.plot(indices, espectro[indices], color='blue', linewidth=0.8, label='|S_k| promedio')
+        ax.axhline(y=resultado['umbral_picos'], color='red', linestyle='--',
+                   label=f"T = {resultado['umbral_picos']:.2f}")
+
+        ax.set_xlabel('Frecuencia k')
+        ax.set_ylabel('|S_k|')
+        ax.set_title('Módulos de la DFT')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+
+def medir_tiempos(tamanos, repeticiones=3, precision_simple=False, tamano_segmento=None):
+    """
+    Mide el tiempo de ejecución de la prueba espectral para cada n.
+    Retorna un DataFrame con el mejor tiempo y los nanosegundos por dato.
+    """
+    rng = np.random.default_rng(0)
+    filas = []
+    for n in tamanos:
+        datos = rng.random(int(n))
+        mejor = np.inf
+        # Sin memoria: cada repetición tiene que calcular la DFT de nuevo
+        with memoria_desactivada():
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                PruebaEspectral(datos, precision_simple=precision_simple,
+                                tamano_segmento=tamano_segmento).ejecutar()
+                mejor = min(mejor, time.perf_counter() - inicio)
+        filas.append({'n': int(n), 'segundos': mejor, 'ns_por_dato': mejor / n * 1e9})
+    return pd.DataFrame(filas)
+
+
+def main():
+    """Función para probar el módulo independientemente"""
+    np.random.seed(42)
+    datos_test = np.random.uniform(0, 1, 100000)
+
+    prueba = PruebaEspectral(datos_test, alpha=0.05)
+    resultado = prueba.ejecutar()
+
+    print("Prueba Espectral (DFT)")
+    print("=" * 30)
+    print(f"N1 observado: {resultado['picos_bajo_umbral']}  N0 esperado: {resultado['picos_esperados']:.1f}")
+    print(f"Estadístico Z: {resultado['estadistico_z']:.6f}")
+    print(f"P-valor: {resultado['p_valor']:.6f}")
+    print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    print("\nTiempos (float64):")
+    print(medir_tiempos([10**4, 10**5, 10**6]).to_string(index=False))
+    print("\nTiempos (float32):")
+    print(medir_tiempos([10**4, 10**5, 10**6], precision_simple=True).to_string(index=False))
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
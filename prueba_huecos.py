@@ -0,0 +1,282 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from utilidades_rachas import agrupar_frecuencias
+
+# Tamaño de bloque al procesar un array completo
+TAMANO_BLOQUE = 1 << 20
+
+
+class PruebaHuecos:
+    """
+    Realiza la prueba de huecos (gap test) para el intervalo [a, b].
+    Un hueco de longitud i son i datos consecutivos fuera de [a, b] entre dos
+    datos que caen dentro. Bajo H0 la longitud sigue una distribución
+    geométrica: P(i) = p(1-p)^i con p = b - a.
+
+    Admite modo por bloques: se crea la prueba sin datos y se llama a
+    actualizar(bloque) por cada bloque; la posición del último acierto se
+    conserva entre bloques.
+    """
+
+    def __init__(self, datos=None, limite_inferior=0.0, limite_superior=0.5, alpha=0.05):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números (opcional en modo por bloques).
+        :param limite_inferior: Extremo a del intervalo [a, b].
+        :param limite_superior: Extremo b del intervalo [a, b].
+        :param alpha: Nivel de significancia para la prueba.
+        """
+        if not 0 <= limite_inferior < limite_superior <= 1:
+            raise ValueError(
+                "El intervalo debe cumplir 0 <= a < b <= 1.")
+
+        self.limite_inferior = limite_inferior
+        self.limite_superior = limite_superior
+        self.alpha = alpha
+        self.p = limite_superior - limite_inferior
+
+        # Estado acumulado: frecuencia de cada longitud de hueco, datos vistos
+        # y posición global del último dato dentro del intervalo
+        self.conteos = np.zeros(0, dtype=np.int64)
+        self.n_total = 0
+        self.ultima_posicion = None
+
+        if datos is not None:
+            datos = np.asarray(datos, dtype=float)
+            for inicio in range(0, datos.size, TAMANO_BLOQUE):
+                self.actualizar(datos[inicio:inicio + TAMANO_BLOQUE])
+
+    def actualizar(self, bloque):
+        """Procesa un bloque de datos en una pasada O(n)."""
+        bloque = np.asarray(bloque, dtype=float)
+        aciertos = np.flatnonzero(
+            (bloque >= self.limite_inferior) & (bloque <= self.limite_superior)) + self.n_total
+
+        if aciertos.size > 0:
+            # El hueco que cruza el borde del bloque empieza en el último acierto anterior
+            if self.ultima_posicion is not None:
+                aciertos = np.concatenate(([self.ultima_posicion], aciertos))
+            huecos = np.diff(aciertos) - 1
+            if huecos.size > 0:
+                nuevos = np.bincount(huecos)
+                if nuevos.size > self.conteos.size:
+                    nuevos[:self.conteos.size] += self.conteos
+                    self.conteos = nuevos
+                else:
+                    self.conteos[:nuevos.size] += nuevos
+            self.ultima_posicion = int(aciertos[-1])
+
+        self.n_total += bloque.size
+
+    def _calcular_frecuencias(self):
+        """
+        Frecuencias observadas y esperadas por longitud de hueco. La última
+        longitud observada acumula la cola P(hueco >= i) = (1-p)^i.
+        """
+        num_huecos = int(self.conteos.sum())
+        longitudes = np.arange(self.conteos.size)
+
+        probabilidades = self.p * (1 - self.p) ** longitudes
+        if probabilidades.size > 0:
+            probabilidades[-1] = (1 - self.p) ** longitudes[-1]
+
+        return self.conteos, num_huecos * probabilidades, num_huecos
+
+    def ejecutar(self):
+        """
+        Ejecuta la prueba con los datos procesados hasta el momento.
+        """
+        Oi, Ei, num_huecos = self._calcular_frecuencias()
+
+        if num_huecos == 0:
+            return {
+                'error': 'No se encontraron huecos. Verifique los datos y el intervalo.'
+            }
+
+        df = pd.DataFrame({'Oi': Oi, 'Ei': Ei})
+        df.index.name = 'Longitud (i)'
+
+        # --- Agrupar si Ei < 5 (desde la cola, igual que en las pruebas de longitud de rachas) ---
+        grouped_Oi, grouped_Ei = agrupar_frecuencias(df['Oi'], df['Ei'])
+
+        grados_libertad = len(grouped_Oi) - 1
+        if grados_libertad <= 0:
+            return {
+                'error': f'No hay suficientes grados de libertad ({grados_libertad}) para realizar la prueba.'
+            }
+
+        chi_cuadrado_calculado = np.sum(
+            (np.array(grouped_Oi) - np.array(grouped_Ei)) ** 2 / np.array(grouped_Ei)
+        )
+
+        valor_critico = stats.chi2.ppf(1 - self.alpha, grados_libertad)
+        p_valor = stats.chi2.sf(chi_cuadrado_calculado, grados_libertad)
+
+        resultado = {
+            'estadistico': chi_cuadrado_calculado,
+            'grados_libertad': grados_libertad,
+            'valor_critico': valor_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': chi_cuadrado_calculado > valor_critico,
+            'tipo_prueba': f'Huecos [{self.limite_inferior}, {self.limite_superior}]',
+            'alpha': self.alpha,
+            'n_total': self.n_total,
+            'num_huecos': num_huecos,
+            'limite_inferior': self.limite_inferior,
+            'limite_superior': self.limite_superior,
+            'df_original': df,
+            'grouped_oi': grouped_Oi,
+            'grouped_ei': grouped_Ei
+        }
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico Chi-cuadrado ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Muestra una ventana con la tabla detallada de la prueba."""
+        resultado = self.ejecutar()
+
+        if 'error' in resultado:
+            if parent:
+                messagebox.showerror("Error", resultado['error'])
+            else:
+                print(f"Error: {resultado['error']}")
+            return None
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba de Huecos")
+        ventana.geometry("800x600")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de Huecos [{self.limite_inferior}, {self.limite_superior}]", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # --- Tabla de frecuencias originales ---
+        frame_original = ttk.LabelFrame(
+            main_frame, text="Frecuencias Originales", padding="10")
+        frame_original.pack(fill=tk.X, expand=True, pady=5)
+
+        frame_tree_orig = ttk.Frame(frame_original)
+        frame_tree_orig.pack(fill=tk.BOTH, expand=True)
+        cols_orig = ('Longitud (i)', 'Oi', 'Ei')
+        tree_orig = ttk.Treeview(
+            frame_tree_orig, columns=cols_orig, show='headings', height=7)
+        scrollbar_orig = ttk.Scrollbar(
+            frame_tree_orig, orient=tk.VERTICAL, command=tree_orig.yview)
+        tree_orig.configure(yscrollcommand=scrollbar_orig.set)
+        for col in cols_orig:
+            tree_orig.heading(col, text=col)
+            tree_orig.column(col, width=120, anchor='center')
+
+        df_orig = resultado['df_original']
+        ultima = df_orig.index[-1]
+        for i in df_orig.index:
+            etiqueta = f">= {i}" if i == ultima else i
+            tree_orig.insert('', 'end', values=(
+                etiqueta, f"{df_orig.loc[i, 'Oi']:.0f}", f"{df_orig.loc[i, 'Ei']:.4f}"))
+
+        tree_orig.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar_orig.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # --- Tabla de frecuencias agrupadas y Chi-cuadrado ---
+        frame_agrupado = ttk.LabelFrame(
+            main_frame, text="Cálculo de Chi-Cuadrado (Datos Agrupados)", padding="10")
+        frame_agrupado.pack(fill=tk.X, expand=True, pady=5)
+
+        cols_agrup = ('Grupo', 'Oi (agrupado)', 'Ei (agrupado)', '(Oi-Ei)²/Ei')
+        tree_agrup = ttk.Treeview(
+            frame_agrupado, columns=cols_agrup, show='headings', height=5)
+        for col in cols_agrup:
+            tree_agrup.heading(col, text=col)
+            tree_agrup.column(col, width=150, anchor='center')
+
+        chi_total = 0
+        grouped_oi = resultado['grouped_oi']
+        grouped_ei = resultado['grouped_ei']
+        for i in range(len(grouped_oi)):
+            oi = grouped_oi[i]
+            ei = grouped_ei[i]
+            chi_contrib = (oi - ei)**2 / ei
+            chi_total += chi_contrib
+            tree_agrup.insert('', 'end', values=(
+                f"Grupo {i+1}", f"{oi:.0f}", f"{ei:.4f}", f"{chi_contrib:.4f}"))
+
+        tree_agrup.insert('', 'end', values=(
+            "TOTAL", f"{sum(grouped_oi):.0f}", f"{sum(grouped_ei):.4f}", f"{chi_total:.4f}"), tags=('total',))
+        tree_agrup.tag_configure(
+            'total', background='lightblue', font=("Arial", 9, "bold"))
+        tree_agrup.pack(fill=tk.X, expand=True)
+
+        # --- Resultados ---
+        frame_resultados = ttk.LabelFrame(
+            main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados,
+                  text=f"Estadístico Chi-cuadrado (χ²): {resultado['estadistico']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico (α={self.alpha}): {resultado['valor_critico']:.6f}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"P-valor: {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Número de huecos: {resultado['num_huecos']}").pack(
+            anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los datos NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los datos son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        return ventana
+
+
+def main():
+    """Función para probar el módulo independientemente."""
+    np.random.seed(0)
+    datos_test = np.random.rand(1000)
+
+    prueba = PruebaHuecos(datos_test, limite_inferior=0.0,
+                          limite_superior=0.5, alpha=0.05)
+    resultado = prueba.ejecutar()
+
+    print("Prueba de Huecos")
+    print(f"Chi-cuadrado: {resultado['estadistico']:.6f}")
+    print(f"P-valor: {resultado['p_valor']:.6f}")
+    print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    # Mismo resultado procesando por bloques
+    prueba_bloques = PruebaHuecos(limite_inferior=0.0, limite_superior=0.5)
+    for bloque in np.array_split(datos_test, 7):
+        prueba_bloques.actualizar(bloque)
+    print(f"Chi-cuadrado (por bloques): {prueba_bloques.ejecutar()['estadistico']:.6f}")
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+from functools import lru_cache
+from math import factorial
+
+import numpy as np
+from scipy import stats
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from chi_cuadrado import validar_datos
+from memoria import memorizar
+
+# Tamaño de bloque (en tuplas) para acotar la memoria
+TAMANO_BLOQUE = 1 << 20
+
+# Longitud máxima de las tuplas (6! = 720 patrones)
+MAX_LONGITUD_TUPLA = 6
+
+
+@lru_cache(maxsize=None)
+def patrones_orden(t):
+    """
+    Etiquetas de los t! patrones de orden indexadas por su código de Lehmer.
+    La etiqueta lista el rango (1 = menor) de cada posición de la tupla.
+    """
+    etiquetas = []
+    for codigo in range(factorial(t)):
+        # Decodificar los dígitos de Lehmer: d_i = cuántos posteriores son menores
+        digitos = []
+        for i in range(t):
+            base = factorial(t - 1 - i)
+            digitos.append(codigo // base)
+            codigo %= base
+        disponibles = list(range(1, t + 1))
+        rangos = [disponibles.pop(d) for d in digitos]
+        etiquetas.append("(" + " ".join(str(r) for r in rangos) + ")")
+    return tuple(etiquetas)
+
+
+class PruebaPermutaciones:
+    """
+    Prueba de permutaciones (patrones de orden) sobre tuplas no solapadas
+    de longitud t. Bajo H0 cada uno de los t! órdenes relativos posibles
+    tiene probabilidad 1/t!, y se contrasta con Chi-cuadrado con t!-1 gl.
+    """
+
+    def __init__(self, datos, longitud_tupla=3, alpha=0.05):
+        self.longitud_tupla = int(longitud_tupla)
+        if not 2 <= self.longitud_tupla <= MAX_LONGITUD_TUPLA:
+            raise ValueError(f"La longitud de las tuplas debe estar entre 2 y {MAX_LONGITUD_TUPLA}.")
+
+        self.datos = validar_datos(datos, minimo=self.longitud_tupla)
+        self.alpha = alpha
+        self.n = len(self.datos)
+        self.num_patrones = factorial(self.longitud_tupla)
+
+    def codigos_lehmer(self, tuplas):
+        """
+        Código de Lehmer de cada fila con una red de comparaciones:
+        d_i = #{j > i : x_j < x_i} y código = sum d_i (t-1-i)!.
+        Son t(t-1)/2 comparaciones vectorizadas sobre todas las filas.
+        """
+        t = self.longitud_tupla
+        codigos = np.zeros(len(tuplas), dtype=np.int64)
+        for i in range(t - 1):
+            digito = np.zeros(len(tuplas), dtype=np.int64)
+            for j in range(i + 1, t):
+                digito += tuplas[:, j] < tuplas[:, i]
+            codigos += digito * factorial(t - 1 - i)
+        return codigos
+
+    def contar_patrones(self):
+        """Frecuencias de los t! patrones con un bincount por bloque"""
+        t = self.longitud_tupla
+        num_tuplas = self.n // t
+        conteos = np.zeros(self.num_patrones, dtype=np.int64)
+        for inicio in range(0, num_tuplas, TAMANO_BLOQUE):
+            fin = min(inicio + TAMANO_BLOQUE, num_tuplas)
+            tuplas = self.datos[inicio * t:fin * t].reshape(-1, t)
+            conteos += np.bincount(self.codigos_lehmer(tuplas), minlength=self.num_patrones)
+        return conteos, num_tuplas
+
+    @memorizar('longitud_tupla', 'alpha')
+    def ejecutar(self):
+        """Ejecutar la prueba de permutaciones"""
+        try:
+            freq_obs, num_tuplas = self.contar_patrones()
+            freq_esp = num_tuplas / self.num_patrones
+
+            chi_stat = np.sum((freq_obs - freq_esp) ** 2 / freq_esp)
+            gl = self.num_patrones - 1
+            valor_critico = stats.chi2.ppf(1 - self.alpha, gl)
+
+            # Calcular p-valor
+            p_valor = stats.chi2.sf(chi_stat, gl)
+
+            # Decisión de la prueba
+            rechaza_h0 = chi_stat > valor_critico
+
+            resultado = {
+                'estadistico': chi_stat,
+                'grados_libertad': gl,
+                'valor_critico': valor_critico,
+                'p_valor': p_valor,
+                'rechaza_h0': rechaza_h0,
+                'frecuencias_observadas': freq_obs,
+                'frecuencia_esperada': freq_esp,
+                'tipo_prueba': f'Permutaciones (t={self.longitud_tupla})',
+                'alpha': self.alpha,
+                'n': self.n,
+                'num_tuplas': num_tuplas,
+                'longitud_tupla': self.longitud_tupla,
+                'patrones': patrones_orden(self.longitud_tupla)
+            }
+
+            if freq_esp < 5:
+                resultado['advertencia'] = (
+                    f"La frecuencia esperada por patrón ({freq_esp:.2f}) es menor que 5; "
+                    "se necesitan más datos o tuplas más cortas.")
+
+            return resultado
+
+        except Exception as e:
+            raise Exception(f"Error en prueba de Permutaciones: {str(e)}")
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba de permutaciones"""
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba de Permutaciones")
+        ventana.geometry("800x700")
+
+        # Ejecutar la prueba para obtener datos
+        resultado = self.ejecutar()
+        freq_obs = resultado['frecuencias_observadas']
+        freq_esp = resultado['frecuencia_esperada']
+
+        # Frame principal
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Título
+        titulo = ttk.Label(main_frame, text=f"Prueba de {resultado['tipo_prueba']} - Tabla Detallada",
+                          font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        # Crear tabla
+        columns = ('Patrón', 'Oi', 'Ei', '(Oi-Ei)²/Ei')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor='center')
+
+        contribuciones = (freq_obs - freq_esp) ** 2 / freq_esp
+        for codigo, patron in enumerate(resultado['patrones']):
+            tree.insert('', 'end', values=(
+                patron,
+                f"{freq_obs[codigo]}",
+                f"{freq_esp:.2f}",
+                f"{contribuciones[codigo]:.4f}"
+            ))
+
+        # Agregar fila de totales
+        tree.insert('', 'end', values=(
+            "TOTAL",
+            f"{freq_obs.sum()}",
+            f"{freq_esp * len(freq_obs):.2f}",
+            f"{contribuciones.sum():.4f}"
+        ), tags=('total',))
+
+        tree.tag_configure('total', background='lightblue')
+
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"Chi-cuadrado calculado: {resultado['estadistico']:.6f}").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Tuplas analizadas: {resultado['num_tuplas']}").grid(row=4, column=0, sticky=tk.W)
+        if 'advertencia' in resultado:
+            ttk.Label(frame_resultados, text=resultado['advertencia'], foreground="orange").grid(row=5, column=0, sticky=tk.W)
+
+        # Decisión
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                  foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=6, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_permutaciones(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_permutaciones(self, parent, resultado):
+        """Crear gráfico de frecuencias observadas por patrón"""
+        frame_grafico = ttk.LabelFrame(parent, text="Frecuencias por Patrón", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, ax = plt.subplots(figsize=(8, 4))
+
+        freq_obs = resultado['frecuencias_observadas']
+        ax.bar(np.arange(len(freq_obs)), freq_obs, color='skyblue', label='Observada')
+        ax.axhline(resultado['frecuencia_esperada'], color='red', linestyle='--', label='Esperada')
+
+        # Con pocos patrones se rotulan en el eje x
+        if len(freq_obs) <= 24:
+            ax.set_xticks(np.arange(len(freq_obs)))
+            ax.set_xticklabels(resultado['patrones'], rotation=90)
+        ax.set_xlabel('Patrón (código de Lehmer)')
+        ax.set_ylabel('Frecuencia')
+        ax.set_title('Frecuencias Observadas vs Esperadas')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+def main():
+    """Función para probar el módulo independientemente"""
+    np.random.seed(42)
+    datos_test = np.random.uniform(0, 1, 10000)
+
+    for t in (3, 4, 5):
+        prueba = PruebaPermutaciones(datos_test, longitud_tupla=t, alpha=0.05)
+        resultado = prueba.ejecutar()
+
+        print(f"Prueba de {resultado['tipo_prueba']}")
+        print("=" * 30)
+        print(f"Chi-cuadrado: {resultado['estadistico']:.6f}")
+        print(f"Grados de libertad: {resultado['grados_libertad']}")
+        print(f"P-valor: {resultado['p_valor']:.6f}")
+        print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = PruebaPermutaciones(datos_test, longitud_tupla=3).mostrar_tabla_detallada()
+    ventana.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+import tkinter as tk
+from functools import lru_cache
+from math import factorial
+from tkinter import messagebox, ttk
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from memoria import memorizar
+from utilidades_rachas import agrupar_frecuencias
+
+# Tamaño de bloque para acotar la memoria de la matriz de dígitos
+TAMANO_BLOQUE = 1 << 20
+
+
+def _particiones(total, maximo=None):
+    """Particiones de `total` como tuplas no crecientes (multiplicidades de una mano)."""
+    maximo = total if maximo is None else maximo
+    if total == 0:
+        yield ()
+        return
+    for parte in range(min(total, maximo), 0, -1):
+        for resto in _particiones(total - parte, parte):
+            yield (parte,) + resto
+
+
+def nombre_mano(multiplicidades):
+    """Nombre de la mano a partir de las multiplicidades ordenadas de los dígitos."""
+    mayor = multiplicidades[0]
+    if mayor == 1:
+        return "Todos diferentes"
+    if mayor == 2:
+        return "Dos pares" if multiplicidades[:2] == (2, 2) else "Un par"
+    if mayor == 3:
+        return "Full (tercia y par)" if multiplicidades[:2] == (3, 2) else "Tercia"
+    if mayor == 4:
+        return "Póker"
+    return "Quintilla"
+
+
+@lru_cache(maxsize=None)
+def categorias_poker(num_digitos):
+    """
+    Categorías (manos) de la prueba, su probabilidad exacta y la tabla de
+    búsqueda que asigna cada patrón de dígitos ordenados a una categoría.
+    El patrón es un entero cuyos bits indican si dos dígitos ordenados
+    adyacentes son iguales. Se cachea por número de dígitos.
+    """
+    # Ordenar de la mano más común a la más rara: TD, 1P, 2P, T, Full, P, Q
+    manos = sorted(_particiones(num_digitos),
+                   key=lambda m: (m[0], -len(m)))
+
+    probabilidades = []
+    for multiplicidades in manos:
+        distintos = len(multiplicidades)
+        # Elegir los valores de los dígitos (sin contar permutaciones entre
+        # multiplicidades iguales) y luego sus posiciones
+        valores = factorial(10) // factorial(10 - distintos)
+        for repeticion in set(multiplicidades):
+            valores //= factorial(multiplicidades.count(repeticion))
+        posiciones = factorial(num_digitos)
+        for m in multiplicidades:
+            posiciones //= factorial(m)
+        probabilidades.append(valores * posiciones / 10 ** num_digitos)
+
+    indice_mano = {mano: i for i, mano in enumerate(manos)}
+    tabla = np.zeros(1 << (num_digitos - 1), dtype=np.int64)
+    for patron in range(tabla.size):
+        # Cada bit en 0 separa dos grupos de dígitos iguales
+        multiplicidades = []
+        actual = 1
+        for bit in range(num_digitos - 1):
+            if patron >> bit & 1:
+                actual += 1
+            else:
+                multiplicidades.append(actual)
+                actual = 1
+        multiplicidades.append(actual)
+        tabla[patron] = indice_mano[tuple(sorted(multiplicidades, reverse=True))]
+
+    nombres = [nombre_mano(mano) for mano in manos]
+    probabilidades = np.array(probabilidades)
+    tabla.setflags(write=False)
+    probabilidades.setflags(write=False)
+    return nombres, probabilidades, tabla
+
+
+class PruebaPoker:
+    """
+    Prueba de póker: toma los primeros dígitos decimales de cada número y
+    compara la frecuencia de cada tipo de mano (todos diferentes, un par,
+    dos pares, tercia, ...) con su probabilidad teórica mediante Chi-cuadrado.
+    """
+
+    def __init__(self, datos, num_digitos=5, alpha=0.05):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números en [0, 1).
+        :param num_digitos: Dígitos decimales por número (3, 4 o 5).
+        :param alpha: Nivel de significancia para la prueba.
+        """
+        self.datos = np.asarray(datos, dtype=float)
+        self.num_digitos = num_digitos
+        self.alpha = alpha
+        self.n = len(self.datos)
+
+        if num_digitos not in (3, 4, 5):
+            raise ValueError("El número de dígitos debe ser 3, 4 o 5.")
+        if self.n == 0:
+            raise ValueError("El conjunto de datos no puede estar vacío.")
+
+    def _clasificar(self, valores):
+        """Índice de la mano de cada número, sin lógica por número en Python."""
+        nombres, probabilidades, tabla = categorias_poker(self.num_digitos)
+
+        # Primeros dígitos decimales como entero (el redondeo evita 0.29*100 = 28.99...)
+        escala = 10 ** self.num_digitos
+        enteros = np.clip(np.floor(np.round(valores * escala, 6)),
+                          0, escala - 1).astype(np.int64)
+        potencias = 10 ** np.arange(self.num_digitos - 1, -1, -1)
+        digitos = np.sort((enteros[:, None] // potencias) % 10, axis=1)
+
+        # Patrón de igualdades entre dígitos ordenados adyacentes
+        iguales = digitos[:, 1:] == digitos[:, :-1]
+        patrones = iguales @ (1 << np.arange(self.num_digitos - 1))
+        return tabla[patrones]
+
+    def contar_manos(self):
+        """Frecuencias observadas de cada mano."""
+        nombres = categorias_poker(self.num_digitos)[0]
+        conteos = np.zeros(len(nombres), dtype=np.int64)
+        for inicio in range(0, self.n, TAMANO_BLOQUE):
+            manos = self._clasificar(self.datos[inicio:inicio + TAMANO_BLOQUE])
+            conteos += np.bincount(manos, minlength=len(nombres))
+        return conteos
+
+    @memorizar('num_digitos', 'alpha')
+    def ejecutar(self):
+        """
+        Ejecuta la prueba completa y devuelve los resultados.
+        """
+        nombres, probabilidades, _ = categorias_poker(self.num_digitos)
+        Oi = self.contar_manos()
+        Ei = self.n * probabilidades
+
+        df = pd.DataFrame({'Probabilidad': probabilidades, 'Oi': Oi, 'Ei': Ei},
+                          index=nombres)
+
+        # --- Agrupar las manos raras si Ei < 5 ---
+        grouped_Oi, grouped_Ei = agrupar_frecuencias(df['Oi'], df['Ei'])
+
+        grados_libertad = len(grouped_Oi) - 1
+        if grados_libertad <= 0:
+            return {
+                'error': f'No hay suficientes grados de libertad ({grados_libertad}) para realizar la prueba.'
+            }
+
+        chi_cuadrado_calculado = np.sum(
+            (np.array(grouped_Oi) - np.array(grouped_Ei)) ** 2 / np.array(grouped_Ei)
+        )
+
+        valor_critico = stats.chi2.ppf(1 - self.alpha, grados_libertad)
+        p_valor = stats.chi2.sf(chi_cuadrado_calculado, grados_libertad)
+
+        resultado = {
+            'estadistico': chi_cuadrado_calculado,
+            'grados_libertad': grados_libertad,
+            'valor_critico': valor_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': chi_cuadrado_calculado > valor_critico,
+            'tipo_prueba': f'Póker ({self.num_digitos} dígitos)',
+            'alpha': self.alpha,
+            'n': self.n,
+            'num_digitos': self.num_digitos,
+            'df_original': df,
+            'grouped_oi': grouped_Oi,
+            'grouped_ei': grouped_Ei
+        }
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico Chi-cuadrado ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Muestra una ventana con la tabla detallada de la prueba."""
+        resultado = self.ejecutar()
+
+        if 'error' in resultado:
+            if parent:
+                messagebox.showerror("Error", resultado['error'])
+            else:
+                print(f"Error: {resultado['error']}")
+            return None
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba de Póker")
+        ventana.geometry("800x600")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de Póker ({self.num_digitos} dígitos)", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # --- Tabla de frecuencias por mano ---
+        frame_original = ttk.LabelFrame(
+            main_frame, text="Frecuencias por Mano", padding="10")
+        frame_original.pack(fill=tk.X, expand=True, pady=5)
+
+        cols_orig = ('Mano', 'Probabilidad', 'Oi', 'Ei')
+        tree_orig = ttk.Treeview(
+            frame_original, columns=cols_orig, show='headings', height=7)
+        for col in cols_orig:
+            tree_orig.heading(col, text=col)
+            tree_orig.column(col, width=150, anchor='center')
+
+        df_orig = resultado['df_original']
+        for mano in df_orig.index:
+            tree_orig.insert('', 'end', values=(
+                mano, f"{df_orig.loc[mano, 'Probabilidad']:.4f}",
+                f"{df_orig.loc[mano, 'Oi']:.0f}", f"{df_orig.loc[mano, 'Ei']:.4f}"))
+
+        tree_orig.pack(fill=tk.X, expand=True)
+
+        # --- Tabla de frecuencias agrupadas y Chi-cuadrado ---
+        frame_agrupado = ttk.LabelFrame(
+            main_frame, text="Cálculo de Chi-Cuadrado (Datos Agrupados)", padding="10")
+        frame_agrupado.pack(fill=tk.X, expand=True, pady=5)
+
+        cols_agrup = ('Grupo', 'Oi (agrupado)', 'Ei (agrupado)', '(Oi-Ei)²/Ei')
+        tree_agrup = ttk.Treeview(
+            frame_agrupado, columns=cols_agrup, show='headings', height=5)
+        for col in cols_agrup:
+            tree_agrup.heading(col, text=col)
+            tree_agrup.column(col, width=150, anchor='center')
+
+        chi_total = 0
+        grouped_oi = resultado['grouped_oi']
+        grouped_ei = resultado['grouped_ei']
+        for i in range(len(grouped_oi)):
+            oi = grouped_oi[i]
+            ei = grouped_ei[i]
+            chi_contrib = (oi - ei)**2 / ei
+            chi_total += chi_contrib
+            tree_agrup.insert('', 'end', values=(
+                f"Grupo {i+1}", f"{oi:.0f}", f"{ei:.4f}", f"{chi_contrib:.4f}"))
+
+        tree_agrup.insert('', 'end', values=(
+            "TOTAL", f"{sum(grouped_oi):.0f}", f"{sum(grouped_ei):.4f}", f"{chi_total:.4f}"), tags=('total',))
+        tree_agrup.tag_configure(
+            'total', background='lightblue', font=("Arial", 9, "bold"))
+        tree_agrup.pack(fill=tk.X, expand=True)
+
+        # --- Resultados ---
+        frame_resultados = ttk.LabelFrame(
+            main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados,
+                  text=f"Estadístico Chi-cuadrado (χ²): {resultado['estadistico']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico (α={self.alpha}): {resultado['valor_critico']:.6f}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"P-valor: {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los datos NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los datos son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        return ventana
+
+
+def main():
+    """Función para probar el módulo independientemente."""
+    np.random.seed(0)
+    datos_test = np.random.rand(1000)
+
+    prueba = PruebaPoker(datos_test, num_digitos=5, alpha=0.05)
+    resultado = prueba.ejecutar()
+
+    print("Prueba de Póker")
+    print(resultado['df_original'])
+    print(f"Chi-cuadrado: {resultado['estadistico']:.6f}")
+    print(f"P-valor: {resultado['p_valor']:.6f}")
+    print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import os
+import tempfile
+import tkinter as tk
+from functools import lru_cache
+from tkinter import ttk
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from scipy.signal import lfilter
+
+from memoria import memorizar
+from utilidades_rachas import (longitudes_rachas, secuencia_direcciones,
+                               secuencia_umbral)
+
+# Directorio donde se guardan las distribuciones ya calculadas
+DIRECTORIO_CACHE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'cache', 'racha_maxima')
+
+# La distribución se corta cuando P(L <= m) alcanza 1 - TOLERANCIA_COLA
+TOLERANCIA_COLA = 1e-15
+
+# Pasos exactos de la recurrencia encima/debajo antes de extrapolar
+PASOS_EXACTOS = 4000
+
+# Tamaño de la tabla exacta ascendente/descendente: hasta N_EXACTO datos
+# y rachas de hasta MAX_LONGITUD_ASC_DESC cambios (P(L > 30) < 1e-20 para N < 1e12)
+N_EXACTO = 1000
+MAX_LONGITUD_ASC_DESC = 30
+
+TIPOS = {
+    'encima_debajo': "Encima/Debajo",
+    'ascendente_descendente': "Ascendente/Descendente",
+}
+
+
+def _memo_disco(nombre, calcular):
+    """
+    Cargar un array guardado en DIRECTORIO_CACHE o calcularlo y guardarlo.
+    La escritura va a un archivo temporal y se renombra, de modo que un
+    proceso que lee nunca ve un archivo a medio escribir.
+    """
+    ruta = os.path.join(DIRECTORIO_CACHE, nombre + '.npy')
+    try:
+        return np.load(ruta)
+    except (OSError, ValueError):
+        pass
+
+    valores = calcular()
+    try:
+        os.makedirs(DIRECTORIO_CACHE, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=DIRECTORIO_CACHE, suffix='.npy')
+        with os.fdopen(descriptor, 'wb') as archivo:
+            np.save(archivo, valores)
+        os.replace(temporal, ruta)
+    except OSError:
+        # Sin permisos de escritura la distribución se usa igual, sin guardar
+        pass
+    return valores
+
+
+def _extrapolar(ultimo, penultimo, pasos_extra):
+    """
+    Extender geométricamente una probabilidad que decae como C * r^k.
+    Tras suficientes pasos exactos los demás modos de la recurrencia son
+    despreciables y la razón entre términos consecutivos es constante.
+    """
+    if pasos_extra <= 0:
+        return ultimo
+    if ultimo < 1e-290 or penultimo <= 0:
+        return 0.0
+    return float(np.exp(np.log(ultimo) + pasos_extra * np.log(ultimo / penultimo)))
+
+
+def prob_sin_racha(num_ensayos, m, p=0.5):
+    """
+    P(no hay m éxitos consecutivos en num_ensayos ensayos Bernoulli(p)).
+    Se usa la recurrencia u_k = sum_{j=0}^{m-1} (1-p) p^j u_{k-1-j}
+    (posición del primer fracaso), evaluada con lfilter.
+    """
+    if num_ensayos < m:
+        return 1.0
+    pasos = min(num_ensayos, PASOS_EXACTOS)
+    coeficientes = (1 - p) * p ** np.arange(m)
+    # Con estado inicial nulo, la entrada p^k para k < m deja u_k = 1 en esos pasos
+    entrada = np.zeros(pasos + 1)
+    entrada[:m] = p ** np.arange(m)
+    u = lfilter([1.0], np.concatenate(([1.0], -coeficientes)), entrada)
+    return _extrapolar(u[pasos], u[pasos - 1], num_ensayos - pasos)
+
+
+def _cdf_encima_debajo(n):
+    """
+    P(L <= m) para m = 0, 1, ... con L la racha más larga de n signos
+    iid con p = 1/2: L <= m equivale a que entre las n-1 transiciones no haya
+    m repeticiones seguidas.
+    """
+    cdf = [0.0]
+    m = 1
+    while cdf[-1] < 1 - TOLERANCIA_COLA and m < n:
+        cdf.append(prob_sin_racha(n - 1, m))
+        m += 1
+    cdf.append(1.0)
+    return np.array(cdf)
+
+
+def _tabla_ascendente_descendente():
+    """
+    Tabla exacta P(L <= m | N) para N = 0..N_EXACTO y m = 0..MAX_LONGITUD_ASC_DESC,
+    donde L es la racha más larga de cambios en la misma dirección de N datos
+    continuos iid. DP sobre el rango r del último dato entre los i primeros:
+    el siguiente tiene rango k uniforme en 0..i y sube si k > r.
+    """
+    tabla = np.ones((MAX_LONGITUD_ASC_DESC + 1, N_EXACTO + 1))
+    tabla[0, 2:] = 0.0
+
+    for m in range(1, MAX_LONGITUD_ASC_DESC + 1):
+        # sube[l, r] / baja[l, r]: racha actual de l+1 cambios, último con rango r
+        sube = np.zeros((m, 2))
+        baja = np.zeros((m, 2))
+        sube[0, 1] = 0.5
+        baja[0, 0] = 0.5
+
+        for i in range(2, N_EXACTO):
+            # Sumas de r < k (subidas) y de r >= k (bajadas) para k = 0..i
+            antes_sube = np.concatenate((np.zeros((m, 1)), np.cumsum(sube, axis=1)), axis=1)
+            antes_baja = np.concatenate((np.zeros((m, 1)), np.cumsum(baja, axis=1)), axis=1)
+            desde_sube = antes_sube[:, -1:] - antes_sube
+            desde_baja = antes_baja[:, -1:] - antes_baja
+
+            nueva_sube = np.empty((m, i + 1))
+            nueva_baja = np.empty((m, i + 1))
+            # Un cambio de dirección inicia racha de longitud 1; si no, la racha crece
+            nueva_sube[0] = antes_baja.sum(axis=0)
+            nueva_sube[1:] = antes_sube[:-1]
+            nueva_baja[0] = desde_sube.sum(axis=0)
+            nueva_baja[1:] = desde_baja[:-1]
+
+            sube = nueva_sube / (i + 1)
+            baja = nueva_baja / (i + 1)
+            tabla[m, i + 1] = sube.sum() + baja.sum()
+
+    return tabla
+
+
+@lru_cache(maxsize=1)
+def tabla_ascendente_descendente():
+    """Tabla exacta ascendente/descendente, memorizada en disco."""
+    tabla = _memo_disco(f'ascendente_descendente_{N_EXACTO}_{MAX_LONGITUD_ASC_DESC}',
+                        _tabla_ascendente_descendente)
+    tabla.flags.writeable = False
+    return tabla
+
+
+def _cdf_ascendente_descendente(n):
+    """P(L <= m) para los n-1 cambios de n datos; por encima de N_EXACTO se extrapola."""
+    tabla = tabla_ascendente_descendente()
+    if n <= N_EXACTO:
+        cdf = tabla[:, n].copy()
+    else:
+        cdf = np.array([_extrapolar(tabla[m, N_EXACTO], tabla[m, N_EXACTO - 1], n - N_EXACTO)
+                        for m in range(MAX_LONGITUD_ASC_DESC + 1)])
+    # Cortar en cuanto la cola es despreciable
+    fin = int(np.argmax(cdf >= 1 - TOLERANCIA_COLA)) if np.any(cdf >= 1 - TOLERANCIA_COLA) else cdf.size - 1
+    cdf = cdf[:fin + 1]
+    cdf[-1] = 1.0
+    return cdf
+
+
+@lru_cache(maxsize=64)
+def distribucion_racha_maxima(tipo, n):
+    """
+    Distribución exacta de la racha más larga dado el número de datos n.
+    Retorna un array (solo lectura) con cdf[m] = P(L <= m); para m mayores
+    que el último índice la probabilidad es 1. Se memoriza en disco.
+    """
+    if tipo == 'encima_debajo':
+        cdf = _memo_disco(f'encima_debajo_{n}', lambda: _cdf_encima_debajo(n))
+    elif tipo == 'ascendente_descendente':
+        cdf = _cdf_ascendente_descendente(n)
+    else:
+        raise ValueError(f"Tipo de racha desconocido: {tipo}")
+    cdf.flags.writeable = False
+    return cdf
+
+
+def valores_criticos(cdf, alpha):
+    """
+    Valores críticos bilaterales: se rechaza si L <= inferior o L >= superior,
+    con cada cola de probabilidad a lo sumo alpha/2 (inferior = 0 si no existe).
+    """
+    inferiores = np.flatnonzero(cdf <= alpha / 2)
+    inferior = int(inferiores[-1]) if inferiores.size else 0
+    # P(L >= m) = 1 - cdf[m-1]
+    superior = int(np.argmax(1 - cdf <= alpha / 2)) + 1
+    return inferior, superior
+
+
+class PruebaRachaMaxima:
+    """
+    Prueba de la racha más larga para la secuencia de signos encima/debajo
+    del umbral 0.5 o para la de direcciones ascendentes/descendentes.
+    Compara la longitud máxima observada con su distribución exacta dado n.
+    """
+
+    def __init__(self, datos, tipo='encima_debajo', alpha=0.05, longitud_maxima=None):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números.
+        :param tipo: 'encima_debajo' o 'ascendente_descendente'.
+        :param alpha: Nivel de significancia para la prueba.
+        :param longitud_maxima: Racha máxima ya calculada por otra prueba de
+            rachas sobre los mismos datos (evita recorrerlos de nuevo).
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de racha desconocido: {tipo}")
+
+        self.datos = np.asarray(datos)
+        self.tipo = tipo
+        self.alpha = alpha
+        self.n_total = len(self.datos)
+        self.longitud_maxima = longitud_maxima
+
+        if self.n_total < 3:
+            raise ValueError("Se necesitan al menos 3 datos para la prueba de racha máxima.")
+
+    def _calcular_longitud_maxima(self):
+        """Racha más larga con el RLE vectorizado."""
+        if self.tipo == 'encima_debajo':
+            signos = secuencia_umbral(self.datos, 0.5, incluir_igual=False)
+        else:
+            signos = secuencia_direcciones(self.datos)
+        return int(longitudes_rachas(signos).max())
+
+    @memorizar('tipo', 'alpha')
+    def ejecutar(self):
+        """
+        Ejecuta la prueba y devuelve un diccionario con los resultados.
+        """
+        if self.longitud_maxima is None:
+            self.longitud_maxima = self._calcular_longitud_maxima()
+        L = self.longitud_maxima
+
+        cdf = distribucion_racha_maxima(self.tipo, self.n_total)
+        prob_menor_igual = cdf[min(L, cdf.size - 1)]
+        prob_mayor_igual = 1.0 - cdf[min(L - 1, cdf.size - 1)]
+        p_valor = min(1.0, 2 * min(prob_menor_igual, prob_mayor_igual))
+
+        inferior, superior = valores_criticos(cdf, self.alpha)
+        rechaza_h0 = L <= inferior or L >= superior
+
+        # Valor esperado: E[L] = sum_{m>=0} P(L > m)
+        esperada = float(np.sum(1 - cdf))
+
+        resultado = {
+            'estadistico': L,
+            'valor_critico': superior,
+            'valor_critico_inferior': inferior,
+            'p_valor': p_valor,
+            'rechaza_h0': rechaza_h0,
+            'prob_menor_igual': prob_menor_igual,
+            'prob_mayor_igual': prob_mayor_igual,
+            'longitud_esperada': esperada,
+            'distribucion': cdf,
+            'tipo_prueba': f'Racha Máxima {TIPOS[self.tipo]}',
+            'tipo': self.tipo,
+            'alpha': self.alpha,
+            'n_total': self.n_total
+        }
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula los valores críticos y la decisión para cada nivel de
+        significancia reutilizando la distribución ya calculada.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            inferior, superior = valores_criticos(resultado['distribucion'], alpha)
+            decisiones[alpha] = {
+                'valor_critico': superior,
+                'rechaza_h0': resultado['estadistico'] <= inferior or resultado['estadistico'] >= superior
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Muestra una ventana con la distribución de la racha máxima."""
+        resultado = self.ejecutar()
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title(f"Tabla Detallada - {resultado['tipo_prueba']}")
+        ventana.geometry("800x700")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de {resultado['tipo_prueba']}", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # --- Tabla de la distribución ---
+        frame_tabla = ttk.LabelFrame(
+            main_frame, text="Distribución Exacta de la Racha Máxima", padding="10")
+        frame_tabla.pack(fill=tk.X, expand=True, pady=5)
+
+        cols = ('Longitud m', 'P(L = m)', 'P(L <= m)', 'P(L >= m)')
+        tree = ttk.Treeview(frame_tabla, columns=cols, show='headings', height=8)
+        scrollbar = ttk.Scrollbar(frame_tabla, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor='center')
+
+        cdf = resultado['distribucion']
+        for m in range(1, cdf.size):
+            etiqueta = f"{m} ←OBS" if m == resultado['estadistico'] else m
+            tree.insert('', 'end', values=(
+                etiqueta, f"{cdf[m] - cdf[m - 1]:.6g}", f"{cdf[m]:.6g}", f"{1 - cdf[m - 1]:.6g}"))
+
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # --- Resultados ---
+        frame_resultados = ttk.LabelFrame(
+            main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados, text=f"Racha máxima observada (L): {resultado['estadistico']}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Racha máxima esperada E[L]: {resultado['longitud_esperada']:.4f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Región de rechazo (α={self.alpha}): L <= {resultado['valor_critico_inferior']} o L >= {resultado['valor_critico']}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor (bilateral): {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Número total de datos: {resultado['n_total']}").pack(anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los datos NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los datos son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        # --- Gráfico de la distribución ---
+        fig, ax = plt.subplots(figsize=(8, 3))
+        longitudes = np.arange(1, cdf.size)
+        probabilidades = np.diff(cdf)
+        colores = ['red' if m == resultado['estadistico'] else 'skyblue' for m in longitudes]
+        ax.bar(longitudes, probabilidades, color=colores)
+        ax.set_xlabel('Longitud de la racha máxima')
+        ax.set_ylabel('P(L = m)')
+        ax.set_title('Distribución exacta (en rojo la observada)')
+        ax.grid(True, alpha=0.3)
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, main_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        return ventana
+
+
+def main():
+    """Función para probar el módulo independientemente."""
+    np.random.seed(0)
+    datos_test = np.random.rand(1000)
+
+    for tipo in TIPOS:
+        prueba = PruebaRachaMaxima(datos_test, tipo=tipo, alpha=0.05)
+        resultado = prueba.ejecutar()
+
+        print(f"Prueba de {resultado['tipo_prueba']}")
+        print(f"Racha máxima: {resultado['estadistico']} (esperada {resultado['longitud_esperada']:.2f})")
+        print(f"P-valor: {resultado['p_valor']:.6f}")
+        print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = PruebaRachaMaxima(datos_test).mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
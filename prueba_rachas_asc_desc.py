@@ -6,56 +6,37 @@ import numpy as np
 import seaborn as sns
 from scipy.stats import norm
 
+from memoria import memorizar
+from utilidades_rachas import (frecuencias_longitudes, longitudes_rachas,
+                               secuencia_direcciones)
+
 
 class RachasAscendentesDescendentes:
-    def __init__(self, datos, alpha=0.05):
+    def __init__(self, datos, alpha=0.05, longitudes=None):
         self.datos = datos
         self.alpha = alpha
         self.N = len(datos)
+        # Longitudes de racha de las direcciones ya calculadas (por ejemplo, compartidas entre procesos)
+        self.longitudes = longitudes
         self.resultados = {}
 
+    @memorizar('alpha')
     def ejecutar(self):
-        # Paso 1: Identificar cambios de dirección
-        direcciones = []
-        for i in range(1, self.N):
-            if self.datos[i] > self.datos[i-1]:
-                direcciones.append(1)  # Ascendente
-            elif self.datos[i] < self.datos[i-1]:
-                direcciones.append(-1)  # Descendente
-            else:
-                # En caso de empate, mantener la dirección anterior
-                if direcciones:
-                    direcciones.append(direcciones[-1])
-                else:
-                    direcciones.append(1)  # Por defecto ascendente
-
-        # Paso 2: Contar rachas (cambios de dirección)
-        if not direcciones:
-            # Si solo hay un dato
-            rachas = []
-            A = 0
-            longitudes = []
+        if self.longitudes is not None:
+            longitudes = np.asarray(self.longitudes)
         else:
-            rachas = []
-            racha_actual = [direcciones[0]]
-
-            for i in range(1, len(direcciones)):
-                if direcciones[i] == direcciones[i-1]:
-                    racha_actual.append(direcciones[i])
-                else:
-                    rachas.append(racha_actual)
-                    racha_actual = [direcciones[i]]
+            # Paso 1: Identificar la dirección de cada cambio (los empates
+            # mantienen la dirección anterior)
+            direcciones = secuencia_direcciones(self.datos)
 
-            rachas.append(racha_actual)
+            # Paso 2: Contar rachas con el RLE vectorizado
+            longitudes = longitudes_rachas(direcciones)
 
-            # Número de rachas (A) es la cantidad de grupos
-            A = len(rachas)
-            longitudes = [len(r) for r in rachas]
+        # Número de rachas (A) es la cantidad de grupos
+        A = len(longitudes)
 
         # Contar frecuencias de longitudes
-        frecuencias = {}
-        for lon in longitudes:
-            frecuencias[lon] = frecuencias.get(lon, 0) + 1
+        frecuencias = frecuencias_longitudes(longitudes)
 
         # Paso 3: Cálculos estadísticos
         mu_A = (2 * self.N - 1) / 3
@@ -70,10 +51,9 @@ class RachasAscendentesDescendentes:
         # Almacenar resultados
         self.resultados = {
             'suma_lon': A,  # ESTE ES EL ESTADÍSTICO A IMPORTANTE
-            'numero_rachas': sum(longitudes) if longitudes else 0,
-            'longitud_maxima': max(longitudes) if longitudes else 0,
+            'numero_rachas': int(longitudes.sum()),
+            'longitud_maxima': int(longitudes.max()) if A else 0,
             'frecuencias_longitudes': frecuencias,
-            'rachas': rachas,
             'mu_A': mu_A,
             'sigma2_A': sigma2_A,
             'sigma_A': sigma_A,
@@ -86,9 +66,20 @@ class RachasAscendentesDescendentes:
 
         return self.resultados
 
+    def evaluar_alphas(self, resultados, alphas):
+        # Valor crítico y decisión por alpha reutilizando Z_prueba
+        decisiones = {}
+        for alpha in alphas:
+            Z_teorico = norm.ppf(1 - alpha / 2)
+            decisiones[alpha] = {
+                'valor_critico': Z_teorico,
+                'rechaza_h0': resultados['Z_prueba'] > Z_teorico
+            }
+        return decisiones
+
     def mostrar_tabla_detallada(self, parent=None):
         if not self.resultados:
-            self.ejecutar()
+            self.resultados = self.ejecutar()
 
         ventana = tk.Toplevel(parent)
         ventana.title("Detalle de Rachas Ascendentes/Descendentes")
@@ -7,6 +7,9 @@ import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from collections import defaultdict
 
+from memoria import memorizar
+from utilidades_rachas import contar_rachas, secuencia_umbral, texto_signos
+
 class RachasEncimaDebajo:
     """
     Realiza la prueba de rachas por encima y por debajo de un umbral (0.5).
@@ -14,13 +17,14 @@ class RachasEncimaDebajo:
     en el número total de rachas (secuencias de valores consecutivos
     por encima o por debajo del umbral).
     """
-    def __init__(self, datos, alpha=0.05):
+    def __init__(self, datos, alpha=0.05, secuencia=None):
         """
         Inicializa la prueba.
         :param datos: Una lista o array de números.
         :param alpha: Nivel de significancia para la prueba.
+        :param secuencia: Signos respecto al umbral ya calculados (datos >= 0.5), opcional.
         """
-        self.datos = np.array(datos)
+        self.datos = np.asarray(datos)
         self.alpha = alpha
         self.n_total = len(self.datos)
         
@@ -30,12 +34,15 @@ class RachasEncimaDebajo:
         # Definimos el umbral como 0.5, como se indicó
         self.umbral = 0.5 
         
-        # Generar secuencia de '+' y '-' basada en el umbral
-        self.secuencia = ['+' if dato >= self.umbral else '-' for dato in self.datos] # Cambiado a >= para incluir el 0.5 si es exacto
+        # Generar secuencia de signos basada en el umbral (True = '+', False = '-')
+        if secuencia is not None:
+            self.secuencia = np.asarray(secuencia)
+        else:
+            self.secuencia = secuencia_umbral(self.datos, self.umbral) # Se usa >= para incluir el 0.5 si es exacto
         
         # Contar n1 (número de valores >= umbral) y n2 (número de valores < umbral)
-        self.n1 = self.secuencia.count('+')
-        self.n2 = self.secuencia.count('-')
+        self.n1 = int(np.count_nonzero(self.secuencia))
+        self.n2 = self.n_total - self.n1
 
         # Si n1 o n2 es cero, la prueba no puede realizarse adecuadamente
         if self.n1 == 0 or self.n2 == 0:
@@ -43,17 +50,9 @@ class RachasEncimaDebajo:
 
     def _calcular_numero_rachas(self):
         """Calcula el número de rachas observadas (R)."""
-        if not self.secuencia:
-            return 0
-        
-        rachas_observadas = 0
-        if len(self.secuencia) > 0:
-            rachas_observadas = 1 # La primera racha siempre existe si hay elementos
-            for i in range(1, len(self.secuencia)):
-                if self.secuencia[i] != self.secuencia[i-1]:
-                    rachas_observadas += 1
-        return rachas_observadas
+        return contar_rachas(self.secuencia)
 
+    @memorizar('alpha', 'umbral')
     def ejecutar(self):
         """
         Ejecuta la prueba de rachas por encima y por debajo.
@@ -128,6 +127,20 @@ class RachasEncimaDebajo:
             traceback.print_exc()
             return {'error': f'Error durante la ejecución: {str(e)}'}
 
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico Z y la decisión para cada nivel de significancia
+        reutilizando el estadístico ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            z_critico = stats.norm.ppf(1 - alpha / 2)
+            decisiones[alpha] = {
+                'valor_critico': z_critico,
+                'rechaza_h0': abs(resultado['estadistico_z']) > z_critico
+            }
+        return decisiones
+
     def mostrar_tabla_detallada(self, parent=None):
         """
         Muestra los resultados detallados de la prueba en una ventana de Tkinter.
@@ -157,9 +170,7 @@ class RachasEncimaDebajo:
             frame_info = ttk.LabelFrame(main_frame, text="Información de la Secuencia y Umbral", padding="10")
             frame_info.pack(fill=tk.X, pady=5)
             
-            secuencia_text = ''.join(self.secuencia[:50])
-            if len(self.secuencia) > 50:
-                secuencia_text += "..."
+            secuencia_text = texto_signos(self.secuencia, 50)
             
             ttk.Label(frame_info, text=f"Secuencia de signos: {secuencia_text}").pack(anchor=tk.W)
             ttk.Label(frame_info, text=f"Longitud de la secuencia: {len(self.secuencia)}").pack(anchor=tk.W)
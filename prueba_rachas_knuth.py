@@ -0,0 +1,221 @@
+import tkinter as tk
+from functools import lru_cache
+from tkinter import messagebox, ttk
+
+import numpy as np
+from scipy import stats
+
+from utilidades_rachas import longitudes_corridas_ascendentes
+
+# Matriz A y vector b de Knuth (TAOCP Vol. 2, 3.3.2) para las corridas
+# ascendentes de longitud 1, 2, 3, 4, 5 y >= 6
+MATRIZ_A_KNUTH = np.array([
+    [4529.4, 9044.9, 13568, 18091, 22615, 27892],
+    [9044.9, 18097, 27139, 36187, 45234, 55789],
+    [13568, 27139, 40721, 54281, 67852, 83685],
+    [18091, 36187, 54281, 72414, 90470, 111580],
+    [22615, 45234, 67852, 90470, 113262, 139476],
+    [27892, 55789, 83685, 111580, 139476, 172860],
+])
+VECTOR_B_KNUTH = np.array([1/6, 5/24, 11/120, 19/720, 29/5040, 1/840])
+
+LONGITUD_MAXIMA = 6
+
+
+@lru_cache(maxsize=32)
+def parametros_forma_cuadratica(n):
+    """
+    Matriz de la forma cuadrática A/(n-6) (inversa de la covarianza de los
+    conteos) y conteos esperados n*b, precalculados y cacheados por n.
+    """
+    matriz = MATRIZ_A_KNUTH / (n - LONGITUD_MAXIMA)
+    esperados = n * VECTOR_B_KNUTH
+    matriz.setflags(write=False)
+    esperados.setflags(write=False)
+    return matriz, esperados
+
+
+class RachasKnuth:
+    """
+    Prueba de corridas ascendentes/descendentes de Knuth. A diferencia de la
+    Chi-cuadrado simple sobre las longitudes, usa la forma cuadrática con la
+    matriz de covarianzas de los conteos, ya que las longitudes de corridas
+    adyacentes están correlacionadas. El estadístico V sigue una Chi-cuadrado
+    con 6 grados de libertad (se recomienda n >= 4000).
+    """
+
+    def __init__(self, datos, alpha=0.05, direccion='ascendente'):
+        """
+        Inicializa la prueba.
+        :param datos: Una lista o array de números.
+        :param alpha: Nivel de significancia para la prueba.
+        :param direccion: 'ascendente' o 'descendente'.
+        """
+        self.datos = np.asarray(datos, dtype=float)
+        self.alpha = alpha
+        self.direccion = direccion
+        self.n_total = len(self.datos)
+
+        if direccion not in ('ascendente', 'descendente'):
+            raise ValueError(
+                "La dirección debe ser 'ascendente' o 'descendente'.")
+        if self.n_total <= LONGITUD_MAXIMA:
+            raise ValueError(
+                f"El conjunto de datos debe contener más de {LONGITUD_MAXIMA} elementos.")
+
+    def _contar_corridas(self):
+        """Conteos de corridas de longitud 1..5 y >= 6 a partir del RLE vectorizado."""
+        datos = self.datos if self.direccion == 'ascendente' else -self.datos
+        longitudes = longitudes_corridas_ascendentes(datos)
+        conteos = np.bincount(np.minimum(longitudes, LONGITUD_MAXIMA),
+                              minlength=LONGITUD_MAXIMA + 1)[1:]
+        return conteos, longitudes.size
+
+    def ejecutar(self):
+        """
+        Ejecuta la prueba y devuelve los resultados.
+        """
+        try:
+            conteos, numero_corridas = self._contar_corridas()
+            matriz, esperados = parametros_forma_cuadratica(self.n_total)
+
+            diferencias = conteos - esperados
+            V = float(diferencias @ matriz @ diferencias)
+
+            grados_libertad = LONGITUD_MAXIMA
+            valor_critico = stats.chi2.ppf(1 - self.alpha, grados_libertad)
+            p_valor = stats.chi2.sf(V, grados_libertad)
+
+            resultado = {
+                'estadistico': V,
+                'grados_libertad': grados_libertad,
+                'valor_critico': valor_critico,
+                'p_valor': p_valor,
+                'rechaza_h0': V > valor_critico,
+                'tipo_prueba': f'Corridas de Knuth ({self.direccion})',
+                'alpha': self.alpha,
+                'n_total_datos': self.n_total,
+                'numero_corridas': numero_corridas,
+                'frecuencias_observadas': conteos,
+                'frecuencias_esperadas': esperados,
+                'direccion': self.direccion
+            }
+
+            if self.n_total < 4000:
+                resultado['advertencia'] = (
+                    "Con menos de 4000 datos la aproximación Chi-cuadrado de V es poco confiable.")
+
+            return resultado
+
+        except Exception as e:
+            return {'error': f'Error durante la ejecución: {str(e)}'}
+
+    def evaluar_alphas(self, resultado, alphas):
+        """
+        Calcula el valor crítico y la decisión para cada nivel de significancia
+        reutilizando el estadístico V ya calculado.
+        """
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(
+                1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Muestra una ventana con la tabla detallada de la prueba."""
+        resultado = self.ejecutar()
+
+        if 'error' in resultado:
+            if parent:
+                messagebox.showerror("Error", resultado['error'])
+            else:
+                print(f"Error: {resultado['error']}")
+            return None
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Corridas de Knuth")
+        ventana.geometry("700x550")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de Corridas de Knuth ({self.direccion})", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # --- Tabla de conteos ---
+        frame_conteos = ttk.LabelFrame(
+            main_frame, text="Conteos de Corridas", padding="10")
+        frame_conteos.pack(fill=tk.X, expand=True, pady=5)
+
+        cols = ('Longitud', 'Oi', 'Ei = n·bi', 'Oi - Ei')
+        tree = ttk.Treeview(frame_conteos, columns=cols,
+                            show='headings', height=7)
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, width=140, anchor='center')
+
+        observadas = resultado['frecuencias_observadas']
+        esperadas = resultado['frecuencias_esperadas']
+        for i in range(LONGITUD_MAXIMA):
+            etiqueta = f">= {i + 1}" if i == LONGITUD_MAXIMA - 1 else f"{i + 1}"
+            tree.insert('', 'end', values=(
+                etiqueta, f"{observadas[i]}", f"{esperadas[i]:.4f}", f"{observadas[i] - esperadas[i]:.4f}"))
+
+        tree.insert('', 'end', values=(
+            "TOTAL", f"{observadas.sum()}", f"{esperadas.sum():.4f}", "-"), tags=('total',))
+        tree.tag_configure(
+            'total', background='lightblue', font=("Arial", 9, "bold"))
+        tree.pack(fill=tk.X, expand=True)
+
+        # --- Resultados ---
+        frame_resultados = ttk.LabelFrame(
+            main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados,
+                  text=f"Estadístico V (forma cuadrática): {resultado['estadistico']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico (α={self.alpha}): {resultado['valor_critico']:.6f}").pack(
+            anchor=tk.W)
+        ttk.Label(frame_resultados,
+                  text=f"P-valor: {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Número total de datos: {resultado['n_total_datos']}").pack(
+            anchor=tk.W)
+        if 'advertencia' in resultado:
+            ttk.Label(frame_resultados, text=resultado['advertencia'],
+                      foreground="orange").pack(anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los datos NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los datos son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        return ventana
+
+
+def main():
+    """Función para probar el módulo independientemente."""
+    np.random.seed(0)
+    datos_test = np.random.rand(10000)
+
+    for direccion in ('ascendente', 'descendente'):
+        prueba = RachasKnuth(datos_test, alpha=0.05, direccion=direccion)
+        resultado = prueba.ejecutar()
+        print(f"Corridas de Knuth ({direccion})")
+        print(f"V: {resultado['estadistico']:.6f}")
+        print(f"P-valor: {resultado['p_valor']:.6f}")
+        print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    ventana = prueba.mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
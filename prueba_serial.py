@@ -0,0 +1,291 @@
+import numpy as np
+from scipy import stats
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Tamaño de bloque (en tuplas) para acotar la memoria a O(k^d) + O(bloque)
+TAMANO_BLOQUE = 1 << 20
+
+# Máximo de celdas que se listan en la tabla detallada
+MAX_FILAS_TABLA = 1000
+
+
+class PruebaSerial:
+    def __init__(self, datos, num_intervalos=4, dimension=2, solapada=False, alpha=0.05):
+        self.datos = np.asarray(datos, dtype=float)
+        self.num_intervalos = num_intervalos
+        self.dimension = dimension
+        self.solapada = solapada
+        self.alpha = alpha
+        self.n = len(self.datos)
+        self.num_celdas = num_intervalos ** dimension
+
+        if dimension not in (2, 3):
+            raise ValueError("La dimensión de las tuplas debe ser 2 o 3.")
+        if self.n < dimension:
+            raise ValueError(f"Se necesitan al menos {dimension} datos para formar una tupla.")
+
+    def _digitos(self, valores):
+        """Índice del intervalo de cada valor en [0, 1): floor(x*k)"""
+        return np.clip((valores * self.num_intervalos).astype(np.int64), 0, self.num_intervalos - 1)
+
+    def _codigos(self, digitos, num_tuplas, paso):
+        """Empaquetar cada tupla de dígitos en un solo entero (base k)"""
+        codigos = np.zeros(num_tuplas, dtype=np.int64)
+        for j in range(self.dimension):
+            codigos = codigos * self.num_intervalos + digitos[j:j + paso * num_tuplas:paso][:num_tuplas]
+        return codigos
+
+    def contar_celdas(self):
+        """Frecuencias de las k^d celdas con un bincount por bloque"""
+        d = self.dimension
+        conteos = np.zeros(self.num_celdas, dtype=np.int64)
+
+        if self.solapada:
+            # Tuplas solapadas circulares: una por cada posición i = 0..n-1
+            num_tuplas = self.n
+            for inicio in range(0, self.n, TAMANO_BLOQUE):
+                fin = min(inicio + TAMANO_BLOQUE, self.n)
+                valores = self.datos[inicio:fin + d - 1]
+                faltantes = (fin + d - 1) - self.n
+                if faltantes > 0:
+                    valores = np.concatenate((valores, self.datos[:faltantes]))
+                codigos = self._codigos(self._digitos(valores), fin - inicio, 1)
+                conteos += np.bincount(codigos, minlength=self.num_celdas)
+        else:
+            # Tuplas no solapadas: (x1..xd), (xd+1..x2d), ...
+            num_tuplas = self.n // d
+            for inicio in range(0, num_tuplas, TAMANO_BLOQUE):
+                fin = min(inicio + TAMANO_BLOQUE, num_tuplas)
+                valores = self.datos[inicio * d:fin * d]
+                codigos = self._codigos(self._digitos(valores), fin - inicio, d)
+                conteos += np.bincount(codigos, minlength=self.num_celdas)
+
+        return conteos, num_tuplas
+
+    def calcular_estadistico(self):
+        """Calcular el estadístico de la prueba serial"""
+        freq_obs, num_tuplas = self.contar_celdas()
+        freq_esp = num_tuplas / self.num_celdas
+
+        # psi² de las tuplas de dimensión d
+        psi2 = np.sum((freq_obs - freq_esp) ** 2 / freq_esp)
+
+        if not self.solapada:
+            return psi2, self.num_celdas - 1, freq_obs, freq_esp, num_tuplas, None
+
+        # Solapadas: las celdas no son independientes, se usa la diferencia de Good
+        # psi²_d - psi²_(d-1), donde las tuplas de dimensión d-1 son los prefijos circulares
+        freq_obs_menor = freq_obs.reshape(-1, self.num_intervalos).sum(axis=1)
+        freq_esp_menor = num_tuplas / freq_obs_menor.size
+        psi2_menor = np.sum((freq_obs_menor - freq_esp_menor) ** 2 / freq_esp_menor)
+
+        grados_libertad = self.num_celdas - freq_obs_menor.size
+        return psi2 - psi2_menor, grados_libertad, freq_obs, freq_esp, num_tuplas, (psi2, psi2_menor)
+
+    def ejecutar(self):
+        """Ejecutar la prueba serial"""
+        try:
+            estadistico, gl, freq_obs, freq_esp, num_tuplas, psi2 = self.calcular_estadistico()
+            valor_critico = stats.chi2.ppf(1 - self.alpha, gl)
+
+            # Calcular p-valor
+            p_valor = stats.chi2.sf(estadistico, gl)
+
+            # Decisión de la prueba
+            rechaza_h0 = estadistico > valor_critico
+
+            resultado = {
+                'estadistico': estadistico,
+                'grados_libertad': gl,
+                'valor_critico': valor_critico,
+                'p_valor': p_valor,
+                'rechaza_h0': rechaza_h0,
+                'frecuencias_observadas': freq_obs,
+                'frecuencia_esperada': freq_esp,
+                'tipo_prueba': f"Serial {self.dimension}D ({'solapada' if self.solapada else 'no solapada'})",
+                'alpha': self.alpha,
+                'n': self.n,
+                'num_tuplas': num_tuplas,
+                'num_intervalos': self.num_intervalos,
+                'dimension': self.dimension,
+                'solapada': self.solapada
+            }
+
+            if psi2 is not None:
+                resultado['psi2'], resultado['psi2_menor'] = psi2
+
+            return resultado
+
+        except Exception as e:
+            raise Exception(f"Error en prueba Serial: {str(e)}")
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def etiqueta_celda(self, codigo):
+        """Convertir el código empaquetado de una celda en su tupla de intervalos"""
+        digitos = np.unravel_index(codigo, (self.num_intervalos,) * self.dimension)
+        return "(" + ", ".join(str(int(d) + 1) for d in digitos) + ")"
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba Serial"""
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba Serial")
+        ventana.geometry("800x700")
+
+        # Ejecutar la prueba para obtener datos
+        resultado = self.ejecutar()
+        freq_obs = resultado['frecuencias_observadas']
+        freq_esp = resultado['frecuencia_esperada']
+
+        # Frame principal
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Título
+        titulo = ttk.Label(main_frame, text=f"Prueba {resultado['tipo_prueba']} - Tabla Detallada",
+                          font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        # Crear tabla
+        columns = ('Celda', 'Oi', 'Ei', '(Oi-Ei)²/Ei')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+
+        # Definir encabezados
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor='center')
+
+        # Llenar datos (solo las primeras celdas si son demasiadas)
+        contribuciones = (freq_obs - freq_esp) ** 2 / freq_esp
+        for codigo in range(min(len(freq_obs), MAX_FILAS_TABLA)):
+            tree.insert('', 'end', values=(
+                self.etiqueta_celda(codigo),
+                f"{freq_obs[codigo]}",
+                f"{freq_esp:.2f}",
+                f"{contribuciones[codigo]:.4f}"
+            ))
+
+        if len(freq_obs) > MAX_FILAS_TABLA:
+            tree.insert('', 'end', values=(f"... {len(freq_obs) - MAX_FILAS_TABLA} celdas más", "-", "-", "-"))
+
+        # Agregar fila de totales
+        tree.insert('', 'end', values=(
+            "TOTAL",
+            f"{freq_obs.sum()}",
+            f"{freq_esp * len(freq_obs):.2f}",
+            f"{contribuciones.sum():.4f}"
+        ), tags=('total',))
+
+        # Estilo para la fila total
+        tree.tag_configure('total', background='lightblue')
+
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        fila = 0
+        if self.solapada:
+            ttk.Label(frame_resultados, text=f"ψ² (d={self.dimension}): {resultado['psi2']:.6f}   "
+                                             f"ψ² (d={self.dimension - 1}): {resultado['psi2_menor']:.6f}").grid(row=fila, column=0, sticky=tk.W)
+            fila += 1
+        ttk.Label(frame_resultados, text=f"Estadístico calculado: {resultado['estadistico']:.6f}").grid(row=fila, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").grid(row=fila + 1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=fila + 2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=fila + 3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Nivel de significancia: {self.alpha}").grid(row=fila + 4, column=0, sticky=tk.W)
+
+        # Decisión
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                  foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=fila + 5, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_serial(main_frame, resultado)
+
+        # Configurar weights
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_serial(self, parent, resultado):
+        """Crear gráfico de desviaciones estandarizadas por celda"""
+        # Frame para el gráfico
+        frame_grafico = ttk.LabelFrame(parent, text="Desviaciones por Celda", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, ax = plt.subplots(figsize=(8, 4))
+
+        freq_esp = resultado['frecuencia_esperada']
+        desviaciones = (resultado['frecuencias_observadas'] - freq_esp) / np.sqrt(freq_esp)
+
+        if self.dimension == 2:
+            # Mapa de calor k x k de (Oi-Ei)/sqrt(Ei)
+            mapa = desviaciones.reshape(self.num_intervalos, self.num_intervalos)
+            limite = max(np.max(np.abs(mapa)), 1e-9)
+            imagen = ax.imshow(mapa, cmap='coolwarm', vmin=-limite, vmax=limite, origin='lower')
+            fig.colorbar(imagen, ax=ax, label='(Oi-Ei)/√Ei')
+            ax.set_xlabel('Intervalo de x(i+1)')
+            ax.set_ylabel('Intervalo de x(i)')
+        else:
+            ax.bar(np.arange(len(desviaciones)), desviaciones, color='skyblue')
+            ax.axhline(0, color='black', linewidth=1)
+            ax.set_xlabel('Celda (código)')
+            ax.set_ylabel('(Oi-Ei)/√Ei')
+            ax.grid(True, alpha=0.3)
+
+        ax.set_title('Desviaciones Estandarizadas por Celda')
+        plt.tight_layout()
+
+        # Integrar en tkinter
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+def main():
+    """Función para probar el módulo independientemente"""
+    # Generar datos de prueba
+    np.random.seed(42)
+    datos_test = np.random.uniform(0, 1, 10000)
+
+    for dimension in (2, 3):
+        for solapada in (False, True):
+            prueba = PruebaSerial(datos_test, num_intervalos=4, dimension=dimension, solapada=solapada, alpha=0.05)
+            resultado = prueba.ejecutar()
+
+            print(f"Prueba {resultado['tipo_prueba']}")
+            print("=" * 30)
+            print(f"Estadístico: {resultado['estadistico']:.6f}")
+            print(f"Grados de libertad: {resultado['grados_libertad']}")
+            print(f"P-valor: {resultado['p_valor']:.6f}")
+            print(f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    # Mostrar tabla detallada
+    ventana = PruebaSerial(datos_test, num_intervalos=4, dimension=2).mostrar_tabla_detallada()
+    ventana.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,704 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+import tkinter as tk
+from tkinter import ttk
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from utilidades_rachas import contar_rachas, longitudes_rachas
+
+# Palabras por bloque al procesar un array completo
+TAMANO_BLOQUE = 1 << 20
+
+# Bytes por llamada a bincount: en trozos que caben en caché es más rápido
+TAMANO_TROZO = 1 << 16
+
+# Unos en cada valor de byte
+TABLA_POPCOUNT = np.array([bin(b).count('1') for b in range(256)], dtype=np.int64)
+
+# TABLA_BITS[b, j] = bit j (0 = menos significativo) del byte b
+TABLA_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1,
+                           bitorder='little').astype(np.int64)
+
+# Longitud de racha a partir de la cual se agrupa en la tabla detallada
+MAX_LONGITUD_TABLA = 16
+
+
+def validar_palabras(datos):
+    """
+    Array 1-D contiguo de enteros sin signo (salida cruda del generador) en
+    orden little-endian, de modo que el bit 0 de cada palabra es el primero
+    del flujo de bits. Lanza ValueError si los datos no son enteros sin signo.
+    """
+    palabras = np.asarray(datos)
+    if palabras.dtype.kind != 'u':
+        raise ValueError(
+            "Las pruebas de bits necesitan enteros sin signo (por ejemplo uint32 o uint64).")
+    return np.ascontiguousarray(palabras.ravel(), dtype=palabras.dtype.newbyteorder('<'))
+
+
+def bytes_palabras(palabras):
+    """Vista uint8 sin copia con forma (n, bytes por palabra); la columna j es el byte j"""
+    return palabras.view(np.uint8).reshape(-1, palabras.dtype.itemsize)
+
+
+def histograma_bytes(bytes_):
+    """Frecuencia de cada valor de byte (bincount por trozos)"""
+    conteos = np.zeros(256, dtype=np.int64)
+    for inicio in range(0, bytes_.size, TAMANO_TROZO):
+        conteos += np.bincount(bytes_[inicio:inicio + TAMANO_TROZO], minlength=256)
+    return conteos
+
+
+def histogramas_por_byte(palabras):
+    """Frecuencias (bytes por palabra, 256) de cada valor en cada posición de byte"""
+    columnas = bytes_palabras(palabras)
+    return np.stack([np.bincount(columnas[:, j], minlength=256)
+                     for j in range(columnas.shape[1])])
+
+
+def unos_por_posicion(histogramas):
+    """Unos en cada posición de bit (0 = menos significativo) a partir de los histogramas por byte"""
+    return (histogramas @ TABLA_BITS).ravel()
+
+
+def contar_unos(palabras):
+    """
+    Total de unos de las palabras: np.bitwise_count (NumPy >= 2.0, usa la
+    instrucción popcount) o, si no está, TABLA_POPCOUNT sobre los bytes.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(palabras).sum(dtype=np.int64))
+    return int(histograma_bytes(palabras.view(np.uint8)) @ TABLA_POPCOUNT)
+
+
+def cambios_bloque(palabras):
+    """
+    Número de cambios entre bits consecutivos dentro del bloque: se compara
+    cada palabra con ella misma desplazada un bit (tomando el bit 0 de la
+    palabra siguiente) con XOR y se cuentan los unos del resultado.
+    """
+    ancho = palabras.dtype.itemsize * 8
+    tipo = palabras.dtype.type
+    siguientes = np.empty_like(palabras)
+    siguientes[:-1] = palabras[1:] << tipo(ancho - 1)
+    siguientes[-1] = 0
+    diferencias = palabras ^ ((palabras >> tipo(1)) | siguientes)
+    # El último bit del bloque no tiene sucesor dentro del bloque
+    diferencias[-1] &= tipo((1 << (ancho - 1)) - 1)
+    return contar_unos(diferencias)
+
+
+class _PruebaPalabras:
+    """Procesamiento por bloques común a las pruebas de bits."""
+
+    # Las fuentes alimentan estas pruebas con la salida entera cruda
+    usa_enteros = True
+
+    def _procesar(self, datos):
+        if datos is not None:
+            datos = validar_palabras(datos)
+            for inicio in range(0, datos.size, TAMANO_BLOQUE):
+                self.actualizar(datos[inicio:inicio + TAMANO_BLOQUE])
+
+    def _validar_bloque(self, bloque):
+        """Valida el bloque y fija el ancho de palabra con el primero"""
+        palabras = validar_palabras(bloque)
+        if self.ancho is None:
+            self.ancho = palabras.dtype.itemsize * 8
+        elif palabras.dtype.itemsize * 8 != self.ancho:
+            raise ValueError("Todos los bloques deben tener el mismo tipo de entero.")
+        return palabras
+
+
+class PruebaMonobit(_PruebaPalabras):
+    """
+    Prueba de frecuencia de bits (monobit, NIST SP 800-22) sobre la salida
+    entera del generador: S = #unos - #ceros y Z = S / sqrt(n_bits).
+    Además contrasta cada posición de bit por separado (chi² con un grado
+    de libertad por posición), donde se ven los bits bajos débiles que las
+    pruebas sobre [0, 1) no detectan.
+
+    Los unos se cuentan con un bincount por posición de byte y TABLA_BITS,
+    sin desempaquetar los bits.
+    """
+
+    def __init__(self, datos=None, alpha=0.05, histogramas=None):
+        """
+        :param datos: Array de enteros sin signo (opcional en modo por bloques).
+        :param alpha: Nivel de significancia para la prueba.
+        :param histogramas: Histogramas por byte ya calculados (histogramas_por_byte).
+        """
+        self.alpha = alpha
+        self.ancho = None
+        self.n_palabras = 0
+        self.histogramas = None
+        if histogramas is not None:
+            self.histogramas = np.asarray(histogramas, dtype=np.int64)
+            self.ancho = self.histogramas.shape[0] * 8
+            self.n_palabras = int(self.histogramas[0].sum())
+        else:
+            self._procesar(datos)
+
+    def actualizar(self, bloque):
+        """Acumula los histogramas por byte del bloque."""
+        palabras = self._validar_bloque(bloque)
+        if palabras.size == 0:
+            return
+        histogramas = histogramas_por_byte(palabras)
+        self.histogramas = histogramas if self.histogramas is None else self.histogramas + histogramas
+        self.n_palabras += palabras.size
+
+    def ejecutar(self):
+        """Ejecuta la prueba con los datos procesados hasta el momento."""
+        if self.n_palabras == 0:
+            return {'error': 'No hay datos para la prueba monobit.'}
+
+        unos_posicion = unos_por_posicion(self.histogramas)
+        n_bits = self.n_palabras * self.ancho
+        unos = int(unos_posicion.sum())
+
+        z_calculado = (2 * unos - n_bits) / np.sqrt(n_bits)
+        z_critico = stats.norm.ppf(1 - self.alpha / 2)
+        p_valor = 2 * stats.norm.sf(abs(z_calculado))
+
+        # Cada posición de bit por separado
+        z_posiciones = (2 * unos_posicion - self.n_palabras) / np.sqrt(self.n_palabras)
+        chi_posiciones = float(np.sum(z_posiciones ** 2))
+        # Corrección de Bonferroni para señalar posiciones
+        z_critico_posicion = stats.norm.ppf(1 - self.alpha / (2 * self.ancho))
+
+        return {
+            'estadistico_z': z_calculado,
+            'valor_critico_z': z_critico,
+            'p_valor': p_valor,
+            'rechaza_h0': abs(z_calculado) > z_critico,
+            'tipo_prueba': 'Monobit',
+            'alpha': self.alpha,
+            'n_palabras': self.n_palabras,
+            'ancho_palabra': self.ancho,
+            'n_bits': n_bits,
+            'unos': unos,
+            'unos_por_posicion': unos_posicion,
+            'z_por_posicion': z_posiciones,
+            'chi_cuadrado_posiciones': chi_posiciones,
+            'p_valor_posiciones': stats.chi2.sf(chi_posiciones, self.ancho),
+            'valor_critico_posicion': z_critico_posicion,
+            'posiciones_significativas': np.flatnonzero(np.abs(z_posiciones) > z_critico_posicion)
+        }
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico Z y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            z_critico = stats.norm.ppf(1 - alpha / 2)
+            decisiones[alpha] = {
+                'valor_critico': z_critico,
+                'rechaza_h0': abs(resultado['estadistico_z']) > z_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba monobit"""
+        resultado = self.ejecutar()
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Prueba Monobit")
+        ventana.geometry("900x700")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        titulo = ttk.Label(main_frame, text=f"Prueba Monobit - Palabras de {resultado['ancho_palabra']} bits",
+                           font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        # Tabla por posición de bit
+        columns = ('Bit', 'Unos', 'Proporción', 'Z')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor='center')
+        significativas = set(resultado['posiciones_significativas'].tolist())
+        for posicion, (unos, z) in enumerate(zip(resultado['unos_por_posicion'], resultado['z_por_posicion'])):
+            tree.insert('', 'end', values=(
+                f"{posicion}", f"{unos}", f"{unos / resultado['n_palabras']:.6f}", f"{z:.4f}"),
+                tags=('significativa',) if posicion in significativas else ())
+        tree.tag_configure('significativa', background='salmon')
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+
+        # Resultados
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"Unos: {resultado['unos']} de {resultado['n_bits']} bits").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Estadístico Z: {resultado['estadistico_z']:.6f}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: ±{resultado['valor_critico_z']:.6f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=3, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Chi² por posición: {resultado['chi_cuadrado_posiciones']:.4f} "
+                                         f"(p-valor {resultado['p_valor_posiciones']:.6f})").grid(row=4, column=0, sticky=tk.W)
+
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                   foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=5, column=0, sticky=tk.W, pady=5)
+
+        # Gráfico
+        self.crear_grafico_monobit(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_monobit(self, parent, resultado):
+        """Crear gráfico de Z por posición de bit"""
+        frame_grafico = ttk.LabelFrame(parent, text="Z por Posición de Bit", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, ax = plt.subplots(figsize=(10, 3.5))
+
+        z = resultado['z_por_posicion']
+        colores = np.where(np.abs(z) > resultado['valor_critico_posicion'], 'red', 'skyblue')
+        ax.bar(np.arange(z.size), z, color=colores)
+        for signo in (1, -1):
+            ax.axhline(signo * resultado['valor_critico_posicion'], color='red', linestyle='--')
+        ax.set_xlabel('Posición de bit (0 = menos significativo)')
+        ax.set_ylabel('Z')
+        ax.set_title('Balance de Unos por Posición')
+        ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+
+class PruebaRachasBits(_PruebaPalabras):
+    """
+    Prueba de rachas de bits (NIST SP 800-22) sobre la salida entera del
+    generador. Sin posición se usa el flujo completo (bit 0 de cada palabra
+    primero) y los cambios se cuentan con XOR y popcount; con una
+    posición se toma la secuencia de ese bit a lo largo de las palabras y se
+    usa el RLE de utilidades_rachas, lo que además da las longitudes.
+    V = cambios + 1 y Z = (V - 2n pi(1-pi)) / (2 sqrt(n) pi(1-pi)).
+    """
+
+    def __init__(self, datos=None, alpha=0.05, posicion=None):
+        """
+        :param datos: Array de enteros sin signo (opcional en modo por bloques).
+        :param alpha: Nivel de significancia para la prueba.
+        :param posicion: Posición de bit a analizar (None = flujo completo).
+        """
+        self.alpha = alpha
+        self.posicion = posicion
+        self.ancho = None
+
+        # Estado acumulado
+        self.n_bits = 0
+        self.unos = 0
+        self.cambios = 0
+        self.ultimo_bit = None
+        self.frecuencias = np.zeros(0, dtype=np.int64)
+        self.racha_pendiente = 0
+
+        self._procesar(datos)
+
+    def actualizar(self, bloque):
+        """Cuenta unos y cambios del bloque, incluido el cambio con el bloque anterior."""
+        palabras = self._validar_bloque(bloque)
+        if palabras.size == 0:
+            return
+        if self.posicion is not None and not 0 <= self.posicion < self.ancho:
+            raise ValueError(f"La posición de bit debe estar entre 0 y {self.ancho - 1}.")
+
+        if self.posicion is None:
+            primer_bit = int(palabras[0] & 1)
+            self.unos += contar_unos(palabras)
+            self.cambios += cambios_bloque(palabras)
+            self.n_bits += palabras.size * self.ancho
+            nuevo_ultimo = int(palabras[-1] >> palabras.dtype.type(self.ancho - 1))
+        else:
+            bits = ((palabras >> palabras.dtype.type(self.posicion)) & 1).astype(bool)
+            primer_bit = int(bits[0])
+            self.unos += int(np.count_nonzero(bits))
+            self.cambios += contar_rachas(bits) - 1
+            self.n_bits += bits.size
+            nuevo_ultimo = int(bits[-1])
+            self._acumular_longitudes(bits, primer_bit)
+
+        if self.ultimo_bit is not None and primer_bit != self.ultimo_bit:
+            self.cambios += 1
+        self.ultimo_bit = nuevo_ultimo
+
+    def _acumular_longitudes(self, bits, primer_bit):
+        """Longitudes de racha del bloque; la última queda pendiente por si sigue en el próximo"""
+        longitudes = longitudes_rachas(bits)
+        if self.ultimo_bit is not None:
+            if primer_bit == self.ultimo_bit:
+                longitudes[0] += self.racha_pendiente
+            else:
+                longitudes = np.concatenate(([self.racha_pendiente], longitudes))
+        self.racha_pendiente = int(longitudes[-1])
+        self._sumar_frecuencias(longitudes[:-1])
+
+    def _sumar_frecuencias(self, longitudes):
+        conteos = np.bincount(longitudes)
+        if conteos.size > self.frecuencias.size:
+            conteos[:self.frecuencias.size] += self.frecuencias
+            self.frecuencias = conteos
+        else:
+            self.frecuencias[:conteos.size] += conteos
+
+    def ejecutar(self):
+        """Ejecuta la prueba con los datos procesados hasta el momento."""
+        n = self.n_bits
+        if n < 2:
+            return {'error': 'Se necesitan al menos 2 bits para la prueba de rachas.'}
+
+        pi = self.unos / n
+        rachas = self.cambios + 1
+        resultado = {
+            'rachas_observadas': rachas,
+            'unos': self.unos,
+            'proporcion_unos': pi,
+            'tipo_prueba': 'Rachas de Bits' + (f' (bit {self.posicion})' if self.posicion is not None else ''),
+            'alpha': self.alpha,
+            'n_bits': n,
+            'posicion': self.posicion
+        }
+
+        if self.posicion is not None:
+            frecuencias = self.frecuencias.copy()
+            if self.racha_pendiente:
+                if self.racha_pendiente >= frecuencias.size:
+                    frecuencias = np.concatenate((frecuencias, np.zeros(self.racha_pendiente - frecuencias.size + 1, dtype=np.int64)))
+                frecuencias[self.racha_pendiente] += 1
+            resultado['frecuencias_longitud'] = {
+                int(k): int(frecuencias[k]) for k in np.flatnonzero(frecuencias)}
+
+        # Requisito NIST: la proporción de unos debe ser cercana a 1/2
+        if abs(pi - 0.5) >= 2 / np.sqrt(n):
+            resultado.update({
+                'estadistico_z': np.inf,
+                'valor_critico_z': stats.norm.ppf(1 - self.alpha / 2),
+                'p_valor': 0.0,
+                'rechaza_h0': True,
+                'rachas_esperadas': 2 * n * pi * (1 - pi),
+                'advertencia': 'La proporción de unos está lejos de 1/2 (no pasa la prueba monobit); '
+                               'la prueba de rachas no aplica y se rechaza H0.'
+            })
+            return resultado
+
+        esperadas = 2 * n * pi * (1 - pi)
+        z_calculado = (rachas - esperadas) / (2 * np.sqrt(n) * pi * (1 - pi))
+        z_critico = stats.norm.ppf(1 - self.alpha / 2)
+        resultado.update({
+            'rachas_esperadas': esperadas,
+            'estadistico_z': z_calculado,
+            'valor_critico_z': z_critico,
+            'p_valor': 2 * stats.norm.sf(abs(z_calculado)),
+            'rechaza_h0': abs(z_calculado) > z_critico
+        })
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico Z y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            z_critico = stats.norm.ppf(1 - alpha / 2)
+            decisiones[alpha] = {
+                'valor_critico': z_critico,
+                'rechaza_h0': abs(resultado['estadistico_z']) > z_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba de rachas de bits"""
+        resultado = self.ejecutar()
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Rachas de Bits")
+        ventana.geometry("700x600")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de {resultado['tipo_prueba']}", font=(
+            "Arial", 14, "bold"))
+        titulo.pack(pady=10)
+
+        # Con una posición de bit se listan las longitudes de racha
+        if 'frecuencias_longitud' in resultado:
+            frame_tabla = ttk.LabelFrame(main_frame, text="Longitudes de Racha", padding="10")
+            frame_tabla.pack(fill=tk.BOTH, expand=True, pady=5)
+
+            cols = ('Longitud', 'Observadas', 'Esperadas')
+            tree = ttk.Treeview(frame_tabla, columns=cols, show='headings', height=10)
+            for col in cols:
+                tree.heading(col, text=col)
+                tree.column(col, width=180, anchor='center')
+
+            n = resultado['n_bits']
+            frecuencias = resultado['frecuencias_longitud']
+            for k in range(1, MAX_LONGITUD_TABLA):
+                # Rachas de longitud exactamente k en n bits equiprobables: (n - k + 3) / 2^(k+1)
+                tree.insert('', 'end', values=(
+                    f"{k}", f"{frecuencias.get(k, 0)}", f"{(n - k + 3) / 2 ** (k + 1):.2f}"))
+            mayores = sum(f for k, f in frecuencias.items() if k >= MAX_LONGITUD_TABLA)
+            esperadas_mayores = sum((n - k + 3) / 2 ** (k + 1) for k in range(MAX_LONGITUD_TABLA, 64))
+            tree.insert('', 'end', values=(
+                f"≥ {MAX_LONGITUD_TABLA}", f"{mayores}", f"{esperadas_mayores:.2f}"))
+
+            tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados Finales", padding="10")
+        frame_resultados.pack(fill=tk.X, expand=True, pady=10)
+
+        ttk.Label(frame_resultados, text=f"Bits analizados: {resultado['n_bits']}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Proporción de unos (π): {resultado['proporcion_unos']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Rachas observadas (V): {resultado['rachas_observadas']}  -  "
+                                         f"Esperadas: {resultado['rachas_esperadas']:.2f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Estadístico Z: {resultado['estadistico_z']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: ±{resultado['valor_critico_z']:.6f}").pack(anchor=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").pack(anchor=tk.W)
+        if 'advertencia' in resultado:
+            ttk.Label(frame_resultados, text=resultado['advertencia'], foreground="orange").pack(anchor=tk.W)
+
+        decision_text = "Se RECHAZA H₀ (Los bits NO son independientes)" if resultado[
+            'rechaza_h0'] else "NO se rechaza H₀ (Los bits son independientes)"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        ttk.Label(frame_resultados, text=f"Decisión: {decision_text}", foreground=color, font=(
+            "Arial", 10, "bold")).pack(anchor=tk.W, pady=5)
+
+        return ventana
+
+
+class PruebaFrecuenciaBytes(_PruebaPalabras):
+    """
+    Prueba de frecuencia de bytes: Chi-cuadrado con 255 gl sobre los 256
+    valores posibles, de todos los bytes de cada palabra o de una sola
+    posición de byte (0 = byte menos significativo).
+    """
+
+    def __init__(self, datos=None, alpha=0.05, posicion_byte=None, histogramas=None):
+        """
+        :param datos: Array de enteros sin signo (opcional en modo por bloques).
+        :param alpha: Nivel de significancia para la prueba.
+        :param posicion_byte: Posición de byte a analizar (None = todos).
+        :param histogramas: Histogramas por byte ya calculados (histogramas_por_byte).
+        """
+        self.alpha = alpha
+        self.posicion_byte = posicion_byte
+        self.ancho = None
+        self.conteos = np.zeros(256, dtype=np.int64)
+        if histogramas is not None:
+            histogramas = np.asarray(histogramas, dtype=np.int64)
+            self.ancho = histogramas.shape[0] * 8
+            self.conteos = histogramas.sum(axis=0) if posicion_byte is None else histogramas[posicion_byte].copy()
+        else:
+            self._procesar(datos)
+
+    def actualizar(self, bloque):
+        """Acumula la frecuencia de cada valor de byte del bloque."""
+        palabras = self._validar_bloque(bloque)
+        if self.posicion_byte is None:
+            self.conteos += histograma_bytes(palabras.view(np.uint8))
+        else:
+            if not 0 <= self.posicion_byte < self.ancho // 8:
+                raise ValueError(f"La posición de byte debe estar entre 0 y {self.ancho // 8 - 1}.")
+            self.conteos += np.bincount(bytes_palabras(palabras)[:, self.posicion_byte], minlength=256)
+
+    def ejecutar(self):
+        """Ejecuta la prueba con los datos procesados hasta el momento."""
+        total = int(self.conteos.sum())
+        if total == 0:
+            return {'error': 'No hay datos para la prueba de frecuencia de bytes.'}
+
+        esperada = total / 256
+        chi_stat = float(np.sum((self.conteos - esperada) ** 2) / esperada)
+        gl = 255
+        valor_critico = stats.chi2.ppf(1 - self.alpha, gl)
+
+        resultado = {
+            'estadistico': chi_stat,
+            'grados_libertad': gl,
+            'valor_critico': valor_critico,
+            'p_valor': stats.chi2.sf(chi_stat, gl),
+            'rechaza_h0': chi_stat > valor_critico,
+            'frecuencias_observadas': self.conteos.copy(),
+            'frecuencia_esperada': esperada,
+            'tipo_prueba': 'Frecuencia de Bytes' + (
+                f' (byte {self.posicion_byte})' if self.posicion_byte is not None else ''),
+            'alpha': self.alpha,
+            'n_bytes': total
+        }
+
+        if esperada < 5:
+            resultado['advertencia'] = (
+                f"La frecuencia esperada por valor ({esperada:.2f}) es menor que 5; "
+                "se necesitan más datos.")
+
+        return resultado
+
+    def evaluar_alphas(self, resultado, alphas):
+        """Valor crítico y decisión para cada alpha sin recalcular el estadístico"""
+        decisiones = {}
+        for alpha in alphas:
+            valor_critico = stats.chi2.ppf(1 - alpha, resultado['grados_libertad'])
+            decisiones[alpha] = {
+                'valor_critico': valor_critico,
+                'rechaza_h0': resultado['estadistico'] > valor_critico
+            }
+        return decisiones
+
+    def mostrar_tabla_detallada(self, parent=None):
+        """Mostrar tabla detallada de la prueba de frecuencia de bytes"""
+        resultado = self.ejecutar()
+        freq_obs = resultado['frecuencias_observadas']
+        freq_esp = resultado['frecuencia_esperada']
+
+        ventana = tk.Toplevel(parent) if parent else tk.Tk()
+        ventana.title("Tabla Detallada - Frecuencia de Bytes")
+        ventana.geometry("800x700")
+
+        main_frame = ttk.Frame(ventana, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        titulo = ttk.Label(main_frame, text=f"Prueba de {resultado['tipo_prueba']} - Tabla Detallada",
+                           font=("Arial", 14, "bold"))
+        titulo.grid(row=0, column=0, columnspan=2, pady=10)
+
+        columns = ('Byte', 'Oi', 'Ei', '(Oi-Ei)²/Ei')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=150, anchor='center')
+
+        contribuciones = (freq_obs - freq_esp) ** 2 / freq_esp
+        for valor in range(256):
+            tree.insert('', 'end', values=(
+                f"0x{valor:02X}", f"{freq_obs[valor]}", f"{freq_esp:.2f}", f"{contribuciones[valor]:.4f}"))
+        tree.insert('', 'end', values=(
+            "TOTAL", f"{freq_obs.sum()}", f"{freq_esp * 256:.2f}", f"{contribuciones.sum():.4f}"
+        ), tags=('total',))
+        tree.tag_configure('total', background='lightblue')
+        tree.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        scrollbar = ttk.Scrollbar(main_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.grid(row=1, column=2, sticky=(tk.N, tk.S))
+
+        frame_resultados = ttk.LabelFrame(main_frame, text="Resultados", padding="10")
+        frame_resultados.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
+
+        ttk.Label(frame_resultados, text=f"Chi-cuadrado calculado: {resultado['estadistico']:.6f}").grid(row=0, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Grados de libertad: {resultado['grados_libertad']}").grid(row=1, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"Valor crítico: {resultado['valor_critico']:.6f}").grid(row=2, column=0, sticky=tk.W)
+        ttk.Label(frame_resultados, text=f"P-valor: {resultado['p_valor']:.6f}").grid(row=3, column=0, sticky=tk.W)
+        if 'advertencia' in resultado:
+            ttk.Label(frame_resultados, text=resultado['advertencia'], foreground="orange").grid(row=4, column=0, sticky=tk.W)
+
+        decision_text = "Se RECHAZA H0" if resultado['rechaza_h0'] else "NO se rechaza H0"
+        color = "red" if resultado['rechaza_h0'] else "green"
+        decision_label = ttk.Label(frame_resultados, text=f"Decisión: {decision_text}",
+                                   foreground=color, font=("Arial", 10, "bold"))
+        decision_label.grid(row=5, column=0, sticky=tk.W, pady=5)
+
+        self.crear_grafico_bytes(main_frame, resultado)
+
+        ventana.columnconfigure(0, weight=1)
+        ventana.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        return ventana
+
+    def crear_grafico_bytes(self, parent, resultado):
+        """Crear gráfico de frecuencias por valor de byte"""
+        frame_grafico = ttk.LabelFrame(parent, text="Frecuencias por Valor de Byte", padding="5")
+        frame_grafico.grid(row=3, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
+
+        fig, ax = plt.subplots(figsize=(10, 3.5))
+        ax.bar(np.arange(256), resultado['frecuencias_observadas'], width=1.0, color='skyblue', label='Observada')
+        ax.axhline(resultado['frecuencia_esperada'], color='red', linestyle='--', label='Esperada')
+        ax.set_xlim(-0.5, 255.5)
+        ax.set_xlabel('Valor del byte')
+        ax.set_ylabel('Frecuencia')
+        ax.set_title('Frecuencias Observadas vs Esperadas')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, frame_grafico)
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+
+
+def medir_rendimiento(megabytes=64, tipo=np.uint64, repeticiones=3):
+    """
+    Mide el rendimiento (MB/s) de cada prueba de bits sobre palabras
+    aleatorias. Retorna un DataFrame con el mejor tiempo de cada prueba.
+    """
+    n_palabras = int(megabytes * 2 ** 20) // np.dtype(tipo).itemsize
+    palabras = np.random.default_rng(0).integers(0, np.iinfo(tipo).max, n_palabras,
+                                                 dtype=tipo, endpoint=True)
+    pruebas = {
+        'Monobit': lambda: PruebaMonobit(palabras).ejecutar(),
+        'Rachas de bits': lambda: PruebaRachasBits(palabras).ejecutar(),
+        'Rachas del bit 0': lambda: PruebaRachasBits(palabras, posicion=0).ejecutar(),
+        'Frecuencia de bytes': lambda: PruebaFrecuenciaBytes(palabras).ejecutar(),
+    }
+    filas = []
+    for nombre, ejecutar in pruebas.items():
+        mejor = np.inf
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            ejecutar()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        filas.append({'prueba': nombre, 'segundos': mejor, 'MB_por_segundo': megabytes / mejor})
+    return pd.DataFrame(filas)
+
+
+def main():
+    """Función para probar el módulo independientemente"""
+    rng = np.random.default_rng(42)
+    palabras = rng.integers(0, 2 ** 32, 100_000, dtype=np.uint32)
+
+    # LCG módulo 2^32: el bit 0 alterna, los bits bajos tienen período corto
+    lcg = np.empty(100_000, dtype=np.uint32)
+    lcg[0] = 12345
+    with np.errstate(over='ignore'):
+        for i in range(1, lcg.size):
+            lcg[i] = lcg[i - 1] * np.uint32(1664525) + np.uint32(1013904223)
+
+    for nombre, datos in (('PCG64', palabras), ('LCG', lcg)):
+        print(f"\n{nombre}")
+        print("=" * 30)
+        for prueba in (PruebaMonobit(datos), PruebaRachasBits(datos),
+                       PruebaRachasBits(datos, posicion=0), PruebaFrecuenciaBytes(datos)):
+            resultado = prueba.ejecutar()
+            print(f"{resultado['tipo_prueba']}: p-valor = {resultado['p_valor']:.6f}  "
+                  f"¿Rechaza H0?: {resultado['rechaza_h0']}")
+
+    print("\nRendimiento:")
+    print(medir_rendimiento().to_string(index=False))
+
+    ventana = PruebaMonobit(lcg).mostrar_tabla_detallada()
+    ventana.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import os
+import time
+
+import numpy as np
+from scipy import stats
+
+from acumuladores import (AcumuladorChi, AcumuladorRachasAscDesc,
+                          AcumuladorRachasEncimaDebajo)
+from checkpoint import (cargar_checkpoint, estados_con_prefijo,
+                        guardar_checkpoint)
+from fuentes import FUENTES, TAMANO_BLOQUE, crear_fuente
+from lectura import abrir_datos, leer_bloques
+
+# Segundos entre checkpoints al evaluar un archivo (cada uno pesa unos KB)
+INTERVALO_CHECKPOINT = 30.0
+
+# Valores anteriores al punto de reanudación que se guardan para comprobar
+# que el archivo es el mismo
+VALORES_HUELLA = 1024
+
+# Acumuladores disponibles en modo secuencial
+ACUMULADORES = {
+    'chi_cuadrado': ("Chi-cuadrado", AcumuladorChi),
+    'rachas_encima_debajo': ("Rachas Enc/Deb", AcumuladorRachasEncimaDebajo),
+    'rachas_ascendentes_descendentes': ("Rachas Asc/Desc", AcumuladorRachasAscDesc),
+}
+
+
+def gasto_obrien_fleming(t, alpha):
+    """Alpha gastado hasta la fracción t (tipo O'Brien-Fleming de Lan y DeMets): casi nada al principio"""
+    t = np.clip(t, 1e-12, 1.0)
+    return float(2 * stats.norm.sf(stats.norm.isf(alpha / 2) / np.sqrt(t)))
+
+
+def gasto_pocock(t, alpha):
+    """Alpha gastado hasta la fracción t (tipo Pocock de Lan y DeMets): reparto casi uniforme"""
+    return float(alpha * np.log1p((np.e - 1) * np.clip(t, 0.0, 1.0)))
+
+
+FUNCIONES_GASTO = {
+    'obrien_fleming': gasto_obrien_fleming,
+    'pocock': gasto_pocock,
+}
+
+
+class PruebaSecuencial:
+    """
+    Evalúa pruebas por bloques y se detiene en cuanto una rechaza H0.
+    Después de cada bloque, cada prueba compara su p-valor con el alpha que
+    le toca en esa mirada: lo que su función de gasto suma desde la mirada
+    anterior (fracción t = n / n_maximo). Como la suma de esos límites no
+    pasa de alpha, la probabilidad de rechazar alguna vez con H0 cierta
+    tampoco (cota de Bonferroni), aunque se mire tras cada bloque y las
+    miradas estén correlacionadas. Si el flujo termina sin rechazo, la última
+    mirada usa todo el alpha que quede.
+    """
+
+    def __init__(self, n_maximo, pruebas=tuple(ACUMULADORES), alpha=0.05,
+                 gasto='obrien_fleming', n_minimo=1000, detener_al_primer_rechazo=True):
+        """
+        :param n_maximo: Cantidad de números prevista del flujo (define t = n / n_maximo).
+        :param pruebas: Claves de ACUMULADORES.
+        :param alpha: Nivel de significancia total de cada prueba.
+        :param gasto: Función de gasto de alpha ('obrien_fleming' o 'pocock').
+        :param n_minimo: Números antes de la primera mirada (para que valgan las aproximaciones).
+        :param detener_al_primer_rechazo: Si es False se sigue hasta que todas rechacen o se acabe el flujo.
+        """
+        if n_maximo <= 0:
+            raise ValueError("n_maximo debe ser mayor que 0.")
+        if gasto not in FUNCIONES_GASTO:
+            raise ValueError(f"Función de gasto desconocida: {gasto}")
+        for clave in pruebas:
+            if clave not in ACUMULADORES:
+                raise ValueError(f"Prueba sin modo secuencial: {clave}")
+        self.n_maximo = int(n_maximo)
+        self.alpha = alpha
+        self.gasto = gasto
+        self.n_minimo = n_minimo
+        self.detener_al_primer_rechazo = detener_al_primer_rechazo
+        self.acumuladores = {clave: ACUMULADORES[clave][1]() for clave in pruebas}
+        # Por prueba: alpha gastado, miradas, estado de la última mirada y decisión
+        self.estados = {clave: {'gastado': 0.0, 'miradas': 0, 'ultima': None, 'rechaza_h0': False,
+                                'limite': 0.0, 'n_decision': None}
+                        for clave in pruebas}
+        self.n = 0
+        self.detenida = False
+
+    def _mirar(self, clave, final=False):
+        """Compara el p-valor actual de una prueba con el alpha de esta mirada"""
+        estado = self.estados[clave]
+        resultado = self.acumuladores[clave].calcular()
+        if final:
+            gastado = self.alpha
+        else:
+            gastado = min(FUNCIONES_GASTO[self.gasto](self.n / self.n_maximo, self.alpha), self.alpha)
+        limite = gastado - estado['gastado']
+        estado['gastado'] = gastado
+        estado['miradas'] += 1
+        estado['ultima'] = resultado
+        estado['limite'] = limite
+        if not np.isnan(resultado['p_valor']) and resultado['p_valor'] < limite:
+            estado['rechaza_h0'] = True
+            estado['n_decision'] = self.n
+
+    def _activas(self):
+        return [clave for clave, estado in self.estados.items() if not estado['rechaza_h0']]
+
+    def actualizar(self, bloque):
+        """Procesa un bloque y mira la frontera. Retorna True si ya se puede detener el flujo."""
+        if self.detenida:
+            return True
+        bloque = np.asarray(bloque, dtype=float)
+        activas = self._activas()
+        for clave in activas:
+            self.acumuladores[clave].actualizar(bloque)
+        self.n += bloque.size
+        if self.n >= self.n_minimo:
+            for clave in activas:
+                self._mirar(clave, final=self.n >= self.n_maximo)
+
+        rechazos = len(self.estados) - len(self._activas())
+        self.detenida = (self.n >= self.n_maximo
+                         or (rechazos > 0 and self.detener_al_primer_rechazo)
+                         or rechazos == len(self.estados))
+        return self.detenida
+
+    def ejecutar(self, bloques):
+        """Consume bloques (de cualquier iterable) hasta que se pueda decidir y retorna los resultados"""
+        for bloque in bloques:
+            if self.actualizar(bloque):
+                break
+        else:
+            self.finalizar()
+        return self.resultados()
+
+    def finalizar(self):
+        """El flujo terminó antes de n_maximo: última mirada con todo el alpha que quede"""
+        if not self.detenida:
+            for clave in self._activas():
+                if self.acumuladores[clave].n > 0:
+                    self._mirar(clave, final=True)
+            self.detenida = True
+
+    def estado(self):
+        """Estado completo (configuración, acumuladores y gasto de alpha) para un checkpoint"""
+        contenido = {
+            'n': self.n, 'n_maximo': self.n_maximo, 'alpha': self.alpha, 'gasto': self.gasto,
+            'pruebas': np.array(list(self.acumuladores)), 'detenida': self.detenida,
+        }
+        for clave, acumulador in self.acumuladores.items():
+            for campo, valor in acumulador.estado().items():
+                contenido[f'acumulador.{clave}.{campo}'] = valor
+            estado = self.estados[clave]
+            for campo in ('gastado', 'miradas', 'rechaza_h0', 'limite', 'n_decision'):
+                if estado[campo] is not None:
+                    contenido[f'mirada.{clave}.{campo}'] = estado[campo]
+            for campo, valor in (estado['ultima'] or {}).items():
+                contenido[f'ultima.{clave}.{campo}'] = valor
+        return contenido
+
+    def restaurar(self, contenido):
+        """Retoma un estado guardado con estado(); la configuración debe ser la misma"""
+        configuracion = (int(contenido['n_maximo']), float(contenido['alpha']), str(contenido['gasto']),
+                         [str(clave) for clave in contenido['pruebas']])
+        if configuracion != (self.n_maximo, self.alpha, self.gasto, list(self.acumuladores)):
+            raise ValueError("El checkpoint es de otra configuración (n_maximo, alpha, gasto o pruebas).")
+        self.n = int(contenido['n'])
+        self.detenida = bool(contenido['detenida'])
+        for clave, acumulador in self.acumuladores.items():
+            acumulador.restaurar(estados_con_prefijo(contenido, f'acumulador.{clave}'))
+            estado = self.estados[clave]
+            for campo, valor in estados_con_prefijo(contenido, f'mirada.{clave}').items():
+                estado[campo] = valor.item()
+            ultima = estados_con_prefijo(contenido, f'ultima.{clave}')
+            estado['ultima'] = {campo: valor.item() for campo, valor in ultima.items()} or None
+        return self
+
+    def resultados(self):
+        """Decisión por prueba y números consumidos"""
+        pruebas = {}
+        for clave, estado in self.estados.items():
+            ultima = estado['ultima'] or {'estadistico': np.nan, 'p_valor': np.nan}
+            pruebas[clave] = {
+                'tipo_prueba': ACUMULADORES[clave][0],
+                'estadistico': ultima['estadistico'],
+                'p_valor': ultima['p_valor'],
+                'limite': estado['limite'],
+                'alpha_gastado': estado['gastado'],
+                'rechaza_h0': estado['rechaza_h0'],
+                # Sin rechazo y con el flujo cortado por otra prueba no hay decisión
+                'decidida': estado['rechaza_h0'] or estado['gastado'] >= self.alpha,
+                'miradas': estado['miradas'],
+                'n_consumido': self.acumuladores[clave].n,
+            }
+        return {
+            'pruebas': pruebas,
+            'n_consumido': self.n,
+            'n_maximo': self.n_maximo,
+            'detenida_antes': self.n < self.n_maximo,
+            'gasto': self.gasto,
+            'alpha': self.alpha,
+        }
+
+
+def _guardar_checkpoint_archivo(ruta_checkpoint, secuencial, datos, desde, dtype):
+    contenido = secuencial.estado()
+    contenido.update({
+        'dtype': dtype.str,
+        'desplazamiento': np.int64(desde * dtype.itemsize),
+        'huella': np.asarray(datos[max(0, desde - VALORES_HUELLA):desde], dtype=float),
+    })
+    guardar_checkpoint(ruta_checkpoint, contenido)
+
+
+def evaluar_archivo(ruta, secuencial, dtype=np.float64, tamano_bloque=TAMANO_BLOQUE,
+                    ruta_checkpoint=None, intervalo_checkpoint=INTERVALO_CHECKPOINT, reanudar=False):
+    """
+    Evalúa secuencialmente un archivo (Excel, .npy o binario crudo) por
+    bloques. Cada intervalo_checkpoint segundos se guarda, de forma atómica,
+    el estado de la evaluación y el desplazamiento en bytes del siguiente
+    dato por leer; con reanudar=True se sigue exactamente desde ahí.
+    """
+    dtype = np.dtype(dtype)
+    datos = abrir_datos(ruta, dtype)
+    if ruta_checkpoint is None:
+        ruta_checkpoint = ruta + '.checkpoint.npz'
+
+    desde = 0
+    if reanudar:
+        contenido = cargar_checkpoint(ruta_checkpoint)
+        if contenido is None:
+            raise ValueError(f"No hay un checkpoint válido en {ruta_checkpoint}")
+        if str(contenido['dtype']) != dtype.str:
+            raise ValueError("El checkpoint se hizo con otro tipo de datos.")
+        desde = int(contenido['desplazamiento']) // dtype.itemsize
+        huella = np.asarray(datos[max(0, desde - VALORES_HUELLA):desde], dtype=float)
+        if desde > len(datos) or not np.array_equal(huella, contenido['huella']):
+            raise ValueError("El archivo no coincide con el del checkpoint.")
+        secuencial.restaurar(contenido)
+
+    if not secuencial.detenida:
+        ultimo_checkpoint = time.monotonic()
+        for bloque in leer_bloques(datos, desde, tamano_bloque):
+            detenida = secuencial.actualizar(bloque)
+            desde += bloque.size
+            if detenida:
+                break
+            if time.monotonic() - ultimo_checkpoint >= intervalo_checkpoint:
+                _guardar_checkpoint_archivo(ruta_checkpoint, secuencial, datos, desde, dtype)
+                ultimo_checkpoint = time.monotonic()
+        else:
+            secuencial.finalizar()
+        # El checkpoint final permite volver a consultar el resultado sin procesar nada
+        _guardar_checkpoint_archivo(ruta_checkpoint, secuencial, datos, desde, dtype)
+    return secuencial.resultados()
+
+
+def main():
+    """Evaluación secuencial de una fuente o de un archivo desde la línea de comandos"""
+    parser = argparse.ArgumentParser(description="Pruebas secuenciales con parada temprana")
+    parser.add_argument('--fuente', default=next(iter(FUENTES)), choices=list(FUENTES))
+    parser.add_argument('--semilla', type=int, default=12345)
+    parser.add_argument('--archivo', help="Evaluar un archivo (Excel, .npy o binario crudo) en lugar de una fuente")
+    parser.add_argument('--dtype', default='float64', help="Tipo de los valores de un binario crudo")
+    parser.add_argument('--n', type=float, default=None,
+                        help="Números máximos del flujo (por defecto 1e8, o el tamaño del archivo)")
+    parser.add_argument('--bloque', type=int, default=TAMANO_BLOQUE)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--gasto', default='obrien_fleming', choices=list(FUNCIONES_GASTO))
+    parser.add_argument('--checkpoint', help="Archivo de checkpoint (por defecto <archivo>.checkpoint.npz)")
+    parser.add_argument('--intervalo-checkpoint', type=float, default=INTERVALO_CHECKPOINT,
+                        help="Segundos entre checkpoints")
+    parser.add_argument('--resume', action='store_true', help="Seguir desde el último checkpoint")
+    args = parser.parse_args()
+
+    if args.archivo:
+        n = int(args.n) if args.n else len(abrir_datos(args.archivo, args.dtype))
+        secuencial = PruebaSecuencial(n, alpha=args.alpha, gasto=args.gasto)
+        try:
+            resultado = evaluar_archivo(args.archivo, secuencial, args.dtype, args.bloque, args.checkpoint,
+                                        args.intervalo_checkpoint, args.resume)
+        except ValueError as e:
+            parser.error(str(e))
+        origen = os.path.basename(args.archivo)
+    else:
+        if args.resume:
+            parser.error("--resume solo se puede usar con --archivo")
+        n = int(args.n or 1e8)
+        fuente = crear_fuente(args.fuente, args.semilla)
+        secuencial = PruebaSecuencial(n, alpha=args.alpha, gasto=args.gasto)
+        resultado = secuencial.ejecutar(fuente.bloques(n, args.bloque))
+        origen = args.fuente
+
+    print(f"{origen}: {resultado['n_consumido']:,} de {n:,} números consumidos")
+    print("=" * 30)
+    for prueba in resultado['pruebas'].values():
+        decision = ("Rechaza H0" if prueba['rechaza_h0']
+                    else "No rechaza H0" if prueba['decidida'] else "Sin decisión")
+        print(f"{prueba['tipo_prueba']}: p-valor = {prueba['p_valor']:.3g}  "
+              f"límite = {prueba['limite']:.3g}  {decision}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import gamma, gammaln, kv
+
+# Rejillas de las tablas (la cola más allá se extrapola: es exponencial)
+A2_MINIMO, A2_MAXIMO = 0.01, 10.0
+W2_MINIMO, W2_MAXIMO = 0.001, 2.5
+PUNTOS_TABLA = 4000
+
+# Tolerancia para cortar la serie de Cramér-von Mises
+TOLERANCIA_SERIE = 1e-12
+
+
+def _solo_lectura(*arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+def _supervivencia_ad_asintotica(z):
+    """P(A² > z) asintótica con la aproximación de Marsaglia y Marsaglia (2004)"""
+    z = np.asarray(z, dtype=float)
+    sf = np.empty_like(z)
+    bajo = z < 2
+    zb = z[bajo]
+    sf[bajo] = 1 - np.exp(-1.2337141 / zb) / np.sqrt(zb) * (
+        2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * zb) * zb) * zb) * zb) * zb)
+    za = z[~bajo]
+    sf[~bajo] = -np.expm1(-np.exp(
+        1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * za) * za) * za) * za) * za))
+    return sf
+
+
+def _correccion_ad(n, cdf):
+    """Corrección de Marsaglia para n finito: F_n(z) = F(z) + errfix(n, F(z))"""
+    cdf = np.asarray(cdf, dtype=float)
+    c = 0.01265 + 0.1757 / n
+    v_bajo = np.clip(cdf / c, 0.0, 1.0)
+    bajo = np.sqrt(v_bajo) * (1 - v_bajo) * (49 * v_bajo - 102) * (
+        0.0037 / n ** 2 + 0.00078 / n + 0.00006) / n
+    v = (cdf - c) / (0.8 - c)
+    medio = (-0.00022633 + (6.54034 - (14.6538 - (14.458 - (8.259 - 1.91864 * v) * v) * v) * v) * v) * (
+        0.04213 / n + 0.01365 / n ** 2)
+    alto = (-130.2137 + (745.2337 - (1705.091 - (1950.646 - (1116.360 - 255.7844 * cdf) * cdf) * cdf) * cdf) * cdf) / n
+    return np.where(cdf < c, bajo, np.where(cdf <= 0.8, medio, alto))
+
+
+@lru_cache(maxsize=None)
+def tabla_anderson_darling():
+    """Tabla (A², log P(A² > a)) de la distribución asintótica, calculada una sola vez"""
+    rejilla = np.linspace(A2_MINIMO, A2_MAXIMO, PUNTOS_TABLA)
+    return _solo_lectura(rejilla, np.log(_supervivencia_ad_asintotica(rejilla)))
+
+
+def _ed2(y):
+    z = y ** 2 / 4
+    return np.exp(-z) * (y / 2) ** 1.5 * (kv(0.25, z) + kv(0.75, z)) / np.sqrt(np.pi)
+
+
+def _ed3(y):
+    z = y ** 2 / 4
+    return np.exp(-z) * (y / 2) ** 2.5 * (2 * kv(0.25, z) + 3 * kv(0.75, z) - kv(1.25, z)) / np.sqrt(np.pi)
+
+
+def _termino_psi1(k, w):
+    """Término k de la serie de psi1 (Csörgő y Faraway 1996, ec. 1.10) sin V(w)/12"""
+    m = 2 * k + 1
+    sx = 2 * np.sqrt(w)
+    y1, y2 = w ** 0.75, w ** 1.25
+    g1, g3 = gamma(k + 0.5), gamma(k + 1.5)
+    suma = (m * g1 * _ed2((4 * k + 3) / sx) / (9 * y1)
+            + g1 * _ed3((4 * k + 1) / sx) / (72 * y2)
+            + 2 * (m + 2) * g3 * _ed3((4 * k + 5) / sx) / (12 * y2)
+            + 7 * m * g1 * _ed2((4 * k + 1) / sx) / (144 * y1)
+            + 7 * m * g1 * _ed2((4 * k + 5) / sx) / (144 * y1))
+    return -suma / (np.pi * gamma(k + 1))
+
+
+def _sumar_serie(termino, rejilla):
+    """Suma los términos de una serie hasta que el último sea despreciable"""
+    total = np.zeros_like(rejilla)
+    k = 0
+    while True:
+        valor = termino(k, rejilla)
+        total += valor
+        k += 1
+        if np.max(np.abs(valor)) < TOLERANCIA_SERIE:
+            return total
+
+
+def _termino_cvm(k, w):
+    """Término k de la serie de Anderson y Darling (1952) en funciones de Bessel K_{1/4}"""
+    y = 4 * k + 1
+    q = y ** 2 / (16 * w)
+    return (np.exp(gammaln(k + 0.5) - gammaln(k + 1)) / (np.pi ** 1.5 * np.sqrt(w))
+            * np.sqrt(y) * np.exp(-q) * kv(0.25, q))
+
+
+@lru_cache(maxsize=None)
+def tabla_cramer_von_mises():
+    """
+    Tabla (W², log P(W² > w), c(w)) de la distribución asintótica, con el
+    término de orden 1/n de Csörgő y Faraway (1996): P_n(W² > w) = P(W² > w) - c(w)/n.
+    Se calcula una sola vez.
+    """
+    rejilla = np.linspace(W2_MINIMO, W2_MAXIMO, PUNTOS_TABLA)
+    cdf = _sumar_serie(_termino_cvm, rejilla)
+    correccion = cdf / 12 + _sumar_serie(_termino_psi1, rejilla)
+    sf = np.clip(1 - cdf, np.finfo(float).tiny, 1.0)
+    return _solo_lectura(rejilla, np.log(sf), correccion)
+
+
+def _log_supervivencia(x, rejilla, log_sf):
+    """
+    log P(X > x) interpolado en la tabla. Pasado el último punto se extrapola
+    en línea recta con la pendiente del último tramo.
+    """
+    x = np.asarray(x, dtype=float)
+    pendiente = (log_sf[-1] - log_sf[-2]) / (rejilla[-1] - rejilla[-2])
+    return np.where(x <= rejilla[-1], np.interp(x, rejilla, log_sf),
+                    log_sf[-1] + pendiente * (x - rejilla[-1]))
+
+
+def _cuantil_superior(alpha, rejilla, log_sf):
+    """x con P(X > x) = alpha (inversa de _log_supervivencia)"""
+    log_alpha = np.log(alpha)
+    if log_alpha >= log_sf[-1]:
+        # log_sf es decreciente: se invierte el orden para np.interp
+        return float(np.interp(log_alpha, log_sf[::-1], rejilla[::-1]))
+    pendiente = (log_sf[-1] - log_sf[-2]) / (rejilla[-1] - rejilla[-2])
+    return float(rejilla[-1] + (log_alpha - log_sf[-1]) / pendiente)
+
+
+def _tabla_anderson_darling_n(n):
+    """Tabla de A² con la corrección de Marsaglia para n finito"""
+    rejilla, log_sf = tabla_anderson_darling()
+    sf = np.exp(log_sf)
+    sf_n = sf - _correccion_ad(n, 1 - sf)
+    return rejilla, np.log(np.clip(sf_n, np.finfo(float).tiny, 1.0))
+
+
+def p_valor_anderson_darling(a2, n):
+    """P-valor de A² para n datos (hipótesis completamente especificada)"""
+    rejilla, log_sf = _tabla_anderson_darling_n(n)
+    return float(np.clip(np.exp(_log_supervivencia(a2, rejilla, log_sf)), 0.0, 1.0))
+
+
+def valor_critico_anderson_darling(alpha, n):
+    """Valor crítico de A² al nivel alpha para n datos"""
+    return _cuantil_superior(alpha, *_tabla_anderson_darling_n(n))
+
+
+def _tabla_cramer_von_mises_n(n):
+    """Tabla de W² con el término de orden 1/n para n finito"""
+    rejilla, log_sf, correccion = tabla_cramer_von_mises()
+    sf_n = np.exp(log_sf) - correccion / n
+    return rejilla, np.log(np.clip(sf_n, np.finfo(float).tiny, 1.0))
+
+
+def p_valor_cramer_von_mises(w2, n):
+    """P-valor de W² para n datos (hipótesis completamente especificada)"""
+    # El soporte de W² es [1/(12n), n/3]
+    if w2 <= 1 / (12 * n):
+        return 1.0
+    if w2 >= n / 3:
+        return 0.0
+    rejilla, log_sf = _tabla_cramer_von_mises_n(n)
+    return float(np.clip(np.exp(_log_supervivencia(w2, rejilla, log_sf)), 0.0, 1.0))
+
+
+def valor_critico_cramer_von_mises(alpha, n):
+    """Valor crítico de W² al nivel alpha para n datos"""
+    return _cuantil_superior(alpha, *_tabla_cramer_von_mises_n(n))
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+def secuencia_umbral(datos, umbral=0.5, incluir_igual=True):
+    """
+    Genera la secuencia de signos respecto a un umbral como array booleano.
+    True representa '+' (encima del umbral) y False representa '-'.
+    """
+    datos = np.asarray(datos)
+    if incluir_igual:
+        return datos >= umbral
+    return datos > umbral
+
+
+def secuencia_diferencias(datos):
+    """
+    Genera la secuencia de signos de las diferencias consecutivas como array
+    booleano (True = '+' ascendente, False = '-' descendente). Los empates se omiten.
+    """
+    diferencias = np.diff(np.asarray(datos, dtype=float))
+    return diferencias[diferencias != 0] > 0
+
+
+def secuencia_direcciones(datos):
+    """
+    Dirección de cada diferencia consecutiva como array booleano (True =
+    ascendente). Un empate mantiene la dirección anterior; los empates
+    iniciales se toman como ascendentes.
+    """
+    signos = np.sign(np.diff(np.asarray(datos, dtype=float)))
+    if signos.size == 0:
+        return np.empty(0, dtype=bool)
+    # Índice del último signo distinto de cero hasta cada posición
+    ultimo = np.maximum.accumulate(np.where(signos != 0, np.arange(signos.size), 0))
+    return signos[ultimo] >= 0
+
+
+def contar_rachas(signos):
+    """Número de rachas de una secuencia de signos (cambios + 1)."""
+    signos = np.asarray(signos)
+    if signos.size == 0:
+        return 0
+    return 1 + int(np.count_nonzero(signos[1:] != signos[:-1]))
+
+
+def longitudes_rachas(signos):
+    """Longitudes de las rachas de una secuencia de signos (RLE vectorizado)."""
+    signos = np.asarray(signos)
+    if signos.size == 0:
+        return np.empty(0, dtype=np.int64)
+    cambios = np.flatnonzero(signos[1:] != signos[:-1]) + 1
+    limites = np.concatenate(([0], cambios, [signos.size]))
+    return np.diff(limites)
+
+
+def frecuencias_longitudes(longitudes):
+    """Diccionario {longitud: frecuencia} a partir de las longitudes de racha."""
+    conteos = np.bincount(np.asarray(longitudes, dtype=np.int64))
+    return {int(i): int(conteos[i]) for i in np.flatnonzero(conteos)}
+
+
+def texto_signos(signos, limite=50):
+    """
+    Materializa como texto '+'/'-' solo los primeros `limite` signos,
+    que es lo que se muestra en las tablas detalladas.
+    """
+    texto = ''.join(np.where(np.asarray(signos[:limite]), '+', '-'))
+    if len(signos) > limite:
+        texto += "..."
+    return texto
+
+
+def longitudes_corridas_ascendentes(datos):
+    """
+    Longitudes de las corridas ascendentes (RLE vectorizado sobre los datos):
+    cada descenso x[i+1] < x[i] cierra una corrida y el dato siguiente inicia
+    la próxima, de modo que las longitudes suman n.
+    """
+    datos = np.asarray(datos, dtype=float)
+    if datos.size == 0:
+        return np.empty(0, dtype=np.int64)
+    cortes = np.flatnonzero(datos[1:] < datos[:-1]) + 1
+    limites = np.concatenate(([0], cortes, [datos.size]))
+    return np.diff(limites)
+
+
+def agrupar_frecuencias(observadas, esperadas, minimo=5.0):
+    """
+    Agrupa categorías adyacentes para que cada grupo tenga Ei >= minimo.
+    Se agrupa desde la última categoría (la cola) hacia atrás; si al final
+    queda un grupo pequeño, se une al primer grupo formado.
+    Retorna las listas (grouped_Oi, grouped_Ei).
+    """
+    grouped_Oi = []
+    grouped_Ei = []
+    temp_Oi = 0
+    temp_Ei = 0
+
+    for oi, ei in zip(reversed(list(observadas)), reversed(list(esperadas))):
+        temp_Oi += oi
+        temp_Ei += ei
+
+        if temp_Ei >= minimo:
+            grouped_Oi.insert(0, temp_Oi)
+            grouped_Ei.insert(0, temp_Ei)
+            temp_Oi = 0
+            temp_Ei = 0
+
+    # Si queda algo sin agrupar
+    if temp_Oi > 0 or temp_Ei > 0:
+        if grouped_Ei:
+            grouped_Oi[0] += temp_Oi
+            grouped_Ei[0] += temp_Ei
+        else:
+            # Todos los Ei son < minimo: se forma un solo grupo
+            grouped_Oi.append(temp_Oi)
+            grouped_Ei.append(temp_Ei)
+
+    return grouped_Oi, grouped_Ei